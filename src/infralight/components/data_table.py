@@ -1,4 +1,10 @@
-"""Data table — thin wrapper that applies Infralight styling."""
+"""Data table — thin wrapper that applies Infralight styling.
+
+Pass a :class:`~infralight.models.tables.RowSet` instead of a row list
+for server-side mode: the browser only ever receives the visible page,
+and sorting, filtering and paging are answered on the server through
+Quasar's ``@request`` event.
+"""
 
 from __future__ import annotations
 
@@ -6,20 +12,23 @@ from typing import Any
 
 from nicegui import ui
 from nicegui.elements.table import Table
+from nicegui.events import GenericEventArguments
+
+from infralight.models.tables import RowSet
 
 
 def data_table(
     columns: list[dict[str, Any]],
-    rows: list[dict[str, Any]],
+    rows: list[dict[str, Any]] | RowSet,
     *,
     row_key: str = "id",
     selection: str | None = None,
     on_select: Any = None,
+    page_size: int = 25,
 ) -> Table:
     """Create a styled Quasar table."""
     kwargs: dict[str, Any] = {
         "columns": columns,
-        "rows": rows,
         "row_key": row_key,
     }
     if selection:
@@ -27,8 +36,51 @@ def data_table(
     if on_select:
         kwargs["on_select"] = on_select
 
-    return (
-        ui.table(**kwargs)
-        .classes("w-full")
-        .props("dense flat bordered dark separator=cell")
-    )
+    if not isinstance(rows, RowSet):
+        return (
+            ui.table(rows=rows, **kwargs)
+            .classes("w-full")
+            .props("dense flat bordered dark separator=cell")
+        )
+
+    row_set = rows
+    first = row_set.query(per_page=page_size)
+    with ui.column().classes("w-full q-gutter-xs"):
+        search = (
+            ui.input(placeholder="Filter…")
+            .props("dense outlined dark clearable")
+            .classes("w-64")
+        )
+        with search.add_slot("prepend"):
+            ui.icon("search", size="xs")
+        table = (
+            ui.table(
+                rows=first.rows,
+                pagination={
+                    "page": 1,
+                    "rowsPerPage": page_size,
+                    "sortBy": None,
+                    "descending": False,
+                    "rowsNumber": first.total,
+                },
+                **kwargs,
+            )
+            .classes("w-full")
+            .props("dense flat bordered dark separator=cell")
+        )
+    search.bind_value(table, "filter")
+
+    def _on_request(e: GenericEventArguments) -> None:
+        pagination = e.args["pagination"]
+        page = row_set.query(
+            sort_by=pagination.get("sortBy"),
+            descending=bool(pagination.get("descending")),
+            filter=e.args.get("filter") or "",
+            page=pagination.get("page") or 1,
+            per_page=pagination.get("rowsPerPage", page_size),
+        )
+        table.pagination = {**pagination, "rowsNumber": page.total}
+        table.rows = page.rows
+
+    table.on("request", _on_request, ["pagination", "filter"])
+    return table
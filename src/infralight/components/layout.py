@@ -16,7 +16,6 @@ from nicegui import ui
 from nicegui.element import Element
 
 from infralight.components.sidebar import sidebar
-from infralight.components.theme import inject_theme
 
 if TYPE_CHECKING:
     from infralight.controllers.app_controller import AppController
@@ -24,8 +23,11 @@ if TYPE_CHECKING:
 
 @contextmanager
 def page_layout(app_ctrl: AppController, active: str) -> Generator[Element, None, None]:
-    """Render header + drawer and yield the main content column."""
-    inject_theme()
+    """Render header + drawer and yield the main content column.
+
+    The theme is injected separately (before the loading skeleton), see
+    ``main._page_state``.
+    """
     state = app_ctrl.state
 
     # Header
@@ -35,7 +37,7 @@ def page_layout(app_ctrl: AppController, active: str) -> Generator[Element, None
         ui.space()
         if state.project:
             ui.badge(state.project.name, color="deep-purple-8").props("outline")
-        ui.button("Rescan", icon="refresh", on_click=lambda: app_ctrl.rescan()).props(
+        ui.button("Rescan", icon="refresh", on_click=app_ctrl.rescan).props(
             "flat dense no-caps color=grey-4 size=sm"
         )
 
@@ -0,0 +1,18 @@
+"""Loading skeleton — placeholder shown while a page's data loads."""
+
+from nicegui import ui
+from nicegui.element import Element
+
+
+def page_skeleton() -> Element:
+    """Render a stat-row + panel placeholder and return it for removal."""
+    with ui.column().classes("w-full q-pa-lg q-gutter-md") as container:
+        with ui.row().classes("w-full items-center q-gutter-sm"):
+            ui.spinner("dots", size="md", color="primary")
+            ui.label("Loading project…").classes("text-caption text-grey-6")
+        with ui.row().classes("w-full q-gutter-sm no-wrap"):
+            for _ in range(4):
+                ui.skeleton("rect", height="88px", animation="wave").classes("col")
+        ui.skeleton("rect", height="240px", animation="wave").classes("w-full")
+        ui.skeleton("rect", height="160px", animation="wave").classes("w-full")
+    return container
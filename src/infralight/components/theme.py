@@ -62,6 +62,131 @@ def inject_theme() -> None:
         align-items: center; justify-content: center;
     }
     .mermaid-zoom-controls button:hover { background: #333; }
+    /* Server-laid-out graphs (core.layout) start scaled to fit */
+    .il-layered { max-width: 100%; height: auto; }
+    .il-layered .il-node { cursor: default; }
     </style>
     <script src="https://cdn.jsdelivr.net/npm/panzoom@9.4.3/dist/panzoom.min.js"></script>
+    <script>
+    // Recently drawn diagram SVGs in localStorage, keyed by the digest
+    // the server sends with each diagram; least recently used go first.
+    window._mzCache = window._mzCache || (function() {
+        const PREFIX = 'il-svg:', INDEX = 'il-svg-index', MAX = 40;
+        const keys = function() {
+            try { return JSON.parse(localStorage.getItem(INDEX)) || []; }
+            catch (e) { return []; }
+        };
+        const touch = function(key) {
+            const order = keys().filter(function(k) { return k !== key; });
+            order.push(key);
+            return order;
+        };
+        return {
+            has: function(key) {
+                try { return localStorage.getItem(PREFIX + key) !== null; }
+                catch (e) { return false; }
+            },
+            get: function(key) {
+                const svg = localStorage.getItem(PREFIX + key);
+                if (svg !== null) {
+                    localStorage.setItem(INDEX, JSON.stringify(touch(key)));
+                }
+                return svg;
+            },
+            put: function(key, svg) {
+                const order = touch(key);
+                while (order.length > MAX) {
+                    localStorage.removeItem(PREFIX + order.shift());
+                }
+                for (;;) {
+                    try {
+                        localStorage.setItem(PREFIX + key, svg);
+                        localStorage.setItem(INDEX, JSON.stringify(order));
+                        return;
+                    } catch (e) {  // quota — drop the oldest and retry
+                        if (order.length <= 1) return;
+                        localStorage.removeItem(PREFIX + order.shift());
+                    }
+                }
+            },
+        };
+    })();
+    // Attach panzoom to the diagram in zoom container `cid`.  With a
+    // mermaid element id `nid`, first move the SVG it renders into the
+    // container; without, the container already holds a server-drawn
+    // SVG, or `svg` is given, or it is taken from _mzCache under `key`.
+    // Event driven: a MutationObserver fires once the SVG lands.  It is
+    // disconnected after mounting, when mounting throws, or after
+    // MOUNT_WAIT ms if the diagram never appears.
+    window._mzMount = window._mzMount || function(cid, nid, key, svg) {
+        const MOUNT_WAIT = 60000;
+        const tryMount = function() {
+            const wrap = document.getElementById(cid);
+            const inner = wrap && wrap.querySelector('.mermaid-zoom-inner');
+            if (!inner) return false;
+            if (inner.dataset.rendered) return true;
+            let fresh = true;
+            if (nid) {
+                const src = document.getElementById(nid);
+                const svg = src && src.querySelector('svg');
+                if (!svg) return false;
+                const cloned = svg.cloneNode(true);
+                cloned.removeAttribute('height');
+                cloned.style.height = 'auto';
+                cloned.style.minHeight = '600px';
+                cloned.style.maxHeight = 'none';
+                inner.appendChild(cloned);
+            } else if (!inner.querySelector('svg')) {
+                const cached = svg || (key && window._mzCache.get(key));
+                if (!cached) return false;
+                inner.innerHTML = cached;
+                fresh = false;
+            }
+            inner.dataset.rendered = '1';
+            if (fresh && key) window._mzCache.put(key, inner.innerHTML);
+            if (typeof panzoom !== 'undefined') {
+                wrap._pz = panzoom(inner, {
+                    maxZoom: 5, minZoom: 0.2, smoothScroll: false,
+                    bounds: true, boundsPadding: 0.3
+                });
+            }
+            return true;
+        };
+        let obs = null, timer = null;
+        const stop = function() {
+            if (obs) obs.disconnect();
+            clearTimeout(timer);
+        };
+        const attempt = function() {
+            let done = true;  // a throw ends the watch too
+            try { done = tryMount(); } finally { if (done) stop(); }
+            return done;
+        };
+        if (attempt()) return;
+        obs = new MutationObserver(attempt);
+        obs.observe(document.body, { childList: true, subtree: true });
+        timer = setTimeout(stop, MOUNT_WAIT);
+    };
+    // Mount the diagram cached under `key` into container `cid`; false on
+    // a miss, so the server sends it.  The SVG is read here, in the same
+    // call, so an eviction before the container renders cannot blank it.
+    window._mzMountCached = window._mzMountCached || function(cid, key) {
+        let svg = null;
+        try { svg = window._mzCache.get(key); } catch (e) { return false; }
+        if (svg === null) return false;
+        window._mzMount(cid, null, key, svg);
+        return true;
+    };
+    window._mzZoom = window._mzZoom || function(id, factor) {
+        const w = document.getElementById(id);
+        if (w && w._pz) {
+            const cx = w.offsetWidth / 2, cy = w.offsetHeight / 2;
+            w._pz.smoothZoom(cx, cy, factor);
+        }
+    };
+    window._mzReset = window._mzReset || function(id) {
+        const w = document.getElementById(id);
+        if (w && w._pz) { w._pz.moveTo(0, 0); w._pz.zoomAbs(0, 0, 1); }
+    };
+    </script>
     """)
@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from nicegui import app as nicegui_app
-from nicegui import ui
+from nicegui import run, ui
 
 if TYPE_CHECKING:
     from infralight.models.state import AppState
@@ -26,31 +26,39 @@ class AppController:
         self.state = state
 
     @staticmethod
-    def build_state() -> AppState:
-        """Create an AppState and hydrate from browser storage.
-
-        Falls back to the bundled ``examples/`` directory so the UI is
-        never empty on first launch.
-        """
-        from infralight.models.state import AppState
-
+    def project_dir() -> Path | None:
+        """The project root stored in the browser, else the bundled examples."""
         stored = nicegui_app.storage.browser.get("project_dir")
-        state = AppState()
         if stored:
             p = Path(stored)
             if p.is_dir():
-                state.load_project(p)
-                return state
+                return p
 
-        # Default: load the examples shipped with the project
+        # Default: the examples shipped with the project
         examples = Path(__file__).resolve().parents[3] / "examples"
-        if examples.is_dir():
-            state.load_project(examples)
+        return examples if examples.is_dir() else None
+
+    @staticmethod
+    async def load_state() -> AppState:
+        """Create an AppState and hydrate it from browser storage.
+
+        Falls back to the bundled ``examples/`` directory so the UI is
+        never empty on first launch.  The project comes from the shared
+        store: the scan runs on a loader thread, once per generation, and
+        concurrent sessions await the same load.
+        """
+        from infralight.models import projects
+        from infralight.models.state import AppState
+
+        state = AppState()
+        root = AppController.project_dir()
+        if root is not None:
+            state.project = await projects.aload_project(root)
         return state
 
-    def rescan(self) -> None:
+    async def rescan(self) -> None:
         """Re-scan current project and reload the current page."""
-        self.state.rescan()
+        await run.io_bound(self.state.rescan)
         if self.state.project:
             ui.notify(
                 f"Rescanned — {len(self.state.project.files)} files",
@@ -25,5 +25,5 @@ class DashboardController:
             issues=self.state.gather_issues() if self.state.project else [],
             has_project=self.state.project is not None,
             file_rows=self.state.file_rows(),
-            on_rescan=lambda: AppController(self.state).rescan(),
+            on_rescan=AppController(self.state).rescan,
         )
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from nicegui import ui
+from nicegui import run, ui
 
 from infralight.models.viewmodels import EditorVM, FileContent
 
@@ -33,9 +33,9 @@ class EditorController:
         """Get file content + metadata for editing."""
         return self.state.get_file_content(rel_path)
 
-    def save_file(self, rel_path: str, content: str) -> None:
+    async def save_file(self, rel_path: str, content: str) -> None:
         """Save edited content to disk and notify."""
-        ok = self.state.save_file_content(rel_path, content)
+        ok = await run.io_bound(self.state.save_file_content, rel_path, content)
         if ok:
             ui.notify(f"Saved {rel_path}", type="positive")
         else:
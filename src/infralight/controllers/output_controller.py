@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
-from nicegui import ui
+from nicegui import run, ui
 
+from infralight.models.jobs import finish_job, running_job, start_job
 from infralight.models.viewmodels import OutputVM
 
 if TYPE_CHECKING:
+    from nicegui.elements.log import Log
+
+    from infralight.core.renderer import RenderResult
     from infralight.models.state import AppState
 
 log = logging.getLogger(__name__)
 
+_LOG_LINE = {
+    "rendered": "✓ {r.name}",
+    "unchanged": "· {r.name} (unchanged)",
+    "error": "✗ {r.name}: {r.error}",
+    "cancelled": "⊘ {r.name} (cancelled)",
+}
+
 
 class OutputController:
     """Builds the render-output view-model and executes rendering."""
@@ -35,30 +47,76 @@ class OutputController:
             output_dir=str(output_dir) if output_dir else "",
             rendered_rows=self.state.rendered_file_rows(),
             on_render=lambda log_widget: self.do_render(log_widget),
+            on_cancel=self.cancel_render,
         )
 
-    def do_render(self, log_widget=None) -> None:
-        """Execute rendering and push messages to the log widget."""
+    def _job_key(self) -> str:
+        return f"render:{self.state.project.root}" if self.state.project else ""
+
+    async def do_render(self, log_widget: Log | None = None) -> None:
+        """Render on a worker thread, streaming per-file lines to the log widget.
+
+        The event loop stays free for every other client while the job
+        runs; at most one render per project runs at a time.
+        """
         if not self.state.project:
             return
+        job = start_job(self._job_key())
+        if job is None:
+            ui.notify("A render is already running for this project", type="warning")
+            return
 
+        total = len(self.state.project.il_files)
         output_dir = self.state.project.output_dir or self.state.project.root / "output"
-        if log_widget:
-            log_widget.push(
-                f"Rendering {len(self.state.project.il_files)} file(s) → {output_dir}"
-            )
+        loop = asyncio.get_running_loop()
+        done = 0
+
+        def _push(line: str) -> None:
+            if log_widget is not None and not log_widget.is_deleted:
+                log_widget.push(line)
+
+        def _progress(r: RenderResult) -> None:
+            nonlocal done
+            done += 1
+            line = f"  [{done}/{total}] " + _LOG_LINE[r.status].format(r=r)
+            loop.call_soon_threadsafe(_push, line)
 
+        _push(f"Rendering {total} file(s) → {output_dir}")
         try:
-            results = self.state.render_il_files()
-            if log_widget:
-                for name in results:
-                    log_widget.push(f"  ✓ {name}")
-                log_widget.push(f"Done — {len(results)} file(s) rendered.")
-            ui.notify(f"Rendered {len(results)} file(s)", type="positive")
+            results = await run.io_bound(
+                self.state.render_il_files,
+                on_progress=_progress,
+                cancel=job.cancel_event,
+            )
         except Exception as exc:
             log.exception("Render failed")
-            if log_widget:
-                log_widget.push(f"  ✗ Error: {exc}")
+            _push(f"  ✗ Error: {exc}")
             ui.notify(f"Render failed: {exc}", type="negative")
+            return
+        finally:
+            finish_job(job)
+        if results is None:  # server shutting down
+            return
 
+        counts = {s: sum(r.status == s for r in results) for s in _LOG_LINE}
+        _push(
+            f"Done — {counts['rendered']} rendered, {counts['unchanged']} unchanged, "
+            f"{counts['error']} failed, {counts['cancelled']} cancelled."
+        )
+        if job.cancelled:
+            ui.notify("Render cancelled", type="warning")
+            return
+        ui.notify(
+            f"Rendered {counts['rendered']} file(s), {counts['unchanged']} unchanged",
+            type="warning" if counts["error"] else "positive",
+        )
         ui.navigate.to("/output")
+
+    def cancel_render(self) -> None:
+        """Cancel the project's running render, whichever session started it."""
+        job = running_job(self._job_key())
+        if job is None:
+            ui.notify("No render is running", type="info")
+            return
+        job.cancel()
+        ui.notify("Cancelling render…", type="warning")
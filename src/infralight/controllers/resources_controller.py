@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from infralight.models.viewmodels import ResourcesVM, TfDetail
+from infralight.models import projects
+from infralight.models.tables import RowSet
+from infralight.models.viewmodels import ResourcesVM, TfDetail, rows_to_dicts
 
 if TYPE_CHECKING:
     from infralight.models.state import AppState
@@ -17,7 +19,12 @@ class ResourcesController:
         self.state = state
 
     def get_view_model(self) -> ResourcesVM:
-        rows = self.state.tf_rows()
+        project = self.state.project
+        if project is None:
+            return ResourcesVM(rows=RowSet([]), count=0)
+        rows = projects.memo(
+            project, "tf_rows", lambda: RowSet(rows_to_dicts(self.state.tf_rows()))
+        )
         return ResourcesVM(
             rows=rows,
             count=len(rows),
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from infralight.models.viewmodels import SaltOverviewVM
+from infralight.models import projects
+from infralight.models.tables import RowSet
+from infralight.models.viewmodels import SaltOverviewVM, rows_to_dicts
 
 if TYPE_CHECKING:
     from infralight.models.state import AppState
@@ -17,4 +19,11 @@ class SaltOverviewController:
         self.state = state
 
     def get_view_model(self) -> SaltOverviewVM:
-        return self.state.salt_overview()
+        project = self.state.project
+        if project is None:
+            return self.state.salt_overview()
+        return projects.memo(project, "salt_overview", self.state.salt_overview)
+
+    def get_apply_order(self, minion: str) -> RowSet:
+        """Apply-order rows of *minion*'s highstate."""
+        return RowSet(rows_to_dicts(self.state.apply_steps(minion)))
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from infralight.models.viewmodels import SaltDetail, StatesVM
+from infralight.models import projects
+from infralight.models.tables import RowSet
+from infralight.models.viewmodels import SaltDetail, StatesVM, rows_to_dicts
 
 if TYPE_CHECKING:
     from infralight.models.state import AppState
@@ -17,10 +19,13 @@ class StatesController:
         self.state = state
 
     def get_view_model(self) -> StatesVM:
-        return StatesVM(
-            rows=self.state.salt_rows(),
-            count=len(self.state.project.salt_files) if self.state.project else 0,
+        project = self.state.project
+        if project is None:
+            return StatesVM(rows=RowSet([]), count=0)
+        rows = projects.memo(
+            project, "salt_rows", lambda: RowSet(rows_to_dicts(self.state.salt_rows()))
         )
+        return StatesVM(rows=rows, count=len(project.salt_files))
 
     def get_detail(self, rel_path: str) -> SaltDetail | None:
         """Return detail for a selected salt file."""
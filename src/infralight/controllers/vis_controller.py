@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, replace
+from functools import partial
 from typing import TYPE_CHECKING
 
+from infralight.core.echarts import graph_option
+from infralight.core.layout import cached_layout, layered_layout, to_svg
+from infralight.core.lod import split_by_group, summarize
+from infralight.core.manifest import bytes_hash
+from infralight.core.query import GraphIndex, SubgraphQuery
+from infralight.models import projects
+from infralight.models.tables import RowSet
 from infralight.models.viewmodels import (
     InfraVisVM,
     VisEdgeVM,
     VisGroupVM,
     VisNodeVM,
+    VisSectionVM,
     VisVM,
+    rows_to_dicts,
 )
 
 if TYPE_CHECKING:
@@ -17,6 +28,19 @@ if TYPE_CHECKING:
     from infralight.models.state import AppState
 
 
+@dataclass
+class _Graphs:
+    """The per-generation part of the view-model, shared by all sessions.
+
+    Holds data only — callbacks are bound per request, so no session's
+    controller is kept alive by another session's page.
+    """
+
+    il: Visualization
+    views: InfraVisVM
+    indexes: tuple[GraphIndex, GraphIndex, GraphIndex]  # il, tf, salt
+
+
 class VisController:
     """Builds three visualization sub-graphs: Terraform, Salt, IL Decorators."""
 
@@ -24,29 +48,134 @@ class VisController:
         self.state = state
 
     def get_view_model(self) -> InfraVisVM:
-        il_vis = self.state.build_visualization()
-        tf_vis = self.state.build_tf_graph()
-        salt_vis = self.state.build_salt_graph()
-
+        """All three graphs, built once per project generation."""
+        if self.state.project is None:
+            graphs = self._build()
+        else:
+            graphs = projects.memo(self.state.project, "vis", self._build)
+        self.state.current_vis = graphs.il
+        il, tf, salt = graphs.indexes
         return InfraVisVM(
-            il_graph=self._to_vm(il_vis),
-            tf_graph=self._to_vm(tf_vis),
-            salt_graph=self._to_vm(salt_vis),
+            il_graph=replace(graphs.views.il_graph, on_focus=partial(self._focus, il)),
+            tf_graph=replace(graphs.views.tf_graph, on_focus=partial(self._focus, tf)),
+            salt_graph=replace(
+                graphs.views.salt_graph, on_focus=partial(self._focus, salt)
+            ),
+        )
+
+    def _build(self) -> _Graphs:
+        graphs = (
+            self.state.build_visualization(),
+            self.state.build_tf_graph(),
+            self.state.build_salt_graph(),
+        )
+        indexes = (GraphIndex(graphs[0]), GraphIndex(graphs[1]), GraphIndex(graphs[2]))
+        il_vm, tf_vm, salt_vm = (
+            self._to_vm(vis, index) for vis, index in zip(graphs, indexes, strict=True)
+        )
+        return _Graphs(
+            il=graphs[0],
+            views=InfraVisVM(il_graph=il_vm, tf_graph=tf_vm, salt_graph=salt_vm),
+            indexes=indexes,
         )
 
-    @staticmethod
-    def _to_vm(vis: Visualization) -> VisVM:
+    def _to_vm(self, vis: Visualization, index: GraphIndex) -> VisVM:
+        nodes = vis.node_map()
+        has_data = bool(vis.nodes or vis.edges)
+        summarized = len(nodes) > self.state.vis_node_limit
+        drawn = summarize(vis) if summarized else vis
+        large = len(nodes) > self.state.vis_echart_limit
+        mermaid = drawn.to_mermaid() if has_data else ""
+        svg = self._svg(drawn) if has_data and not large else ""
         return VisVM(
-            nodes=[
-                VisNodeVM(id=n.id, label=n.label, group=n.group or "", icon=n.icon)
-                for n in vis.nodes
-            ],
-            edges=[
-                VisEdgeVM(src=e.source, tgt=e.target, label=e.label, style=e.style)
-                for e in vis.edges
-            ],
-            groups=[VisGroupVM(id=g.id, label=g.label) for g in vis.groups],
-            mermaid=vis.to_mermaid() if (vis.nodes or vis.edges) else "",
+            nodes=RowSet(
+                rows_to_dicts(
+                    VisNodeVM(id=n.id, label=n.label, group=n.group or "", icon=n.icon)
+                    for n in nodes.values()
+                )
+            ),
+            edges=RowSet(
+                rows_to_dicts(
+                    VisEdgeVM(src=e.source, tgt=e.target, label=e.label, style=e.style)
+                    for e in vis.unique_edges()
+                )
+            ),
+            groups=[VisGroupVM(id=g.id, label=g.label) for g in vis.unique_groups()],
+            mermaid=mermaid,
+            svg=svg,
+            digest=bytes_hash((svg or mermaid).encode()),
+            echart=graph_option(vis.to_dict()) if large else None,
             layout=vis.layout,
-            has_data=bool(vis.nodes or vis.edges),
+            has_data=has_data,
+            summarized=summarized,
+            sections=self._sections(vis) if summarized else [],
+            providers=index.values("provider"),
+            modules=index.values("module"),
+        )
+
+    def _focus(
+        self,
+        index: GraphIndex,
+        focus: str = "",
+        hops: int = 2,
+        direction: str = "both",
+        groups: list[str] | None = None,
+        providers: list[str] | None = None,
+        modules: list[str] | None = None,
+    ) -> VisSectionVM:
+        """Draw the part of *index*'s graph a focus query selects."""
+        sub = index.query(
+            SubgraphQuery(
+                focus=focus.strip(),
+                hops=hops,
+                direction=direction,
+                groups=frozenset(groups or ()),
+                providers=frozenset(providers or ()),
+                modules=frozenset(modules or ()),
+            )
+        )
+        drawn = summarize(sub) if len(sub.nodes) > self.state.vis_node_limit else sub
+        mermaid, svg = drawn.to_mermaid(), self._svg(drawn, cache=False)
+        return VisSectionVM(
+            id="focus",
+            label=_focus_label(focus.strip(), hops, direction),
+            count=len(sub.nodes),
+            mermaid=mermaid,
+            svg=svg,
+            digest=bytes_hash((svg or mermaid).encode()),
         )
+
+    def _svg(self, vis: Visualization, cache: bool = True) -> str:
+        """Server-side drawing of *vis*, or "" when Mermaid draws it."""
+        if self.state.vis_renderer != "layered":
+            return ""
+        project = self.state.project
+        if project is None or not cache:
+            return to_svg(vis, layered_layout(vis))
+        return to_svg(vis, cached_layout(vis, project.cache_dir))
+
+    def _sections(self, vis: Visualization) -> list[VisSectionVM]:
+        labels = {g.id: g.label or g.id for g in vis.unique_groups()}
+        sections = []
+        for gid, sub in split_by_group(vis).items():
+            mermaid, svg = sub.to_mermaid(), self._svg(sub)
+            sections.append(
+                VisSectionVM(
+                    id=gid,
+                    label=labels[gid],
+                    count=sum(n.group == gid for n in sub.nodes),
+                    mermaid=mermaid,
+                    svg=svg,
+                    digest=bytes_hash((svg or mermaid).encode()),
+                )
+            )
+        return sections
+
+
+def _focus_label(focus: str, hops: int, direction: str) -> str:
+    if not focus:
+        return "Filtered"
+    if hops:
+        return f"{hops} hops of '{focus}'"
+    scope = {"out": "Dependencies", "in": "Blast radius"}.get(direction)
+    return f"{scope} of '{focus}'" if scope else f"Everything linked to '{focus}'"
@@ -3,11 +3,14 @@
 Injected into the Jinja2 rendering context so ``.il.sls`` / ``.il.tf``
 authors can annotate resources with visualisation hints.  Every function
 returns ``""`` so the rendered output stays clean.
+
+Calls are recorded into a context-local collector: every thread and every
+asyncio task sees its own, so concurrent renders never share nodes.
 """
 
 from __future__ import annotations
 
-import threading
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -22,15 +25,12 @@ class _Collector:
     notes: list[VisNote] = field(default_factory=list)
     layout: str = "dagre"
     source_file: str = ""
+    source_line: int = 0  # known only when calls are evaluated statically
 
     def to_vis(self) -> Visualization:
-        return Visualization(
-            list(self.nodes),
-            list(self.edges),
-            list(self.groups),
-            list(self.notes),
-            self.layout,
-        )
+        vis = Visualization(notes=list(self.notes), layout=self.layout)
+        vis.merge(Visualization(self.nodes, self.edges, self.groups))
+        return vis
 
     def clear(self) -> None:
         self.nodes.clear()
@@ -40,19 +40,25 @@ class _Collector:
         self.layout = "dagre"
 
 
-_local = threading.local()
+_current: ContextVar[_Collector | None] = ContextVar("il_collector", default=None)
 
 
 def _col() -> _Collector:
-    if not hasattr(_local, "c"):
-        _local.c = _Collector()
-    return _local.c
+    c = _current.get()
+    if c is None:
+        c = _Collector()
+        _current.set(c)
+    return c
 
 
 def begin_collect(source: str = "") -> None:
-    c = _col()
-    c.clear()
-    c.source_file = source
+    # A fresh collector per render — never clear one another context may hold.
+    _current.set(_Collector(source_file=source))
+
+
+def set_source_line(line: int) -> None:
+    """Attribute the next decorator calls to *line* of the current source."""
+    _col().source_line = line
 
 
 def end_collect() -> Visualization:
@@ -80,6 +86,7 @@ def il_node(
             shape=shape,
             group=group,
             source_file=_col().source_file,
+            source_line=_col().source_line,
             meta=dict(meta),
         )
     )
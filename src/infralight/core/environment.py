@@ -0,0 +1,264 @@
+"""Project Jinja2 environment — one long-lived instance per project root.
+
+Templates are addressed by their path relative to the project root
+(``saltstack/webserver.il.sls``).  The loader serves the in-memory
+content of scanned files and falls back to disk for anything else.
+Compiled templates are kept in the environment's template cache and
+persisted as bytecode under ``<root>/.infralight/bytecode`` so they
+survive server restarts.  Both caches are invalidated by source hash.
+
+``{% include %}`` / ``{% import %}`` names are project-root relative;
+names starting with ``./`` or ``../`` resolve against the including
+template's directory.  Every template's references are recorded so
+callers can ask which templates depend on a changed macro file.
+
+A second, sandboxed environment per root (``sandboxed=True``) is used by
+the render workers in :mod:`infralight.core.sandbox`; it compiles
+through Jinja's ``SandboxedEnvironment`` and keeps its own bytecode.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import posixpath
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    Template,
+    TemplateNotFound,
+    TemplateSyntaxError,
+    meta,
+)
+from jinja2.loaders import split_template_path
+from jinja2.sandbox import SandboxedEnvironment
+
+from infralight.core.decorators import IL_GLOBALS
+from infralight.core.models import CACHE_DIR_NAME, SourceFile
+
+log = logging.getLogger(__name__)
+
+
+def source_hash(text: str) -> str:
+    """Stable digest of template source, used for cache invalidation."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ProjectLoader(BaseLoader):
+    """Jinja loader backed by the project's files.
+
+    Scanned files are served from memory (see :meth:`sync`) so unsaved
+    state and on-disk state never diverge mid-render; anything else under
+    the root — e.g. shared macro files — is read from disk.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._sources: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def sync(self, files: Iterable[SourceFile]) -> None:
+        """Register the in-memory content of *files*."""
+        with self._lock:
+            for sf in files:
+                self._sources[self.template_name(sf)] = sf.content
+
+    def template_name(self, sf: SourceFile) -> str:
+        try:
+            return sf.path.relative_to(self.root).as_posix()
+        except ValueError:
+            return sf.name
+
+    def read(self, template: str) -> tuple[str, Path] | None:
+        """Return ``(source, path)`` for *template*, or ``None`` if missing."""
+        with self._lock:
+            src = self._sources.get(template)
+        try:
+            path = self.root.joinpath(*split_template_path(template))
+        except TemplateNotFound:
+            return None
+        if src is not None:
+            return src, path
+        if not path.is_file():
+            return None
+        try:
+            return path.read_text(encoding="utf-8"), path
+        except OSError:
+            return None
+
+    def current_hash(self, template: str) -> str | None:
+        found = self.read(template)
+        return source_hash(found[0]) if found else None
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str, Callable[[], bool]]:
+        found = self.read(template)
+        if found is None:
+            raise TemplateNotFound(template)
+        src, path = found
+        digest = source_hash(src)
+        return src, str(path), lambda: self.current_hash(template) == digest
+
+
+class _ProjectJinjaEnv(Environment):
+    """Environment that resolves ``./`` and ``../`` names relative to the parent."""
+
+    def join_path(self, template: str, parent: str) -> str:
+        if template.startswith(("./", "../")):
+            return posixpath.normpath(
+                posixpath.join(posixpath.dirname(parent), template)
+            )
+        return template
+
+
+class _SandboxedProjectJinjaEnv(_ProjectJinjaEnv, SandboxedEnvironment):
+    """Project path resolution on top of Jinja's sandbox."""
+
+
+@dataclass(frozen=True)
+class _DepInfo:
+    digest: str
+    direct: frozenset[str]
+    dynamic: bool  # references a template by a runtime expression
+
+
+class ProjectEnvironment:
+    """Shared Jinja environment, loader and bytecode cache for one project."""
+
+    def __init__(self, root: Path, sandboxed: bool = False) -> None:
+        self.root = root
+        self.sandboxed = sandboxed
+        self.loader = ProjectLoader(root)
+        self._deps: dict[str, _DepInfo] = {}
+        self._deps_lock = threading.Lock()
+        env_cls = _SandboxedProjectJinjaEnv if sandboxed else _ProjectJinjaEnv
+        self.env = env_cls(
+            loader=self.loader,
+            keep_trailing_newline=True,
+            auto_reload=True,
+            bytecode_cache=_bytecode_cache(root, sandboxed),
+        )
+        self.env.globals.update(IL_GLOBALS)
+
+    def template_name(self, sf: SourceFile) -> str:
+        return self.loader.template_name(sf)
+
+    def get_template(self, sf: SourceFile) -> Template:
+        """Return the compiled template for *sf*, compiling only on change."""
+        self.loader.sync([sf])
+        return self.env.get_template(self.template_name(sf))
+
+    # ── Dependency graph ─────────────────────────────────────────
+
+    def _dep_info(self, name: str) -> _DepInfo | None:
+        found = self.loader.read(name)
+        if found is None:
+            return None
+        src = found[0]
+        digest = source_hash(src)
+        with self._deps_lock:
+            info = self._deps.get(name)
+        if info is not None and info.digest == digest:
+            return info
+
+        direct: set[str] = set()
+        dynamic = False
+        try:
+            for ref in meta.find_referenced_templates(self.env.parse(src, name)):
+                if ref is None:
+                    dynamic = True
+                else:
+                    direct.add(self.env.join_path(ref, name))
+        except TemplateSyntaxError:
+            pass  # reported when the template itself is rendered
+        info = _DepInfo(digest, frozenset(direct), dynamic)
+        with self._deps_lock:
+            self._deps[name] = info
+        return info
+
+    def dependencies(self, name: str) -> frozenset[str]:
+        """All templates *name* includes or imports, transitively."""
+        seen: set[str] = set()
+        stack = [name]
+        while stack:
+            info = self._dep_info(stack.pop())
+            if info is None:
+                continue
+            for dep in info.direct - seen:
+                seen.add(dep)
+                stack.append(dep)
+        seen.discard(name)
+        return frozenset(seen)
+
+    def dependents(self, name: str) -> set[str]:
+        """Known templates that include or import *name*, transitively."""
+        with self._deps_lock:
+            known = list(self._deps)
+        return {t for t in known if t != name and name in self.dependencies(t)}
+
+    def dependency_graph(self) -> dict[str, frozenset[str]]:
+        """Direct references of every template seen so far."""
+        with self._deps_lock:
+            return {name: info.direct for name, info in self._deps.items()}
+
+    def dependency_hashes(self, name: str) -> dict[str, str] | None:
+        """Source digest of every template *name* depends on.
+
+        Returns ``None`` when any template in the chain references another
+        by a runtime expression — its inputs can't be known without
+        rendering it.  Missing dependencies hash to ``"-"``.
+        """
+        info = self._dep_info(name)
+        if info is None or info.dynamic:
+            return None
+        hashes: dict[str, str] = {}
+        for dep in sorted(self.dependencies(name)):
+            dep_info = self._dep_info(dep)
+            if dep_info is not None and dep_info.dynamic:
+                return None
+            hashes[dep] = dep_info.digest if dep_info else "-"
+        return hashes
+
+    def fingerprint(self, name: str) -> str | None:
+        """Digest of *name*'s source plus every template it depends on."""
+        info = self._dep_info(name)
+        deps = self.dependency_hashes(name)
+        if info is None or deps is None:
+            return None
+        h = hashlib.sha1(info.digest.encode())
+        for dep, digest in deps.items():
+            h.update(f"\0{dep}\0{digest}".encode())
+        return h.hexdigest()
+
+
+def _bytecode_cache(root: Path, sandboxed: bool) -> FileSystemBytecodeCache | None:
+    # Sandboxed compilation emits different code, so it can't share files
+    name = "bytecode-sandbox" if sandboxed else "bytecode"
+    directory = root / CACHE_DIR_NAME / name
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        log.warning("Bytecode cache disabled for %s: %s", root, exc)
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
+_environments: dict[tuple[Path, bool], ProjectEnvironment] = {}
+_environments_lock = threading.Lock()
+
+
+def get_environment(root: Path, sandboxed: bool = False) -> ProjectEnvironment:
+    """Return the process-wide environment for *root*, creating it once."""
+    key = (root.resolve(), sandboxed)
+    with _environments_lock:
+        penv = _environments.get(key)
+        if penv is None:
+            penv = _environments[key] = ProjectEnvironment(*key)
+        return penv
@@ -0,0 +1,91 @@
+"""Static decorator extraction — collect il_* calls without rendering.
+
+Most IL templates declare their graph as top-level ``{{ il_node(...) }}``
+lines with literal arguments.  For those the graph can be read straight
+off the Jinja AST: parse once, evaluate each call's literal arguments,
+and invoke the decorator directly.  Anything whose result could depend
+on runtime values — a decorator inside ``{% if %}`` / ``{% for %}`` / a
+macro, a non-literal argument, an include or import — makes
+:func:`extract_static` return ``None`` so the caller falls back to a
+full render.  Expressions, even constant ones, are never folded here:
+this runs in the server process, outside the render sandbox.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from jinja2 import TemplateSyntaxError, nodes
+
+from infralight.core.decorators import (
+    IL_GLOBALS,
+    begin_collect,
+    end_collect,
+    set_source_line,
+)
+from infralight.core.environment import ProjectEnvironment
+from infralight.core.models import SourceFile, Visualization
+
+# Nodes that pull in other templates, which may call decorators themselves
+_EXTERNAL = (nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends)
+
+# Argument nodes that are plain data — cheap to evaluate whatever their value
+_LITERAL = (nodes.Const, nodes.List, nodes.Tuple, nodes.Dict, nodes.Pair, nodes.Neg)
+
+
+def _top_level_calls(tree: nodes.Template) -> list[nodes.Call]:
+    calls: list[nodes.Call] = []
+    for node in tree.body:
+        if not isinstance(node, nodes.Output):
+            continue
+        for expr in node.nodes:
+            if (
+                isinstance(expr, nodes.Call)
+                and isinstance(expr.node, nodes.Name)
+                and expr.node.name in IL_GLOBALS
+            ):
+                calls.append(expr)
+    return calls
+
+
+def _const_args(
+    call: nodes.Call, eval_ctx: nodes.EvalContext
+) -> tuple[list[Any], dict[str, Any]]:
+    """Evaluate *call*'s arguments, raising ``Impossible`` if any isn't literal."""
+    if call.dyn_args is not None or call.dyn_kwargs is not None:
+        raise nodes.Impossible()
+    for arg in [*call.args, *(kw.value for kw in call.kwargs)]:
+        if not all(isinstance(n, _LITERAL) for n in (arg, *arg.find_all(nodes.Node))):
+            raise nodes.Impossible()
+    args = [a.as_const(eval_ctx) for a in call.args]
+    kwargs = {kw.key: kw.value.as_const(eval_ctx) for kw in call.kwargs}
+    return args, kwargs
+
+
+def extract_static(sf: SourceFile, penv: ProjectEnvironment) -> Visualization | None:
+    """Return *sf*'s decorator graph from its AST, or ``None`` to render it."""
+    name = penv.template_name(sf)
+    try:
+        tree = penv.env.parse(sf.content, name)
+    except TemplateSyntaxError:
+        return None
+    if any(True for _ in tree.find_all(_EXTERNAL)):
+        return None
+
+    calls = _top_level_calls(tree)
+    accepted = {id(call.node) for call in calls}
+    for ref in tree.find_all(nodes.Name):
+        if ref.name in IL_GLOBALS and id(ref) not in accepted:
+            return None  # used somewhere a plain top-level call can't describe
+
+    eval_ctx = nodes.EvalContext(penv.env, name)
+    begin_collect(str(sf.path))
+    try:
+        for call in calls:
+            args, kwargs = _const_args(call, eval_ctx)
+            set_source_line(call.lineno)
+            IL_GLOBALS[call.node.name](*args, **kwargs)  # type: ignore[attr-defined]
+    except Exception:
+        end_collect()
+        return None
+    return end_collect()
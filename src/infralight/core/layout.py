@@ -0,0 +1,538 @@
+"""Layered graph layout — node positions computed on the server.
+
+A Sugiyama-style layout over a :class:`Visualization`, drawn top-down:
+
+1. cycles are broken by reversing DFS back edges;
+2. nodes are ranked by longest path, with sources pulled down next to
+   their first successor;
+3. edges spanning several ranks get dummy nodes, so each layer is only
+   connected to its neighbours;
+4. crossings are reduced by alternating barycenter sweeps;
+5. x coordinates are the least-squares fit to each node's neighbours
+   that keeps the layer order and spacing (isotonic regression).
+
+Nodes without edges are packed into a grid below the drawing.  Like
+the other views, the layout and the drawing only see the deduplicated
+graph (:meth:`Visualization.node_map`, :meth:`~Visualization.unique_edges`).
+
+Groups are drawn as boxes, as Mermaid draws subgraphs.  Each layer keeps
+a group's nodes together, in one group order shared by all layers, and
+every group then gets its own vertical band, so boxes never overlap;
+a group's unconnected nodes fill a grid at the bottom of its band.
+Graphs without groups are laid out exactly as above.
+
+:func:`cached_layout` stores the result under ``.infralight/layout``
+keyed by a hash of the graph, so a graph is laid out once per change
+rather than once per page view, and keeps the most recently used
+layouts; :func:`to_svg` draws it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import html
+import itertools
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from infralight.core.manifest import write_if_changed
+from infralight.core.models import Visualization
+
+log = logging.getLogger(__name__)
+
+_VERSION = 3
+_MAX_CACHED = 256  # layout files kept per project
+
+NODE_H = 36.0
+RANK_GAP = 64.0
+NODE_GAP = 24.0
+DUMMY_W = 8.0
+PAD = 20.0
+CHAR_W = 7.0
+MAX_LABEL = 40
+SWEEPS = 8
+GROUP_PAD = 12.0  # between a group's box and its nodes
+GROUP_HEAD = 20.0  # room for the group label above its nodes
+BAND_GAP = 32.0  # between neighbouring group bands
+
+
+@dataclass
+class NodeBox:
+    x: float  # centre
+    y: float
+    w: float
+    h: float
+
+
+@dataclass
+class GraphLayout:
+    nodes: dict[str, NodeBox] = field(default_factory=dict)
+    # Polyline of each drawn edge, keyed by its index in ``vis.unique_edges()``
+    edges: dict[int, list[tuple[float, float]]] = field(default_factory=dict)
+    # Box of each group with nodes, in drawing order
+    groups: dict[str, NodeBox] = field(default_factory=dict)
+    width: float = 0.0
+    height: float = 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": _VERSION,
+            "nodes": {k: [b.x, b.y, b.w, b.h] for k, b in self.nodes.items()},
+            "edges": [[i, pts] for i, pts in self.edges.items()],
+            "groups": {k: [b.x, b.y, b.w, b.h] for k, b in self.groups.items()},
+            "width": self.width,
+            "height": self.height,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> GraphLayout:
+        if data.get("version") != _VERSION:
+            raise ValueError("layout version mismatch")
+        return cls(
+            nodes={k: NodeBox(*v) for k, v in data["nodes"].items()},
+            edges={int(i): [(x, y) for x, y in pts] for i, pts in data["edges"]},
+            groups={k: NodeBox(*v) for k, v in data["groups"].items()},
+            width=data["width"],
+            height=data["height"],
+        )
+
+
+def _short(label: str) -> str:
+    return label if len(label) <= MAX_LABEL else label[: MAX_LABEL - 1] + "…"
+
+
+def _node_width(label: str) -> float:
+    return max(60.0, CHAR_W * len(_short(label)) + 24.0)
+
+
+def graph_key(vis: Visualization) -> str:
+    """Hash of everything the layout depends on."""
+    data = [
+        _VERSION,
+        [(n.id, n.label or n.id, n.group) for n in vis.node_map().values()],
+        [(e.source, e.target) for e in vis.unique_edges()],
+        [g.id for g in vis.unique_groups()],
+    ]
+    return hashlib.sha1(json.dumps(data).encode()).hexdigest()
+
+
+def _break_cycles(n: int, succ: list[list[int]]) -> set[tuple[int, int]]:
+    """Back edges of an iterative DFS — reversing them leaves a DAG."""
+    state = [0] * n  # 0 new, 1 on stack, 2 done
+    back: set[tuple[int, int]] = set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ[root]))]
+        while stack:
+            v, it = stack[-1]
+            for w in it:
+                if state[w] == 1:
+                    back.add((v, w))
+                elif state[w] == 0:
+                    state[w] = 1
+                    stack.append((w, iter(succ[w])))
+                    break
+            else:
+                state[v] = 2
+                stack.pop()
+    return back
+
+
+def _rank(n: int, succ: list[list[int]], pred: list[list[int]]) -> list[int]:
+    """Longest-path layering of a DAG."""
+    indeg = [len(p) for p in pred]
+    order = [v for v in range(n) if not indeg[v]]
+    for v in order:  # grows while iterating — Kahn's algorithm
+        for w in succ[v]:
+            indeg[w] -= 1
+            if not indeg[w]:
+                order.append(w)
+    rank = [0] * n
+    for v in order:
+        for w in succ[v]:
+            rank[w] = max(rank[w], rank[v] + 1)
+    # Sources sit right above their closest successor, not on rank 0
+    for v in reversed(order):
+        if not pred[v] and succ[v]:
+            rank[v] = min(rank[w] for w in succ[v]) - 1
+    return rank
+
+
+def _fit(pref: list[float], widths: list[float]) -> list[float]:
+    """Closest positions to *pref* that keep order and spacing."""
+    offsets = [0.0]
+    for a, b in itertools.pairwise(widths):
+        offsets.append(offsets[-1] + (a + b) / 2 + NODE_GAP)
+    # Isotonic regression (pool adjacent violators) of pref - offset
+    blocks: list[list[float]] = []  # [mean, count]
+    for p, o in zip(pref, offsets, strict=True):
+        blocks.append([p - o, 1.0])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            m2, c2 = blocks.pop()
+            m1, c1 = blocks[-1]
+            blocks[-1] = [(m1 * c1 + m2 * c2) / (c1 + c2), c1 + c2]
+    fitted = [m for m, c in blocks for _ in range(int(c))]
+    return [f + o for f, o in zip(fitted, offsets, strict=True)]
+
+
+def layered_layout(vis: Visualization) -> GraphLayout:
+    """Lay *vis* out top-down; see the module docstring."""
+    group_ids = {g.id for g in vis.unique_groups()}
+    nodes = vis.node_map()
+    ids = list(nodes)
+    labels = {nid: n.label or nid for nid, n in nodes.items()}
+    group_of = {
+        nid: n.group if n.group in group_ids else "" for nid, n in nodes.items()
+    }
+    index = {nid: i for i, nid in enumerate(ids)}
+    n = len(ids)
+    gid = [group_of[nid] for nid in ids]  # "" = ungrouped; grows with dummies
+    grouped = any(gid)
+
+    pairs: dict[tuple[int, int], list[int]] = {}  # (u, v) -> edge indices
+    for i, e in enumerate(vis.unique_edges()):
+        u, v = index.get(e.source), index.get(e.target)
+        if u is not None and v is not None and u != v:
+            pairs.setdefault((u, v), []).append(i)
+
+    succ: list[list[int]] = [[] for _ in range(n)]
+    for u, v in pairs:
+        succ[u].append(v)
+    back = _break_cycles(n, succ)
+    dag: dict[tuple[int, int], tuple[int, int]] = {}  # DAG edge -> original
+    for u, v in pairs:
+        key = (v, u) if (u, v) in back else (u, v)
+        dag.setdefault(key, (u, v))
+    succ = [[] for _ in range(n)]
+    pred: list[list[int]] = [[] for _ in range(n)]
+    for a, b in dag:
+        succ[a].append(b)
+        pred[b].append(a)
+    rank = _rank(n, succ, pred)
+
+    connected = [v for v in range(n) if succ[v] or pred[v]]
+    isolated = [v for v in range(n) if not (succ[v] or pred[v])]
+
+    # Dummy nodes split long edges into one-rank segments
+    widths = [_node_width(labels[nid]) for nid in ids]
+    up: list[list[int]] = [list(p) for p in pred]
+    down: list[list[int]] = [list(s) for s in succ]
+    chains: dict[tuple[int, int], list[int]] = {}
+    for a, b in dag:
+        if rank[b] - rank[a] <= 1:
+            chains[(a, b)] = [a, b]
+            continue
+        down[a].remove(b)
+        up[b].remove(a)
+        chain = [a]
+        for r in range(rank[a] + 1, rank[b]):
+            d = len(rank)
+            rank.append(r)
+            widths.append(DUMMY_W)
+            gid.append(gid[a] if gid[a] == gid[b] else "")
+            up.append([chain[-1]])
+            down.append([])
+            down[chain[-1]].append(d)
+            chain.append(d)
+        down[chain[-1]].append(b)
+        up[b].append(chain[-1])
+        chain.append(b)
+        chains[(a, b)] = chain
+
+    layers: dict[int, list[int]] = {}
+    for v in connected + list(range(n, len(rank))):
+        layers.setdefault(rank[v], []).append(v)
+    ordered = [layers[r] for r in sorted(layers)]
+
+    # Crossing reduction — barycenter sweeps, down then up
+    pos = [0.0] * len(rank)
+    for layer in ordered:
+        for i, v in enumerate(layer):
+            pos[v] = i
+    group_rank: dict[str, int] = {}
+
+    def sweeps() -> None:
+        for sweep in range(SWEEPS):
+            downward = sweep % 2 == 0
+            seq = ordered[1:] if downward else ordered[-2::-1]
+            for layer in seq:
+                nbrs = up if downward else down
+
+                def key(v: int, nbrs: list[list[int]] = nbrs) -> tuple[int, float]:
+                    ns = nbrs[v]
+                    bary = sum(pos[w] for w in ns) / len(ns) if ns else pos[v]
+                    return group_rank.get(gid[v], 0), bary
+
+                layer.sort(key=key)
+                for i, v in enumerate(layer):
+                    pos[v] = i
+
+    sweeps()
+    if grouped:
+        # One group order for every layer (by mean relative position),
+        # then sweep again keeping each group's nodes together
+        spread: dict[str, list[float]] = {}
+        for layer in ordered:
+            for v in layer:
+                spread.setdefault(gid[v], []).append(pos[v] / max(len(layer), 1))
+        for g in sorted(spread, key=lambda g: sum(spread[g]) / len(spread[g])):
+            group_rank[g] = len(group_rank)
+        for layer in ordered:
+            layer.sort(key=lambda v: (group_rank[gid[v]], pos[v]))
+            for i, v in enumerate(layer):
+                pos[v] = i
+        sweeps()
+
+    # Coordinates — pack, then pull towards neighbours
+    x = [0.0] * len(rank)
+    for layer in ordered:
+        cursor = 0.0
+        for v in layer:
+            x[v] = cursor + widths[v] / 2
+            cursor += widths[v] + NODE_GAP
+    for sweep in range(4):
+        nbrs = up if sweep % 2 == 0 else down
+        for layer in ordered if sweep % 2 == 0 else ordered[::-1]:
+            pref = [
+                sum(x[w] for w in nbrs[v]) / len(nbrs[v]) if nbrs[v] else x[v]
+                for v in layer
+            ]
+            for v, xv in zip(
+                layer, _fit(pref, [widths[v] for v in layer]), strict=True
+            ):
+                x[v] = xv
+
+    layout = GraphLayout()
+    top = PAD + (GROUP_PAD + GROUP_HEAD if grouped else 0.0)
+    base = min(rank[v] for v in connected) if connected else 0
+    left = min((x[v] - widths[v] / 2 for layer in ordered for v in layer), default=0)
+    y = [top + (r - base) * (NODE_H + RANK_GAP) + NODE_H / 2 for r in rank]
+    for v in range(len(rank)):
+        x[v] += PAD - left
+    if grouped:
+        width, height = _bands(layout, ids, gid, x, y, widths, ordered, isolated, top)
+    else:
+        width = max((x[v] + widths[v] / 2 for v in connected), default=0) + PAD
+        height = max((y[v] + NODE_H / 2 for v in connected), default=0) + PAD
+    for v in connected:
+        layout.nodes[ids[v]] = NodeBox(x[v], y[v], widths[v], NODE_H)
+
+    for (a, b), (u, v) in dag.items():
+        chain = chains[(a, b)]
+        pts = [(x[a], y[a] + NODE_H / 2)]
+        pts += [(x[d], y[d]) for d in chain[1:-1]]
+        pts.append((x[b], y[b] - NODE_H / 2))
+        if (a, b) != (u, v):
+            pts.reverse()
+        for i in pairs[(u, v)]:
+            layout.edges[i] = pts
+        if (v, u) in pairs and (v, u) not in dag.values():
+            for i in pairs[(v, u)]:
+                layout.edges[i] = pts[::-1]
+
+    # Isolated nodes — a grid below the drawing
+    if isolated and not grouped:
+        row_w = max(width, 800.0)
+        cx, cy = PAD, (height if connected else PAD) + NODE_H / 2
+        for v in isolated:
+            if cx + widths[v] > row_w and cx > PAD:
+                cx, cy = PAD, cy + NODE_H + NODE_GAP
+            layout.nodes[ids[v]] = NodeBox(cx + widths[v] / 2, cy, widths[v], NODE_H)
+            cx += widths[v] + NODE_GAP
+            width = max(width, cx + PAD)
+        height = cy + NODE_H / 2 + PAD
+
+    layout.width, layout.height = width, height
+    return layout
+
+
+def _bands(
+    layout: GraphLayout,
+    ids: list[str],
+    gid: list[str],
+    x: list[float],
+    y: list[float],
+    widths: list[float],
+    ordered: list[list[int]],
+    isolated: list[int],
+    top: float,
+) -> tuple[float, float]:
+    """Move each group into its own band and box it; returns the size.
+
+    Within a band, each layer's nodes (and dummies) are packed and
+    centred in their layer order, rewriting *x*.  The *isolated* nodes
+    fill a grid at the bottom of their band, below the layered part (or
+    from *top* down when nothing is layered).  Bands follow the groups'
+    order in the layers; groups with only unconnected nodes come last.
+    """
+    members: dict[str, list[int]] = {}
+    for layer in ordered:
+        for v in layer:
+            members.setdefault(gid[v], []).append(v)
+    loose: dict[str, list[int]] = {}
+    for v in isolated:
+        loose.setdefault(gid[v], []).append(v)
+    order = list(members)
+    order.sort(key=lambda g: min(x[v] for v in members[g]))
+    order += [g for g in loose if g not in members]
+
+    bottoms = [y[v] + NODE_H / 2 for m in members.values() for v in m]
+    grid_top = max(bottoms) + NODE_GAP if bottoms else top
+    cursor, height = PAD, 0.0
+    for g in order:
+        inner = cursor + (GROUP_PAD if g else 0.0)
+        right = inner
+        boxes: list[tuple[float, float]] = []  # (top, bottom) of each node
+        if g in members:
+            # Each layer's part of the group packed and centred in the band
+            rows: dict[float, list[int]] = {}
+            for v in members[g]:
+                rows.setdefault(y[v], []).append(v)
+            spans = {
+                r: sum(widths[v] for v in vs) + NODE_GAP * (len(vs) - 1)
+                for r, vs in rows.items()
+            }
+            band = max(spans.values())
+            for r, vs in rows.items():
+                cx = inner + (band - spans[r]) / 2
+                for v in vs:
+                    x[v] = cx + widths[v] / 2
+                    cx += widths[v] + NODE_GAP
+                    if v < len(ids):
+                        boxes.append((r - NODE_H / 2, r + NODE_H / 2))
+            right = inner + band
+        grid = loose.get(g, [])
+        cols = math.ceil(math.sqrt(len(grid)))  # roughly square
+        cell = max((widths[v] for v in grid), default=0.0) + NODE_GAP
+        row_w = max(right - inner, cols * cell)
+        cx, cy = inner, grid_top + NODE_H / 2
+        for v in grid:
+            if cx + widths[v] > inner + row_w and cx > inner:
+                cx, cy = inner, cy + NODE_H + NODE_GAP
+            layout.nodes[ids[v]] = NodeBox(cx + widths[v] / 2, cy, widths[v], NODE_H)
+            boxes.append((cy - NODE_H / 2, cy + NODE_H / 2))
+            cx += widths[v] + NODE_GAP
+            right = max(right, cx - NODE_GAP)
+        if g and boxes:
+            box_top = min(t for t, _ in boxes) - GROUP_PAD - GROUP_HEAD
+            box_bottom = max(b for _, b in boxes) + GROUP_PAD
+            box_w = right - inner + 2 * GROUP_PAD
+            layout.groups[g] = NodeBox(
+                cursor + box_w / 2,
+                (box_top + box_bottom) / 2,
+                box_w,
+                box_bottom - box_top,
+            )
+            right += GROUP_PAD
+            height = max(height, box_bottom)
+        height = max(height, max((b for _, b in boxes), default=0.0))
+        cursor = right + BAND_GAP
+    return cursor - BAND_GAP + PAD, height + PAD
+
+
+def cached_layout(vis: Visualization, cache_dir: Path) -> GraphLayout:
+    """:func:`layered_layout` of *vis*, stored under *cache_dir*/layout."""
+    directory = cache_dir / "layout"
+    path = directory / f"{graph_key(vis)}.json"
+    try:
+        layout = GraphLayout.from_json(json.loads(path.read_text(encoding="utf-8")))
+        with contextlib.suppress(OSError):
+            os.utime(path)  # mark as recently used for _prune
+        return layout
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        log.warning("Ignoring unreadable layout %s: %s", path, exc)
+    layout = layered_layout(vis)
+    try:
+        write_if_changed(path, json.dumps(layout.to_json()).encode())
+        _prune(directory)
+    except OSError as exc:
+        log.warning("Could not write layout %s: %s", path, exc)
+    return layout
+
+
+def _prune(directory: Path) -> None:
+    """Keep the ``_MAX_CACHED`` most recently used layouts."""
+    files = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for stale in files[:-_MAX_CACHED]:
+        stale.unlink(missing_ok=True)
+
+
+def to_svg(vis: Visualization, layout: GraphLayout) -> str:
+    """Draw *vis* at the positions in *layout*."""
+    esc = html.escape
+    groups = {g.id: g.label or g.id for g in vis.unique_groups()}
+    colors = {g.id: g.color for g in vis.unique_groups()}
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" class="il-layered" '
+        f'width="{layout.width:.0f}" height="{layout.height:.0f}" '
+        f'viewBox="0 0 {layout.width:.0f} {layout.height:.0f}">',
+        '<defs><marker id="il-arrow" viewBox="0 0 10 10" refX="10" refY="5" '
+        'markerWidth="7" markerHeight="7" orient="auto-start-reverse">'
+        '<path d="M0,0 L10,5 L0,10 z" fill="#90A4AE"/></marker></defs>',
+    ]
+    for gid, box in layout.groups.items():
+        if gid not in groups:
+            continue
+        x0, y0 = box.x - box.w / 2, box.y - box.h / 2
+        parts.append(
+            f'<g class="il-group" data-id="{esc(gid)}">'
+            f'<rect x="{x0:.1f}" y="{y0:.1f}" width="{box.w:.1f}" '
+            f'height="{box.h:.1f}" rx="10" fill="{esc(colors[gid])}" '
+            f'fill-opacity="0.18" stroke="{esc(colors[gid])}" stroke-width="1"/>'
+            f'<text x="{x0 + GROUP_PAD:.1f}" y="{y0 + GROUP_HEAD - 4:.1f}" '
+            f'font-size="12" font-weight="bold" fill="#B0BEC5">'
+            f"{esc(_short(groups[gid]))}</text></g>"
+        )
+    for i, e in enumerate(vis.unique_edges()):
+        pts = layout.edges.get(i)
+        if not pts:
+            continue
+        dash = ' stroke-dasharray="5,4"' if e.style != "solid" else ""
+        points = " ".join(f"{px:.1f},{py:.1f}" for px, py in pts)
+        parts.append(
+            f'<polyline points="{points}" fill="none" stroke="{esc(e.color)}" '
+            f'stroke-width="1.5"{dash} marker-end="url(#il-arrow)"/>'
+        )
+        if e.label:
+            mx, my = pts[len(pts) // 2] if len(pts) > 2 else _mid(pts)
+            parts.append(
+                f'<text x="{mx:.1f}" y="{my:.1f}" class="il-edge-label" '
+                f'text-anchor="middle" font-size="10" fill="#9E9E9E">'
+                f"{esc(e.label)}</text>"
+            )
+    for node in vis.node_map().values():
+        nbox = layout.nodes.get(node.id)
+        if nbox is None:
+            continue
+        label = node.label or node.id
+        title = label
+        if node.group in groups:
+            title += f"\n{groups[node.group]}"
+        if node.source_file:
+            title += f"\n{node.source_file}:{node.source_line}"
+        parts.append(
+            f'<g class="il-node" data-id="{esc(node.id)}"><title>{esc(title)}</title>'
+            f'<rect x="{nbox.x - nbox.w / 2:.1f}" y="{nbox.y - nbox.h / 2:.1f}" '
+            f'width="{nbox.w:.1f}" height="{nbox.h:.1f}" rx="8" '
+            f'fill="#1e1e2e" stroke="{esc(node.color)}" stroke-width="1.5"/>'
+            f'<text x="{nbox.x:.1f}" y="{nbox.y:.1f}" text-anchor="middle" '
+            f'dominant-baseline="central" font-size="12" fill="#E0E0E0">'
+            f"{esc(_short(label))}</text></g>"
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _mid(pts: list[tuple[float, float]]) -> tuple[float, float]:
+    (x1, y1), (x2, y2) = pts[0], pts[-1]
+    return (x1 + x2) / 2, (y1 + y2) / 2
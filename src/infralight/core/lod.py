@@ -0,0 +1,139 @@
+"""Level of detail — keep large graphs small enough to lay out.
+
+Mermaid's layout time grows super-linearly with graph size and it
+refuses sources above ``maxTextSize``, so big graphs are never sent
+whole.  :func:`summarize` collapses each :class:`VisGroup` into one
+summary node, with the edges between groups merged into weighted
+summary edges.  :func:`split_by_group` cuts a graph into one diagram
+per group, each showing the group's nodes plus the neighbours it
+connects to, so the detail can be loaded one group at a time.
+
+Pure functions — the input graph is never modified.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from infralight.core.models import VisEdge, VisNode, Visualization
+
+# Graphs with more nodes than this are shown summarised by default
+NODE_LIMIT = 150
+
+
+def summary_id(group_id: str) -> str:
+    """Node id standing in for collapsed group *group_id*."""
+    return f"{group_id}__summary"
+
+
+@dataclass
+class _Bundle:
+    """Edges merged into one summary edge."""
+
+    first: VisEdge
+    labels: dict[str, None] = field(default_factory=dict)  # ordered set
+    weight: int = 0
+
+
+def summarize(vis: Visualization) -> Visualization:
+    """*vis* with every group collapsed to one node.
+
+    Summary nodes carry ``meta["count"]`` (members) and ``meta["group"]``;
+    summary edges carry ``meta["weight"]`` (edges merged).  Edges inside
+    a collapsed group disappear.
+    """
+    groups = vis.unique_groups()
+    members: dict[str, list[VisNode]] = {g.id: [] for g in groups}
+    for n in vis.node_map().values():
+        if n.group in members:
+            members[n.group].append(n)
+
+    out = Visualization(layout=vis.layout, notes=list(vis.notes))
+    rep: dict[str, str] = {}  # original node id -> id in the summary
+    for g in groups:
+        nodes = members[g.id]
+        if not nodes:
+            continue
+        sid = summary_id(g.id)
+        for n in nodes:
+            rep[n.id] = sid
+        out.nodes.append(
+            VisNode(
+                id=sid,
+                label=f"{g.label or g.id} ({len(nodes)})",
+                icon=g.icon,
+                color=g.color,
+                shape="group",
+                meta={"group": g.id, "count": len(nodes)},
+            )
+        )
+    for n in vis.node_map().values():
+        if n.id not in rep:
+            out.nodes.append(n)
+
+    bundles: dict[tuple[str, str, str], _Bundle] = {}
+    for e in vis.unique_edges():
+        src = rep.get(e.source, e.source)
+        tgt = rep.get(e.target, e.target)
+        if src == tgt and src != e.source:
+            continue  # internal to a collapsed group
+        bundle = bundles.get((src, tgt, e.style))
+        if bundle is None:
+            bundle = bundles[(src, tgt, e.style)] = _Bundle(e)
+        bundle.labels[e.label] = None
+        bundle.weight += 1
+
+    for (src, tgt, style), b in bundles.items():
+        if b.weight == 1 and src == b.first.source and tgt == b.first.target:
+            out.edges.append(b.first)
+            continue
+        labels = [lbl for lbl in b.labels if lbl]
+        label = "/".join(labels) if len(labels) <= 2 else "mixed"
+        out.edges.append(
+            VisEdge(
+                source=src,
+                target=tgt,
+                label=f"{label} x{b.weight}" if b.weight > 1 else label,
+                style=style,
+                color=b.first.color,
+                meta={"weight": b.weight},
+            )
+        )
+    return out
+
+
+def split_by_group(vis: Visualization) -> dict[str, Visualization]:
+    """One diagram per group of *vis*, keyed by group id.
+
+    Each holds the group's nodes and every edge touching them.  Nodes at
+    the other end of those edges are included under their own groups, so
+    the diagram shows where the group connects to.
+    """
+    by_id = vis.node_map()
+    groups = {g.id: g for g in vis.unique_groups()}
+    parts = {
+        gid: (Visualization(layout=vis.layout), {gid: None}, set[str]())
+        for gid in groups
+    }
+    for n in by_id.values():
+        part = parts.get(n.group or "")
+        if part is not None:
+            part[0].nodes.append(n)
+            part[2].add(n.id)
+
+    for e in vis.unique_edges():
+        ends = [by_id[nid] for nid in (e.source, e.target) if nid in by_id]
+        for gid in {n.group for n in ends if n.group in parts}:
+            sub, used, present = parts[gid or ""]
+            sub.edges.append(e)
+            for n in ends:
+                if n.id in present:
+                    continue
+                present.add(n.id)
+                sub.nodes.append(n)
+                if n.group in groups:
+                    used[n.group or ""] = None
+
+    for sub, used, _present in parts.values():
+        sub.groups = [groups[g] for g in used]
+    return {gid: part[0] for gid, part in parts.items() if part[0].nodes}
@@ -0,0 +1,225 @@
+"""Render manifest — remembers what each IL template last rendered from.
+
+One JSON file per project (``<root>/.infralight/manifest.json``) maps a
+template name to the hashes of its source, of every template it
+includes/imports, and of the output it produced.  ``render_all`` uses
+it to skip templates whose inputs haven't changed.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+_VERSION = 1
+_BLOCK = 1 << 16
+
+_umask: int | None = None
+_umask_lock = threading.Lock()
+
+
+def _default_mode() -> int:
+    """Mode a newly created file gets (mkstemp's are 0600, outputs aren't).
+
+    The umask is read from ``/proc`` where possible; elsewhere it can
+    only be read by setting it, which is done once, under a lock.
+    """
+    global _umask
+    with _umask_lock:
+        if _umask is None:
+            try:
+                status = Path("/proc/self/status").read_text()
+                _umask = int(status.split("Umask:", 1)[1].split()[0], 8)
+            except (OSError, IndexError, ValueError):
+                _umask = os.umask(0o022)
+                os.umask(_umask)
+        return 0o666 & ~_umask
+
+
+def bytes_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """:func:`bytes_hash` of *path*'s contents, read in blocks."""
+    h = hashlib.sha1()
+    with path.open("rb") as fh:
+        while block := fh.read(_BLOCK):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _temp_prefix(path: Path, pid: int | None = None) -> str:
+    """Name prefix of the temporary files process *pid* (default: this
+    one) writes *path* through."""
+    return f".{path.name}.{os.getpid() if pid is None else pid}."
+
+
+def remove_temp_files(path: Path, pid: int) -> int:
+    """Delete temporary files process *pid* left beside *path*.
+
+    A writer killed mid-write never gets to remove its temporary file;
+    its parent calls this instead.  Returns the number removed.
+    """
+    removed = 0
+    for tmp in path.parent.glob(glob.escape(_temp_prefix(path, pid)) + "*"):
+        try:
+            tmp.unlink()
+            removed += 1
+        except OSError as exc:
+            log.warning("Could not remove %s: %s", tmp, exc)
+    return removed
+
+
+def _publish(tmp: str, path: Path) -> None:
+    """Give *tmp* *path*'s mode (or the default one) and move it into place."""
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except OSError:
+        mode = _default_mode()
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically replace *path* with *data* unless it already holds it.
+
+    Returns True when the file was written.  Leaving identical files
+    untouched keeps their mtime stable for downstream watchers.
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=_temp_prefix(path))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        _publish(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_stream(path: Path, chunks: Iterable[bytes]) -> tuple[bool, str]:
+    """Stream *chunks* to a temporary file, then atomically replace *path*.
+
+    Returns ``(written, digest)``.  Like :func:`write_if_changed`, an
+    existing file with the same bytes is left untouched.  If *chunks*
+    raises, *path* is untouched and the temporary file removed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    h = hashlib.sha1()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=_temp_prefix(path))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in chunks:
+                h.update(chunk)
+                size += len(chunk)
+                fh.write(chunk)
+        digest = h.hexdigest()
+        try:
+            same = path.stat().st_size == size and file_hash(path) == digest
+        except OSError:
+            same = False
+        if same:
+            Path(tmp).unlink()
+            return False, digest
+        _publish(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return True, digest
+
+
+@dataclass
+class ManifestEntry:
+    source: str  # hash of the template source
+    deps: dict[str, str] = field(default_factory=dict)  # dependency → hash
+    output: str = ""  # hash of the rendered output
+    output_path: str = ""
+
+
+@dataclass
+class RenderManifest:
+    path: Path
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> RenderManifest:
+        """Read *path*; a missing or unreadable manifest starts empty."""
+        manifest = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as exc:
+            log.warning("Ignoring unreadable manifest %s: %s", path, exc)
+            return manifest
+        if data.get("version") != _VERSION:
+            return manifest
+        for name, raw in data.get("entries", {}).items():
+            try:
+                manifest.entries[name] = ManifestEntry(**raw)
+            except TypeError:
+                continue
+        return manifest
+
+    def is_fresh(
+        self, name: str, source: str, deps: dict[str, str] | None, output: Path
+    ) -> bool:
+        """True when *name* was rendered from exactly these inputs to *output*.
+
+        The output file is re-hashed so a deleted or hand-edited output
+        is always regenerated.
+        """
+        entry = self.entries.get(name)
+        if entry is None or deps is None:
+            return False
+        if entry.source != source or entry.deps != deps:
+            return False
+        if entry.output_path != str(output):
+            return False
+        try:
+            return file_hash(output) == entry.output
+        except OSError:
+            return False
+
+    def record(
+        self,
+        name: str,
+        source: str,
+        deps: dict[str, str] | None,
+        output: Path,
+        output_hash: str,
+    ) -> None:
+        if deps is None:
+            self.entries.pop(name, None)
+            return
+        self.entries[name] = ManifestEntry(source, dict(deps), output_hash, str(output))
+
+    def save(self) -> None:
+        data = {
+            "version": _VERSION,
+            "entries": {k: asdict(v) for k, v in sorted(self.entries.items())},
+        }
+        try:
+            write_if_changed(
+                self.path, json.dumps(data, indent=1, sort_keys=True).encode()
+            )
+        except OSError as exc:
+            log.warning("Could not write manifest %s: %s", self.path, exc)
@@ -5,11 +5,17 @@ Keeps the data layer separate from UI or I/O.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+# Per-project directory for Infralight's own caches (bytecode, manifests …)
+CACHE_DIR_NAME = ".infralight"
+
 
 class FileType(str, Enum):
     SALTSTACK = "saltstack"
@@ -21,7 +27,7 @@ class FileKind(str, Enum):
     IL = "il"  # .il.sls / .il.tf — contains Infralight decorators
 
 
-@dataclass
+@dataclass(frozen=True)
 class SourceFile:
     """A file discovered by the scanner."""
 
@@ -48,7 +54,7 @@ class SourceFile:
         return n
 
 
-@dataclass
+@dataclass(frozen=True)
 class IaCResource:
     """A single resource parsed from a SaltStack or Terraform file."""
 
@@ -109,50 +115,197 @@ class VisNote:
     color: str = "#FFF176"
 
 
+def edge_key(e: VisEdge) -> tuple[str, str, str]:
+    """Identity of an edge — parallel edges need different labels."""
+    return (e.source, e.target, e.label)
+
+
+class _VisIndex:
+    """Lookup tables over a Visualization's lists, built incrementally."""
+
+    def __init__(self, vis: Visualization) -> None:
+        # The lists indexed and how far — a replaced or shrunk list means
+        # the index is rebuilt, appends are indexed on the next lookup
+        self.lists = (id(vis.nodes), id(vis.edges), id(vis.groups))
+        self.seen = [0, 0, 0]
+        self.nodes: dict[str, VisNode] = {}
+        self.groups: dict[str, VisGroup] = {}
+        self.edges: dict[tuple[str, str, str], VisEdge] = {}
+        self.out: dict[str, list[VisEdge]] = {}
+        self.inc: dict[str, list[VisEdge]] = {}
+
+    def current(self, vis: Visualization) -> bool:
+        return self.lists == (id(vis.nodes), id(vis.edges), id(vis.groups)) and (
+            self.seen[0] <= len(vis.nodes)
+            and self.seen[1] <= len(vis.edges)
+            and self.seen[2] <= len(vis.groups)
+        )
+
+    def catch_up(self, vis: Visualization) -> None:
+        for n in vis.nodes[self.seen[0] :]:
+            self.nodes.setdefault(n.id, n)
+        for g in vis.groups[self.seen[2] :]:
+            self.groups.setdefault(g.id, g)
+        for e in vis.edges[self.seen[1] :]:
+            key = edge_key(e)
+            if key in self.edges:
+                continue
+            self.edges[key] = e
+            self.out.setdefault(e.source, []).append(e)
+            self.inc.setdefault(e.target, []).append(e)
+        self.seen = [len(vis.nodes), len(vis.edges), len(vis.groups)]
+
+
+_INDEX_LOCK = threading.Lock()
+
+
 @dataclass
 class Visualization:
-    """Complete visualisation graph."""
+    """Complete visualisation graph.
+
+    The lists are the graph as declared.  Lookups — nodes and groups by
+    id, outgoing and incoming edges — go through an index that is built
+    on first use and kept in step with later appends; the first node or
+    group with an id wins, and an edge repeating another's source,
+    target and label is ignored.  ``add_*`` and :meth:`merge` skip such
+    duplicates up front, and the exports below only ever show the
+    indexed (deduplicated) graph.
+    """
 
     nodes: list[VisNode] = field(default_factory=list)
     edges: list[VisEdge] = field(default_factory=list)
     groups: list[VisGroup] = field(default_factory=list)
     notes: list[VisNote] = field(default_factory=list)
     layout: str = "dagre"
+    _index: _VisIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_index"] = None  # rebuilt on demand; keeps pickles small
+        return state
+
+    def _indexed(self) -> _VisIndex:
+        index = self._index
+        if (
+            index is not None
+            and index.current(self)
+            and index.seen == [len(self.nodes), len(self.edges), len(self.groups)]
+        ):
+            return index
+        with _INDEX_LOCK:
+            index = self._index
+            if index is None or not index.current(self):
+                index = _VisIndex(self)
+            index.catch_up(self)
+            self._index = index
+        return index
+
+    # ── Lookups ──────────────────────────────────────────────────
+
+    def node(self, node_id: str) -> VisNode | None:
+        return self._indexed().nodes.get(node_id)
+
+    def group(self, group_id: str) -> VisGroup | None:
+        return self._indexed().groups.get(group_id)
+
+    def node_map(self) -> Mapping[str, VisNode]:
+        """Unique nodes by id, in declaration order — do not modify."""
+        return self._indexed().nodes
+
+    def out_edges(self, node_id: str) -> Sequence[VisEdge]:
+        return self._indexed().out.get(node_id, ())
+
+    def in_edges(self, node_id: str) -> Sequence[VisEdge]:
+        return self._indexed().inc.get(node_id, ())
+
+    def successors(self, node_id: str) -> list[str]:
+        return list(dict.fromkeys(e.target for e in self.out_edges(node_id)))
+
+    def predecessors(self, node_id: str) -> list[str]:
+        return list(dict.fromkeys(e.source for e in self.in_edges(node_id)))
+
+    def unique_edges(self) -> Sequence[VisEdge]:
+        """Edges without repeats, in declaration order."""
+        return list(self._indexed().edges.values())
+
+    def unique_groups(self) -> Sequence[VisGroup]:
+        return list(self._indexed().groups.values())
+
+    # ── Building ─────────────────────────────────────────────────
+
+    def add_node(self, node: VisNode) -> bool:
+        """Append *node* unless its id is taken; True if it was added."""
+        if node.id in self._indexed().nodes:
+            return False
+        self.nodes.append(node)
+        return True
+
+    def add_edge(self, edge: VisEdge) -> bool:
+        if edge_key(edge) in self._indexed().edges:
+            return False
+        self.edges.append(edge)
+        return True
+
+    def add_group(self, group: VisGroup) -> bool:
+        if group.id in self._indexed().groups:
+            return False
+        self.groups.append(group)
+        return True
 
     def merge(self, other: Visualization) -> None:
-        self.nodes.extend(other.nodes)
-        self.edges.extend(other.edges)
-        self.groups.extend(other.groups)
+        """Add *other*'s nodes, edges, groups and notes, skipping repeats."""
+        for g in other.groups:
+            self.add_group(g)
+        for n in other.nodes:
+            self.add_node(n)
+        for e in other.edges:
+            self.add_edge(e)
         self.notes.extend(other.notes)
 
+    def copy(self) -> Visualization:
+        """Shallow copy — new lists, the same node/edge/group objects."""
+        return Visualization(
+            list(self.nodes),
+            list(self.edges),
+            list(self.groups),
+            list(self.notes),
+            self.layout,
+        )
+
     def clear(self) -> None:
         self.nodes.clear()
         self.edges.clear()
         self.groups.clear()
         self.notes.clear()
+        self._index = None
+
+    # ── Views ────────────────────────────────────────────────────
 
     def to_mermaid(self) -> str:
+        index = self._indexed()
         lines: list[str] = ["graph TD"]
-        grouped: dict[str, list[VisNode]] = {g.id: [] for g in self.groups}
+        grouped: dict[str, list[VisNode]] = {g: [] for g in index.groups}
         ungrouped: list[VisNode] = []
 
-        for n in self.nodes:
+        for n in index.nodes.values():
             bucket = grouped.get(n.group or "")
             if bucket is not None:
                 bucket.append(n)
             else:
                 ungrouped.append(n)
 
-        for g in self.groups:
+        for g in index.groups.values():
             lines.append(f'  subgraph {g.id}["{_esc(g.label or g.id)}"]')
-            for n in grouped.get(g.id, []):
+            for n in grouped[g.id]:
                 lines.append(f'    {n.id}["{_esc(n.label or n.id)}"]')
             lines.append("  end")
 
         for n in ungrouped:
             lines.append(f'  {n.id}["{_esc(n.label or n.id)}"]')
 
-        for e in self.edges:
+        for e in index.edges.values():
             arrow = "-->" if e.style == "solid" else "-.->"
             lbl = f"|{_esc(e.label)}|" if e.label else ""
             lines.append(f"  {e.source} {arrow}{lbl} {e.target}")
@@ -160,6 +313,7 @@ class Visualization:
         return "\n".join(lines)
 
     def to_dict(self) -> dict:
+        index = self._indexed()
         return {
             "nodes": [
                 {
@@ -169,15 +323,15 @@ class Visualization:
                     "color": n.color,
                     "group": n.group,
                 }
-                for n in self.nodes
+                for n in index.nodes.values()
             ],
             "edges": [
                 {"from": e.source, "to": e.target, "label": e.label, "style": e.style}
-                for e in self.edges
+                for e in index.edges.values()
             ],
             "groups": [
                 {"id": g.id, "label": g.label or g.id, "color": g.color}
-                for g in self.groups
+                for g in index.groups.values()
             ],
             "layout": self.layout,
         }
@@ -188,20 +342,53 @@ def _esc(text: str) -> str:
     return text.replace('"', "'").replace("\n", " ").replace("\r", "")
 
 
-@dataclass
+@dataclass(frozen=True)
 class Project:
-    """An open project directory."""
+    """An open project directory — an immutable snapshot.
+
+    Updates build a new generation with :meth:`with_file`, which shares
+    every unchanged file and its parsed resources with this one.
+    """
 
     root: Path
-    files: list[SourceFile] = field(default_factory=list)
-    resources: list[IaCResource] = field(default_factory=list)
+    files: tuple[SourceFile, ...] = ()
+    # Parsed resources of each file, parallel to ``files``
+    file_resources: tuple[tuple[IaCResource, ...], ...] = ()
     visualization: Visualization = field(default_factory=Visualization)
     output_dir: Path | None = None
+    generation: int = 0  # bumped on every reload or update of the same root
+
+    @cached_property
+    def resources(self) -> tuple[IaCResource, ...]:
+        return tuple(r for group in self.file_resources for r in group)
+
+    def with_file(self, sf: SourceFile, resources: tuple[IaCResource, ...]) -> Project:
+        """Next generation with *sf* (matched by path) and its *resources*."""
+        files = list(self.files)
+        groups = list(self.file_resources)
+        groups += [()] * (len(files) - len(groups))
+        for i, old in enumerate(files):
+            if old.path == sf.path:
+                files[i], groups[i] = sf, resources
+                break
+        else:
+            files.append(sf)
+            groups.append(resources)
+        return replace(
+            self,
+            files=tuple(files),
+            file_resources=tuple(groups),
+            generation=self.generation + 1,
+        )
 
     @property
     def name(self) -> str:
         return self.root.name
 
+    @property
+    def cache_dir(self) -> Path:
+        return self.root / CACHE_DIR_NAME
+
     @property
     def salt_files(self) -> list[SourceFile]:
         return [f for f in self.files if f.file_type == FileType.SALTSTACK]
@@ -0,0 +1,139 @@
+"""Salt execution order — the order a highstate applies its states in.
+
+Mirrors Salt's own two steps:
+
+1. **Sort.**  Every state gets an order key: its ``order:`` option when
+   it has one (``first`` is 0, ``last`` and negative numbers go after
+   everything else), otherwise its definition order counted from 10000
+   (``state_auto_order``).  Ties sort by module, name and function, as
+   Salt's ``{state}{name}{fun}`` string.
+2. **Run.**  States are taken in that order, but a state whose
+   requisites have not run yet runs them first, recursively.  So a
+   required state can be *pulled forward* ahead of its own turn.
+
+``require``, ``watch``, ``onchanges`` and ``onfail`` make a state wait
+for its target; ``prereq`` makes it run *before* its target.  ``listen``
+and ``use`` do not affect ordering.  States in a requisite loop are
+still listed, flagged, because Salt fails them rather than skipping the
+run.
+
+The walk is an iterative depth-first search over
+:class:`~infralight.core.requisites.RequisiteGraph`'s index — one sort
+plus linear work, so tens of thousands of states take well under a
+second.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from infralight.core.reach import strongly_connected
+from infralight.core.requisites import ORDERING, RequisiteGraph
+
+AUTO_ORDER_START = 10000  # Salt's first definition-order number
+_WAIT = ORDERING - {"prereq"}  # prereq runs the requiring state first
+
+
+@dataclass
+class ApplyStep:
+    state: int  # index into RequisiteGraph.states
+    order: float  # Salt's sort key
+    explicit: bool  # the key comes from an ``order:`` option
+    waits_for: list[int] = field(default_factory=list)  # states run first
+    pulled: bool = False  # ran before its turn because another state needed it
+    cyclic: bool = False  # part of a requisite loop — Salt fails it
+
+
+def order_keys(graph: RequisiteGraph, states: Sequence[int]) -> dict[int, float]:
+    """Salt's sort key for each of *states*, given in definition order."""
+    keys: dict[int, float] = {}
+    raw: dict[int, object] = {}
+    auto = AUTO_ORDER_START
+    for i in states:
+        value = graph.states[i].properties.get("order")
+        if value is None:
+            keys[i] = auto
+            auto += 1
+        else:
+            raw[i] = value
+    cap = 1
+    for value in [*raw.values(), *keys.values()]:
+        if isinstance(value, int) and not isinstance(value, bool) and value >= cap:
+            cap = value + 100
+    for i, value in raw.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            keys[i] = value if value >= 0 else cap + 1000000 + value
+        elif value == "first":
+            keys[i] = 0
+        elif value == "last":
+            keys[i] = cap + 1000000
+        else:
+            keys[i] = cap
+    return keys
+
+
+def execution_order(
+    graph: RequisiteGraph, states: Sequence[int] | None = None
+) -> list[ApplyStep]:
+    """The order Salt would apply *states* in (default: all, as defined).
+
+    *states* lists state indexes in definition order — the order their
+    files are applied in, then their order within each file.
+    Requisites on states outside *states* are ignored.
+    """
+    if states is None:
+        states = range(len(graph.states))
+    keys = order_keys(graph, states)
+
+    def tie(i: int) -> tuple[float, str]:
+        p = graph.states[i].properties
+        name = graph.states[i].name
+        return keys[i], f"{p.get('__module', '')}{name}{p.get('__function', '')}"
+
+    before: dict[int, list[int]] = {i: [] for i in keys}
+    for i in keys:
+        for req in graph.out[i]:
+            if req.target not in keys or req.target == i:
+                continue
+            if req.kind in _WAIT:
+                before[i].append(req.target)
+            elif req.kind == "prereq":
+                before[req.target].append(i)
+    for i, waits in before.items():
+        before[i] = sorted(dict.fromkeys(waits), key=tie)
+
+    cyclic = {
+        i
+        for comp in strongly_connected(keys, before.__getitem__)
+        if len(comp) > 1
+        for i in comp
+    }
+
+    steps: list[ApplyStep] = []
+    done: set[int] = set()
+    for head in sorted(keys, key=tie):
+        if head in done:
+            continue
+        done.add(head)
+        work = [(head, iter(before[head]))]
+        while work:
+            i, pending = work[-1]
+            for j in pending:
+                if j not in done:
+                    done.add(j)
+                    work.append((j, iter(before[j])))
+                    break
+            else:
+                work.pop()
+                steps.append(
+                    ApplyStep(
+                        state=i,
+                        order=keys[i],
+                        explicit="order" in graph.states[i].properties,
+                        waits_for=before[i],
+                        pulled=i != head,
+                        cyclic=i in cyclic,
+                    )
+                )
+    return steps
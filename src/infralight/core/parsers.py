@@ -60,6 +60,41 @@ def _extract_requisites(
     return reqs
 
 
+_NAME_LINE = re.compile(r"^\s*-\s*name:\s*(.*\S)", re.MULTILINE)
+
+
+def _top_level_keys(text: str) -> dict[str, int]:
+    """Line of each unindented ``key:`` line in *text* — the state IDs."""
+    line_map: dict[str, int] = {}
+    for lineno, line in enumerate(text.splitlines(), 1):
+        stripped = line.rstrip()
+        if stripped and not stripped[0].isspace() and stripped.endswith(":"):
+            line_map[stripped[:-1]] = lineno
+    return line_map
+
+
+def yaml_error(text: str) -> tuple[int, str] | None:
+    """Line and message of the YAML error in *text*, or ``None`` if it parses."""
+    try:
+        yaml.safe_load(text)
+    except yaml.MarkedYAMLError as exc:
+        line = exc.problem_mark.line + 1 if exc.problem_mark else 0
+        return line, exc.problem or str(exc)
+    except yaml.YAMLError as exc:
+        return 0, str(exc)
+    return None
+
+
+def salt_names(text: str) -> set[str]:
+    """State IDs and ``name:`` values in Salt state *text*, read line by line.
+
+    Works on files that aren't valid YAML, so requisites on the states
+    of a broken file can be told apart from ones naming no state at all.
+    """
+    names = {n.strip("'\"") for n in _NAME_LINE.findall(text)}
+    return names | set(_top_level_keys(text))
+
+
 def parse_salt(sf: SourceFile) -> list[IaCResource]:
     """Parse a SaltStack .sls file into IaCResource entries.
 
@@ -83,12 +118,7 @@ def parse_salt(sf: SourceFile) -> list[IaCResource]:
     if not isinstance(data, dict):
         return resources
 
-    # Track line numbers — walk raw lines to map state IDs
-    line_map: dict[str, int] = {}
-    for lineno, line in enumerate(sf.content.splitlines(), 1):
-        stripped = line.rstrip()
-        if stripped and not stripped[0].isspace() and stripped.endswith(":"):
-            line_map[stripped[:-1]] = lineno
+    line_map = _top_level_keys(sf.content)
 
     for state_id, body in data.items():
         if not isinstance(body, dict):
@@ -0,0 +1,146 @@
+"""Reachability index — what a change to one resource can affect.
+
+Edges point from a dependent to what it depends on (a Salt requisite,
+a Terraform reference), so everything *downstream* of a change is the
+set of nodes with a path **to** it.  :class:`ReachIndex` answers both
+directions without walking the graph: it condenses the strongly
+connected components (:func:`strongly_connected`, Tarjan) into a DAG
+and stores, per component, the components it reaches and the ones that
+reach it as integer bitsets.  A query is then a single lookup.
+
+Memory is at most two bits per pair of components, one in each
+direction's table — about 25 MB for 10 000 nodes — and building takes
+one pass over the edges with bitset unions, a fraction of a second at
+that size.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from typing import TypeVar
+
+from infralight.core.models import Visualization
+
+T = TypeVar("T", bound=Hashable)
+
+
+def strongly_connected(
+    nodes: Iterable[T], successors: Callable[[T], Iterable[T]]
+) -> list[list[T]]:
+    """Tarjan's strongly connected components, iteratively.
+
+    Components come out in reverse topological order: each one after
+    every component it has an edge to.  Successors missing from *nodes*
+    are ignored.
+    """
+    order = list(dict.fromkeys(nodes))
+    known = set(order)
+    index: dict[T, int] = {}
+    low: dict[T, int] = {}
+    stack: list[T] = []
+    on_stack: set[T] = set()
+    out: list[list[T]] = []
+
+    for root in order:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in known:
+                    continue
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(successors(w))))
+                    break
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    comp: list[T] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    out.append(comp)
+    return out
+
+
+def _bits(mask: int) -> list[int]:
+    """Positions of the set bits in *mask*, lowest first."""
+    return [i for i, b in enumerate(reversed(bin(mask)[2:])) if b == "1"]
+
+
+class ReachIndex:
+    """Transitive dependencies and dependents of every node of a graph."""
+
+    def __init__(self, vis: Visualization) -> None:
+        self.vis = vis
+        nodes = vis.node_map()
+        self._position = {nid: i for i, nid in enumerate(nodes)}
+        self.components = strongly_connected(nodes, vis.successors)
+        self._comp = {nid: c for c, comp in enumerate(self.components) for nid in comp}
+
+        n = len(self.components)
+        succ: list[set[int]] = [set() for _ in range(n)]
+        for c, comp in enumerate(self.components):
+            for nid in comp:
+                for t in vis.successors(nid):
+                    d = self._comp.get(t)
+                    if d is not None and d != c:
+                        succ[c].add(d)
+
+        # Tarjan order puts successors first, so one pass each way suffices
+        self._down = [0] * n
+        for c in range(n):
+            mask = 0
+            for d in succ[c]:
+                mask |= self._down[d] | (1 << d)
+            self._down[c] = mask
+        self._up = [0] * n
+        for c in reversed(range(n)):
+            bit = self._up[c] | (1 << c)
+            for d in succ[c]:
+                self._up[d] |= bit
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._comp
+
+    def _expand(self, node_id: str, masks: list[int]) -> list[str]:
+        c = self._comp.get(node_id)
+        if c is None:
+            return []
+        ids = [nid for d in _bits(masks[c]) for nid in self.components[d]]
+        ids.extend(nid for nid in self.components[c] if nid != node_id)
+        return sorted(ids, key=self._position.__getitem__)
+
+    def dependencies(self, node_id: str) -> list[str]:
+        """Everything *node_id* depends on, directly or not."""
+        return self._expand(node_id, self._down)
+
+    def dependents(self, node_id: str) -> list[str]:
+        """Everything that depends on *node_id* — its blast radius."""
+        return self._expand(node_id, self._up)
+
+    def reaches(self, source: str, target: str) -> bool:
+        """Whether *source* depends on *target*, directly or not.
+
+        A node only reaches itself through a cycle of two or more nodes.
+        """
+        a, b = self._comp.get(source), self._comp.get(target)
+        if a is None or b is None:
+            return False
+        if a == b:
+            return len(self.components[a]) > 1
+        return bool(self._down[a] >> b & 1)
@@ -1,93 +1,450 @@
-"""Renderer — process .il files through Jinja2 and write clean output."""
+"""Renderer — process .il files through Jinja2 and write clean output.
+
+Templates are arbitrary user code, so anything that evaluates one can be
+routed through a :class:`~infralight.core.sandbox.SandboxPool`: a worker
+process with a sandboxed environment, a time limit and a memory limit.
+A runaway template then fails as a render error for that file instead of
+stalling the server.
+"""
 
 from __future__ import annotations
 
+import contextvars
 import logging
+import os
 import re
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
-from jinja2 import BaseLoader, Environment, TemplateNotFound
-
-from infralight.core.decorators import IL_GLOBALS, begin_collect, end_collect
-from infralight.core.models import FileKind, SourceFile, Visualization
+from infralight.core.decorators import begin_collect, end_collect
+from infralight.core.environment import (
+    ProjectEnvironment,
+    get_environment,
+    source_hash,
+)
+from infralight.core.extractor import extract_static
+from infralight.core.manifest import (
+    RenderManifest,
+    bytes_hash,
+    remove_temp_files,
+    write_if_changed,
+    write_stream,
+)
+from infralight.core.models import CACHE_DIR_NAME, FileKind, SourceFile, Visualization
+from infralight.core.sandbox import (
+    SandboxError,
+    SandboxLimits,
+    SandboxPool,
+    get_sandbox,
+)
+from infralight.core.viscache import vis_cache
 
 log = logging.getLogger(__name__)
 
 _BLANK_RUN = re.compile(r"\n{3,}")
+_CHUNK_SIZE = 64 * 1024  # characters buffered per write when streaming
 
 
-class _StrLoader(BaseLoader):
-    def __init__(self) -> None:
-        self._t: dict[str, str] = {}
+@dataclass
+class RenderResult:
+    """Outcome of rendering one file."""
 
-    def set(self, name: str, src: str) -> None:
-        self._t[name] = src
+    name: str
+    output: Path
+    status: str  # "rendered", "unchanged", "error", "cancelled"
+    error: str = ""
 
-    def get_source(self, env: Environment, template: str):
-        if template not in self._t:
-            raise TemplateNotFound(template)
-        s = self._t[template]
-        return s, template, lambda: True
 
+@dataclass
+class _Planned:
+    """Per-file render decision made before dispatching to workers."""
 
-def _make_env(loader: _StrLoader) -> Environment:
-    env = Environment(loader=loader, keep_trailing_newline=True)
-    env.globals.update(IL_GLOBALS)
-    return env
+    sf: SourceFile
+    name: str
+    source: str
+    deps: dict[str, str] | None
+    key: str | None  # visualisation-cache fingerprint
+    fresh: bool = False
 
 
-def render_file(sf: SourceFile, output_dir: Path) -> tuple[str, Visualization]:
-    """Render one file.  Returns (rendered_text, visualization)."""
-    if sf.kind == FileKind.NATIVE:
-        out = output_dir / sf.name
-        out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(sf.content, encoding="utf-8")
-        return sf.content, Visualization()
+def _normalized(parts: Iterable[str]) -> Iterator[str]:
+    """Stream equivalent of ``_BLANK_RUN.sub("\\n\\n", text).strip() + "\\n"``.
+
+    Trailing whitespace is held back until more text follows, so blank
+    runs spanning chunks still collapse and leading/trailing whitespace
+    is never emitted.  Only that held-back whitespace is buffered.
+    """
+    started = False
+    pending = ""
+    for part in parts:
+        body = part.rstrip()
+        if not body:
+            if started:
+                pending = _BLANK_RUN.sub("\n\n", pending + part)
+            continue
+        text = pending + body
+        if not started:
+            text = text.lstrip()
+            started = True
+        pending = part[len(body) :]
+        yield _BLANK_RUN.sub("\n\n", text)
+    yield "\n"
+
+
+def _chunked(parts: Iterable[str]) -> Iterator[bytes]:
+    """Join *parts* into UTF-8 blocks of roughly ``_CHUNK_SIZE``."""
+    buf: list[str] = []
+    size = 0
+    for part in parts:
+        buf.append(part)
+        size += len(part)
+        if size >= _CHUNK_SIZE:
+            yield "".join(buf).encode("utf-8")
+            buf.clear()
+            size = 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
 
-    loader = _StrLoader()
-    loader.set(sf.name, sf.content)
-    env = _make_env(loader)
 
+def _render(sf: SourceFile, penv: ProjectEnvironment) -> tuple[str, Visualization]:
     begin_collect(str(sf.path))
     try:
-        rendered = env.get_template(sf.name).render()
+        rendered = "".join(_normalized(penv.get_template(sf).generate()))
+    finally:
+        vis = end_collect()
+    return rendered, vis
+
+
+def _render_to(
+    sf: SourceFile, penv: ProjectEnvironment, out: Path
+) -> tuple[bool, str, Visualization]:
+    """Render *sf* straight into *out* without holding the whole output.
+
+    Returns ``(written, output_hash, visualization)``.
+    """
+    begin_collect(str(sf.path))
+    try:
+        parts = _normalized(penv.get_template(sf).generate())
+        written, digest = write_stream(out, _chunked(parts))
+    finally:
+        vis = end_collect()
+    return written, digest, vis
+
+
+def _render_sandboxed(root: Path, sf: SourceFile) -> tuple[str, Visualization]:
+    """:func:`_render` inside a sandbox worker."""
+    penv = get_environment(root, sandboxed=True)
+    return contextvars.copy_context().run(_render, sf, penv)
+
+
+def render_file(
+    sf: SourceFile,
+    output_dir: Path,
+    penv: ProjectEnvironment | None = None,
+    sandbox: SandboxPool | None = None,
+) -> tuple[str, Visualization]:
+    """Render one file.  Returns (rendered_text, visualization).
+
+    *penv* is the project's shared environment; without one the file's
+    own directory is treated as the project root.  With a *sandbox* the
+    template is evaluated in one of its workers.  The output is only
+    rewritten when its bytes change.
+    """
+    if sf.kind == FileKind.NATIVE:
+        write_if_changed(output_dir / sf.name, sf.content.encode("utf-8"))
+        return sf.content, Visualization()
+
+    penv = penv or get_environment(sf.path.parent)
+    try:
+        if sandbox is not None:
+            rendered, vis = sandbox.run(_render_sandboxed, penv.root, sf)
+        else:
+            rendered, vis = _render(sf, penv)
     except Exception as exc:
         log.error("Render error %s: %s", sf.name, exc)
         return f"# RENDER ERROR: {exc}\n", Visualization()
-    vis = end_collect()
-
-    rendered = _BLANK_RUN.sub("\n\n", rendered).strip() + "\n"
 
     out = output_dir / sf.output_name
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(rendered, encoding="utf-8")
-    log.info("Rendered %s → %s", sf.name, out)
+    if write_if_changed(out, rendered.encode("utf-8")):
+        log.info("Rendered %s → %s", sf.name, out)
     return rendered, vis
 
 
+def _render_job(
+    root: Path, sf: SourceFile, output_dir: Path, fresh: bool, sandboxed: bool
+) -> tuple[RenderResult, Visualization, str]:
+    """Render (or, when *fresh*, only inspect) one file on a pool thread or
+    in a sandbox worker (*sandboxed*).
+
+    Runs in its own context so the decorator collector is private to
+    this file.  Returns the result, the file's graph and the hash of the
+    bytes written (``""`` when nothing was rendered).
+    """
+    return contextvars.copy_context().run(
+        _render_job_in_context, root, sf, output_dir, fresh, sandboxed
+    )
+
+
+def _render_job_in_context(
+    root: Path, sf: SourceFile, output_dir: Path, fresh: bool, sandboxed: bool
+) -> tuple[RenderResult, Visualization, str]:
+    penv = get_environment(root, sandboxed)
+    if sf.kind == FileKind.NATIVE:
+        out = output_dir / sf.name
+        data = sf.content.encode("utf-8")
+        written = write_if_changed(out, data)
+        status = "rendered" if written else "unchanged"
+        return RenderResult(sf.name, out, status), Visualization(), bytes_hash(data)
+
+    out = output_dir / sf.output_name
+    if fresh:
+        return (
+            RenderResult(sf.name, out, "unchanged"),
+            extract_visualization(sf, penv),
+            "",
+        )
+
+    try:
+        written, digest, vis = _render_to(sf, penv, out)
+    except Exception as exc:
+        log.error("Render error %s: %s", sf.name, exc)
+        return RenderResult(sf.name, out, "error", str(exc)), Visualization(), ""
+
+    if written:
+        log.info("Rendered %s → %s", sf.name, out)
+    status = "rendered" if written else "unchanged"
+    return RenderResult(sf.name, out, status), vis, digest
+
+
 def render_all(
-    files: list[SourceFile], output_dir: Path
-) -> tuple[dict[str, str], Visualization]:
+    files: list[SourceFile],
+    output_dir: Path,
+    penv: ProjectEnvironment | None = None,
+    *,
+    force: bool = False,
+    workers: int = 1,
+    executor: str = "thread",
+    limits: SandboxLimits | None = None,
+    on_progress: Callable[[RenderResult], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[list[RenderResult], Visualization]:
+    """Render *files* into *output_dir*, skipping those whose inputs are unchanged.
+
+    A template is skipped when its source, the sources of everything it
+    includes/imports and its existing output all match the project's
+    render manifest.  *force* re-renders everything (outputs are still
+    only rewritten when their bytes differ).  Without *penv* the files'
+    common directory is treated as the project root.
+
+    *executor* ``"thread"`` renders in this process; ``"sandbox"`` sends
+    each file to a sandbox worker bounded by *limits*, and a file that
+    overruns them is reported with status ``"error"``.  With *workers*
+    > 1 files are rendered concurrently.  Each file collects its own
+    graph; the per-file graphs are merged in *files* order, so the result
+    doesn't depend on completion order.
+
+    *on_progress* is called (from the calling thread) with each file's
+    result as soon as it completes.  Setting *cancel* stops dispatching
+    further files; those are reported with status ``"cancelled"``.
+    """
+    if executor not in ("thread", "sandbox"):
+        raise ValueError(f"Unknown render executor: {executor!r}")
     output_dir.mkdir(parents=True, exist_ok=True)
-    results: dict[str, str] = {}
+    results: list[RenderResult] = []
     combined = Visualization()
+    if not files:
+        return results, combined
+    if penv is None:
+        penv = get_environment(
+            Path(os.path.commonpath([sf.path.parent for sf in files]))
+        )
+    manifest = RenderManifest.load(penv.root / CACHE_DIR_NAME / "manifest.json")
+
+    # Freshness is decided up front, in this process, against the manifest;
+    # fresh files whose graph is already cached need no worker at all.
+    penv.loader.sync(files)
+    plan: list[_Planned] = []
+    outcomes: list[tuple[RenderResult, Visualization, str] | None] = []
     for sf in files:
-        txt, vis = render_file(sf, output_dir)
-        results[sf.name] = txt
+        name = penv.template_name(sf)
+        deps = penv.dependency_hashes(name)
+        p = _Planned(sf, name, source_hash(sf.content), deps, penv.fingerprint(name))
+        p.fresh = (
+            sf.kind == FileKind.IL
+            and not force
+            and manifest.is_fresh(name, p.source, deps, output_dir / sf.output_name)
+        )
+        plan.append(p)
+        cached = vis_cache.get(penv.root, name, p.key) if p.fresh else None
+        outcomes.append(
+            (
+                RenderResult(sf.name, output_dir / sf.output_name, "unchanged"),
+                cached,
+                "",
+            )
+            if cached is not None
+            else None
+        )
+
+    pending = [i for i, o in enumerate(outcomes) if o is None]
+    if on_progress:
+        for o in outcomes:
+            if o is not None:
+                on_progress(o[0])
+
+    def _done(i: int, outcome: tuple[RenderResult, Visualization, str]) -> None:
+        outcomes[i] = outcome
+        if on_progress:
+            on_progress(outcome[0])
+
+    sandbox = get_sandbox(workers, limits) if executor == "sandbox" else None
+
+    def _job(i: int) -> tuple[RenderResult, Visualization, str]:
+        sf = plan[i].sf
+        out = output_dir / sf.output_name
+        args = (penv.root, sf, output_dir, plan[i].fresh)
+        try:
+            if sandbox is not None:
+                return sandbox.run(_render_job, *args, True)
+            return _render_job(*args, False)
+        except Exception as exc:  # worker killed or died — report, keep going
+            log.error("Render error %s: %s", sf.name, exc)
+            if isinstance(exc, SandboxError) and exc.pid is not None:
+                remove_temp_files(out, exc.pid)  # it may have died mid-write
+            return RenderResult(sf.name, out, "error", str(exc)), Visualization(), ""
+
+    if workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(pending)), thread_name_prefix="il-render"
+        ) as pool:
+            futures = {pool.submit(_job, i): i for i in pending}
+            for fut in as_completed(futures):
+                if fut.cancelled():
+                    continue
+                _done(futures[fut], fut.result())
+                if cancel is not None and cancel.is_set():
+                    for f in futures:
+                        f.cancel()
+    else:
+        for i in pending:
+            if cancel is not None and cancel.is_set():
+                break
+            _done(i, _job(i))
+
+    for i in pending:
+        if outcomes[i] is None:
+            sf = plan[i].sf
+            out = output_dir / sf.output_name
+            outcomes[i] = (RenderResult(sf.name, out, "cancelled"), Visualization(), "")
+
+    for p, outcome in zip(plan, outcomes, strict=True):
+        assert outcome is not None
+        result, vis, out_hash = outcome
+        if p.sf.kind == FileKind.IL and result.status in ("rendered", "unchanged"):
+            vis_cache.put(penv.root, p.name, p.key, vis)
+            if not p.fresh:
+                manifest.record(p.name, p.source, p.deps, result.output, out_hash)
+        results.append(result)
         combined.merge(vis)
+    manifest.save()
     return results, combined
 
 
-def extract_visualization(sf: SourceFile) -> Visualization:
-    """Parse decorators without writing output (for live preview)."""
+def file_visualization(
+    sf: SourceFile,
+    penv: ProjectEnvironment | None = None,
+    sandbox: SandboxPool | None = None,
+) -> Visualization:
+    """Like :func:`extract_visualization`, memoised on the file's fingerprint.
+
+    Returns a copy of the cached graph, so the caller may add to it.
+    """
+    return _file_visualization(sf, penv, sandbox).copy()
+
+
+def _file_visualization(
+    sf: SourceFile,
+    penv: ProjectEnvironment | None = None,
+    sandbox: SandboxPool | None = None,
+) -> Visualization:
+    """:func:`file_visualization` without the copy — the shared cached graph."""
+    penv = penv or get_environment(sf.path.parent)
+    penv.loader.sync([sf])
+    name = penv.template_name(sf)
+    key = penv.fingerprint(name)
+    vis = vis_cache.get(penv.root, name, key)
+    if vis is None:
+        vis = extract_visualization(sf, penv, sandbox)
+        vis_cache.put(penv.root, name, key, vis)
+    return vis
+
+
+def project_visualization(
+    files: list[SourceFile],
+    penv: ProjectEnvironment,
+    sandbox: SandboxPool | None = None,
+) -> Visualization:
+    """Merged decorator graph of *files*, re-extracting only changed files.
+
+    The merged result is cached too and reused while no file's
+    fingerprint has moved.  Callers get a copy of it, so adding to the
+    result never changes the cache; the nodes and edges themselves are
+    shared and must not be modified.
+    """
+    penv.loader.sync(files)
+    keys: list[tuple[str, str | None]] = []
+    for sf in files:
+        name = penv.template_name(sf)
+        keys.append((name, penv.fingerprint(name)))
+    combined_key = tuple((name, key) for name, key in keys if key is not None)
+    cacheable = len(combined_key) == len(keys)
+    if cacheable:
+        hit = vis_cache.get_combined(penv.root, combined_key)
+        if hit is not None:
+            return hit.copy()
+    combined = Visualization()
+    for sf in files:
+        combined.merge(_file_visualization(sf, penv, sandbox))
+    if cacheable:
+        vis_cache.put_combined(penv.root, combined_key, combined)
+    return combined.copy()
+
+
+def _extract_sandboxed(root: Path, sf: SourceFile) -> Visualization:
+    """:func:`extract_visualization` inside a sandbox worker."""
+    penv = get_environment(root, sandboxed=True)
+    return contextvars.copy_context().run(extract_visualization, sf, penv)
+
+
+def extract_visualization(
+    sf: SourceFile,
+    penv: ProjectEnvironment | None = None,
+    sandbox: SandboxPool | None = None,
+) -> Visualization:
+    """Collect decorator calls without writing output (for live preview).
+
+    Templates whose decorators are all top-level calls with literal
+    arguments are read straight from the AST; only the rest are rendered,
+    in a *sandbox* worker when one is given.
+    """
     if sf.kind == FileKind.NATIVE:
         return Visualization()
-    loader = _StrLoader()
-    loader.set(sf.name, sf.content)
-    env = _make_env(loader)
+    penv = penv or get_environment(sf.path.parent)
+    vis = extract_static(sf, penv)
+    if vis is not None:
+        return vis
+    if sandbox is not None:
+        try:
+            return sandbox.run(_extract_sandboxed, penv.root, sf)
+        except SandboxError as exc:
+            log.warning("Decorator extraction failed for %s: %s", sf.name, exc)
+            return Visualization()
     begin_collect(str(sf.path))
     try:
-        env.get_template(sf.name).render()
+        penv.get_template(sf).render()
     except Exception:
         return Visualization()
     return end_collect()
@@ -0,0 +1,188 @@
+"""Salt requisite graph — requisites resolved to the states they name.
+
+A requisite names its target as ``<module>: <id or name>`` (``pkg:
+nginx``), ``sls: <file>`` or ``id: <id>``.  :func:`requisite_graph`
+indexes every parsed Salt state by those keys once, then resolves each
+requisite with a dictionary lookup, so the whole pass is linear in
+states plus requisites.  ``*_in`` requisites are turned around (``A:
+require_in: B`` is ``B: require: A``), so every edge points from the
+state that waits to the state it waits for — the direction
+:mod:`infralight.core.reach` and the visualisation use.
+
+Requisites that match no state are kept as :class:`Unresolved`, with
+the line of the requisite entry when the source text is available, and
+:meth:`RequisiteGraph.cycles` finds requisite loops with Tarjan's
+algorithm.  Salt refuses to run a highstate with either.  Only the
+:data:`ORDERING` kinds can form a loop; ``use`` and ``listen`` don't
+order states.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import PurePath
+
+from infralight.core.models import IaCResource
+from infralight.core.reach import strongly_connected
+
+# Requisite kinds that decide which state runs first
+ORDERING = frozenset({"require", "watch", "onchanges", "onfail", "prereq"})
+
+
+@dataclass(frozen=True)
+class Requisite:
+    source: int  # index into RequisiteGraph.states — the state that waits
+    target: int  # the state it waits for
+    kind: str  # "require", "watch", … with any "_in" suffix removed
+
+
+@dataclass(frozen=True)
+class Unresolved:
+    state: IaCResource
+    kind: str  # as written, e.g. "require" or "watch_in"
+    module: str  # "pkg", "sls", … or "_" for a bare id
+    target: str
+    line: int  # of the requisite entry, else of the state
+
+
+@dataclass
+class RequisiteGraph:
+    states: list[IaCResource] = field(default_factory=list)
+    requisites: list[Requisite] = field(default_factory=list)
+    unresolved: list[Unresolved] = field(default_factory=list)
+    # Per state, the requisites it declares on others (after turning
+    # ``*_in`` around) — parallel to ``states``
+    out: list[list[Requisite]] = field(default_factory=list)
+
+    def cycles(self) -> list[list[int]]:
+        """Requisite loops, each as a closed path of state indexes.
+
+        One path per strongly connected component of the :data:`ORDERING`
+        requisites (a state requiring itself counts); the path starts and
+        ends at the same state and may not visit every state of a larger
+        tangle.
+        """
+        succ = [[r.target for r in out if r.kind in ORDERING] for out in self.out]
+        comps = strongly_connected(range(len(self.states)), succ.__getitem__)
+        loops = []
+        for comp in comps:
+            members = set(comp)
+            start = min(comp)
+            if len(comp) == 1 and start not in succ[start]:
+                continue
+            path, seen, at = [start], {start: 0}, start
+            while True:
+                at = next(t for t in succ[at] if t in members)
+                if at in seen:
+                    loops.append([*path[seen[at] :], at])
+                    break
+                seen[at] = len(path)
+                path.append(at)
+        return sorted(loops, key=lambda loop: min(loop))
+
+
+def salt_root(paths: Iterable[str]) -> str:
+    """The salt root of the SLS files at *paths*.
+
+    That is the directory holding the state ``top.sls`` (not the pillar
+    one), else the deepest directory containing every file.
+    """
+    dirs = []
+    for path in paths:
+        p = PurePath(path)
+        if p.name == "top.sls" and "pillar" not in p.parent.parts:
+            return str(p.parent)
+        dirs.append(str(p.parent))
+    try:
+        return os.path.commonpath(dirs) if dirs else ""
+    except ValueError:  # mixed absolute and relative paths
+        return ""
+
+
+def sls_name(path: str, root: str = "") -> str:
+    """The name ``sls:`` requisites and top files use for the file at *path*.
+
+    The dotted path below *root* — ``app/config.sls`` is ``app.config``
+    and ``app/init.sls`` is ``app`` — or just the file's stem when it is
+    not below *root*.
+    """
+    p = PurePath(path)
+    try:
+        parts = list(p.relative_to(root).parts) if root else [p.name]
+    except ValueError:
+        parts = [p.name]
+    parts[-1] = parts[-1].removesuffix(".sls").removesuffix(".il")
+    if parts[-1] == "init":
+        parts = parts[:-1] or [p.parent.name]
+    return ".".join(parts)
+
+
+def requisite_graph(
+    resources: Iterable[IaCResource],
+    sources: Mapping[str, str] | None = None,
+    root: str | None = None,
+) -> RequisiteGraph:
+    """Resolve the requisites of the Salt states among *resources*.
+
+    *sources* maps ``source_file`` to the file's text and is only used
+    to find the line of each unresolved requisite.  ``sls:`` targets
+    are looked up by :func:`sls_name` below *root* (default: the
+    :func:`salt_root` of the states' files).
+    """
+    g = RequisiteGraph(states=[r for r in resources if r.provider == "salt"])
+    if root is None:
+        root = salt_root(r.source_file for r in g.states)
+    by_module: dict[tuple[str, str], list[int]] = {}
+    by_id: dict[str, list[int]] = {}
+    by_sls: dict[str, list[int]] = {}
+    sls: dict[str, str] = {}  # source_file -> sls name
+    for i, r in enumerate(g.states):
+        module = str(r.properties.get("__module", ""))
+        by_id.setdefault(r.id, []).append(i)
+        for key in dict.fromkeys((r.id, str(r.name))):
+            by_module.setdefault((module, key), []).append(i)
+        if r.source_file not in sls:
+            sls[r.source_file] = sls_name(r.source_file, root)
+        by_sls.setdefault(sls[r.source_file], []).append(i)
+
+    g.out = [[] for _ in g.states]
+    lines: dict[str, list[str]] = {}
+    for i, r in enumerate(g.states):
+        for req in r.properties.get("__requisites", ()):
+            kind, module, target = req["type"], req["module"], req["state"]
+            if module == "sls":
+                found = by_sls.get(target, [])
+            elif module in ("id", "_"):
+                found = by_id.get(target, [])
+            else:
+                found = by_module.get((module, target), [])
+            if not found:
+                if r.source_file not in lines:
+                    text = (sources or {}).get(r.source_file, "")
+                    lines[r.source_file] = text.splitlines()
+                line = _entry_line(r, module, target, lines[r.source_file])
+                g.unresolved.append(Unresolved(r, kind, module, target, line))
+                continue
+            base = kind.removesuffix("_in")
+            for j in found:
+                src, tgt = (j, i) if kind.endswith("_in") else (i, j)
+                edge = Requisite(src, tgt, base)
+                g.requisites.append(edge)
+                g.out[src].append(edge)
+    return g
+
+
+def _entry_line(state: IaCResource, module: str, target: str, lines: list[str]) -> int:
+    """Line of the ``- module: target`` entry in *state*'s block."""
+    prefix = "" if module == "_" else rf"(?:{re.escape(module)}\s*:\s*)?"
+    entry = re.compile(rf"^\s*-\s*{prefix}['\"]?{re.escape(target)}['\"]?\s*$")
+    for n in range(state.source_line, len(lines)):
+        line = lines[n]
+        if line and not line[0].isspace() and not line.startswith("#"):
+            break  # next top-level state
+        if entry.match(line):
+            return n + 1
+    return state.source_line
@@ -0,0 +1,218 @@
+"""Sandbox — evaluate templates in worker processes with time/memory limits.
+
+Each worker is a long-lived spawned process fed one job at a time over a
+pipe.  While a job runs the parent enforces a wall-clock timeout and
+polls the worker's resident set size; a worker that exceeds either is
+killed and replaced, and the job fails with :class:`SandboxError`.
+Jobs render through Jinja's ``SandboxedEnvironment`` (see
+``get_environment(root, sandboxed=True)``), so templates can't reach
+Python internals either.
+
+Workers also cap their own address space with ``RLIMIT_AS`` when they
+start, so a single large allocation fails with ``MemoryError`` at once
+instead of growing until the next poll — the worker survives and only
+the job fails.  Polling RSS from ``/proc`` stays as the fallback where
+``setrlimit`` isn't available; where neither is, only the time limit
+applies.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_POLL_INTERVAL = 0.05  # seconds between timeout / RSS checks
+
+
+class SandboxError(RuntimeError):
+    """A sandboxed job was killed or its worker failed.
+
+    *pid* is the worker that was killed, so the caller can clean up
+    after it; it is ``None`` when the job itself raised.
+    """
+
+    def __init__(self, message: str, pid: int | None = None) -> None:
+        super().__init__(message)
+        self.pid = pid
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    timeout: float = 30.0  # wall-clock seconds per job
+    memory_mb: int = 1024  # resident set size / address space per worker
+
+
+def _limit_memory(memory_mb: int) -> None:
+    """Cap this process's address space at *memory_mb*, if the OS allows."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = memory_mb * 1024 * 1024
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (AttributeError, ValueError, OSError) as exc:
+        log.debug("RLIMIT_AS not applied, relying on RSS polling: %s", exc)
+
+
+def _worker_main(conn: Connection, memory_mb: int) -> None:
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg is None:
+            return
+        fn, args = msg
+        try:
+            reply: tuple[bool, Any] = (True, fn(*args))
+        except MemoryError:
+            reply = (False, f"exceeded {memory_mb} MB memory limit")
+        except BaseException as exc:
+            reply = (False, f"{type(exc).__name__}: {exc}")
+        try:
+            conn.send(reply)
+        except Exception as exc:  # unpicklable result
+            conn.send((False, f"{type(exc).__name__}: {exc}"))
+
+
+def _rss_mb(pid: int | None) -> float | None:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class _Worker:
+    def __init__(self, ctx: Any, memory_mb: int) -> None:
+        self.conn, child = ctx.Pipe()
+        self.proc: BaseProcess = ctx.Process(
+            target=_worker_main,
+            args=(child, memory_mb),
+            name="il-sandbox",
+            daemon=True,
+        )
+        self.proc.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join(timeout=1)
+        self.conn.close()
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.proc.join(timeout=1)
+        if self.proc.is_alive():
+            self.kill()
+
+
+class SandboxPool:
+    """Up to *workers* sandbox processes, started on demand and reused."""
+
+    def __init__(self, workers: int = 2, limits: SandboxLimits | None = None) -> None:
+        self.limits = limits or SandboxLimits()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+        self._slots = threading.Semaphore(max(1, workers))
+
+    def _acquire(self) -> _Worker:
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return _Worker(self._ctx, self.limits.memory_mb)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _check(self, worker: _Worker, deadline: float) -> None:
+        pid = worker.proc.pid
+        if time.monotonic() > deadline:
+            raise SandboxError(f"exceeded {self.limits.timeout:g}s time limit", pid)
+        rss = _rss_mb(pid)
+        if rss is not None and rss > self.limits.memory_mb:
+            raise SandboxError(f"exceeded {self.limits.memory_mb} MB memory limit", pid)
+        if not worker.proc.is_alive():
+            raise SandboxError(f"worker exited with code {worker.proc.exitcode}", pid)
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in a worker; *fn* must be importable by name."""
+        worker: _Worker | None = self._acquire()
+        assert worker is not None
+        try:
+            worker.conn.send((fn, args))
+            deadline = time.monotonic() + self.limits.timeout
+            while not worker.conn.poll(_POLL_INTERVAL):
+                self._check(worker, deadline)
+            ok, value = worker.conn.recv()
+        except SandboxError as exc:
+            log.warning("Killing sandbox worker %s: %s", worker.proc.pid, exc)
+            worker.kill()
+            worker = None
+            raise
+        except (EOFError, OSError) as exc:
+            pid = worker.proc.pid
+            worker.kill()
+            worker = None
+            raise SandboxError(f"worker crashed: {exc}", pid) from exc
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+            self._slots.release()
+        if not ok:
+            raise SandboxError(value)
+        return value  # type: ignore[no-any-return]
+
+    def shutdown(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: dict[tuple[int, SandboxLimits], SandboxPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sandbox(workers: int = 2, limits: SandboxLimits | None = None) -> SandboxPool:
+    """Return the process-wide pool for this size and limits."""
+    key = (workers, limits or SandboxLimits())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SandboxPool(*key)
+        return pool
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown()
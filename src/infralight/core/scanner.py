@@ -5,7 +5,13 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-from infralight.core.models import FileKind, FileType, Project, SourceFile
+from infralight.core.models import (
+    CACHE_DIR_NAME,
+    FileKind,
+    FileType,
+    Project,
+    SourceFile,
+)
 
 log = logging.getLogger(__name__)
 
@@ -24,6 +30,7 @@ _SKIP_DIRS = {
     ".venv",
     "venv",
     "output",
+    CACHE_DIR_NAME,
 }
 
 
@@ -41,8 +48,7 @@ def scan_directory(root: Path) -> Project:
     if not root.is_dir():
         raise FileNotFoundError(f"Not a directory: {root}")
 
-    project = Project(root=root, output_dir=root / "output")
-
+    files: list[SourceFile] = []
     for path in sorted(root.rglob("*")):
         if any(part in _SKIP_DIRS for part in path.parts):
             continue
@@ -59,9 +65,7 @@ def scan_directory(root: Path) -> Project:
             log.warning("Could not read %s", path)
             continue
 
-        project.files.append(
-            SourceFile(path=path, file_type=ft, kind=fk, content=content)
-        )
+        files.append(SourceFile(path=path, file_type=ft, kind=fk, content=content))
 
-    log.info("Scanned %s — %d files", root, len(project.files))
-    return project
+    log.info("Scanned %s — %d files", root, len(files))
+    return Project(root=root, files=tuple(files), output_dir=root / "output")
@@ -0,0 +1,325 @@
+"""Top-file targeting — which states each minion gets.
+
+A top file maps target expressions to SLS names per environment::
+
+    base:
+      '*':
+        - common
+      'roles:webserver':
+        - match: grain
+        - nginx
+
+:func:`parse_top` compiles every target once into a matcher.  Matchers
+do not test minions one by one: they are set operations over a
+:class:`GrainIndex`, which maps each grain (nested keys joined with
+``:``, list items indexed separately) and value to the minions having
+it.  An exact grain target is then a single lookup, a glob is a scan of
+that grain's distinct values, and :meth:`TopFile.assign` computes every
+minion's SLS list in one pass over the top file.
+
+Supported matchers: ``glob`` (default), ``pcre``, ``list``, ``grain``,
+``grain_pcre`` and ``compound`` with ``G@``, ``P@``, ``E@``, ``L@``,
+bare globs, ``and``/``or``/``not`` and parentheses.  Anything else —
+pillar, node-group and IP matchers — is reported as unsupported and
+matches nothing.
+
+Minion grains come from ``grains/<minion id>.sls`` files, one YAML
+mapping per minion (an ``id`` grain, if present, names the minion).
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import PurePath
+from typing import Any
+
+import yaml
+
+_GLOB_CHARS = frozenset("*?[")
+# Compound ``X@`` prefixes and the matcher each stands for
+_COMPOUND_ENGINES = {"G": "grain", "P": "grain_pcre", "E": "pcre", "L": "list"}
+
+
+class TargetError(ValueError):
+    """A target expression that cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class Minion:
+    id: str
+    grains: dict[str, Any]
+    source_file: str = ""
+
+
+def load_minions(files: Iterable[tuple[str, str]]) -> list[Minion]:
+    """Minions from ``(path, text)`` grains files; unreadable ones skipped."""
+    minions: list[Minion] = []
+    for path, text in files:
+        try:
+            grains = yaml.safe_load(text)
+        except yaml.YAMLError:
+            continue
+        if not isinstance(grains, dict):
+            continue
+        mid = str(grains.get("id") or PurePath(path).name.removesuffix(".sls"))
+        minions.append(Minion(mid, grains, path))
+    return minions
+
+
+def _flatten(grains: dict[str, Any], prefix: str = "") -> Iterable[tuple[str, str]]:
+    for key, value in grains.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{path}:")
+        elif isinstance(value, list):
+            for item in value:
+                if not isinstance(item, (dict, list)):
+                    yield path, str(item)
+        else:
+            yield path, str(value)
+
+
+class GrainIndex:
+    """Minions by id and by grain value — built once, shared by matchers."""
+
+    def __init__(self, minions: Iterable[Minion]) -> None:
+        self.ids: dict[str, None] = {}  # ordered set of minion ids
+        # grain -> lowercased value -> minion ids
+        self.values: dict[str, dict[str, set[str]]] = {}
+        for m in minions:
+            self.ids[m.id] = None
+            for key, value in _flatten(m.grains):
+                by_value = self.values.setdefault(key, {})
+                by_value.setdefault(value.lower(), set()).add(m.id)
+
+    def everyone(self) -> set[str]:
+        return set(self.ids)
+
+    def glob(self, pattern: str) -> set[str]:
+        if not _GLOB_CHARS & set(pattern):
+            return {pattern} if pattern in self.ids else set()
+        return set(fnmatch.filter(self.ids, pattern))
+
+    def pcre(self, pattern: str) -> set[str]:
+        rx = _regex(pattern)
+        return {mid for mid in self.ids if rx.match(mid)}
+
+    def grain(self, expr: str, regex: bool = False) -> set[str]:
+        """Minions whose grain matches ``key:value`` (value a glob or regex).
+
+        Nested keys are separated by ``:`` too, so every split point is
+        tried.  As in Salt, values compare case-insensitively (``ssd:
+        true`` matches ``ssd:True``) and a regex must match from the
+        start of the value.
+        """
+        parts = expr.split(":")
+        found: set[str] = set()
+        for cut in range(1, len(parts)):
+            by_value = self.values.get(":".join(parts[:cut]))
+            if not by_value:
+                continue
+            pattern = ":".join(parts[cut:]).lower()
+            if regex:
+                rx = _regex(pattern)
+                matched = [v for v in by_value if rx.match(v)]
+            elif not _GLOB_CHARS & set(pattern):
+                matched = [pattern] if pattern in by_value else []
+            else:
+                matched = fnmatch.filter(by_value, pattern)
+            for value in matched:
+                found |= by_value[value]
+        return found
+
+
+Matcher = Callable[[GrainIndex], set[str]]
+
+
+def _regex(pattern: str) -> re.Pattern[str]:
+    try:
+        return re.compile(pattern)
+    except re.error as exc:
+        raise TargetError(f"bad regular expression {pattern!r}: {exc}") from exc
+
+
+def compile_target(expr: str, kind: str = "glob") -> Matcher:
+    """Matcher for top-file target *expr* under ``match: <kind>``."""
+    expr = str(expr)
+    if kind == "glob":
+        return lambda ix: ix.glob(expr)
+    if kind == "pcre":
+        _regex(expr)
+        return lambda ix: ix.pcre(expr)
+    if kind == "list":
+        ids = [s.strip() for s in expr.split(",") if s.strip()]
+        return lambda ix: {mid for mid in ids if mid in ix.ids}
+    if kind in ("grain", "grain_pcre"):
+        if ":" not in expr:
+            raise TargetError(f"grain target {expr!r} needs key:value")
+        if kind == "grain_pcre":
+            _regex(expr.split(":")[-1])
+        return lambda ix: ix.grain(expr, regex=kind == "grain_pcre")
+    if kind == "compound":
+        return _Compound(expr).parse()
+    raise TargetError(f"match: {kind} is not supported")
+
+
+class _Compound:
+    """Recursive-descent compiler for compound targets (not > and > or)."""
+
+    def __init__(self, expr: str) -> None:
+        self.tokens = expr.replace("(", " ( ").replace(")", " ) ").split()
+        self.pos = 0
+
+    def parse(self) -> Matcher:
+        matcher = self._or()
+        if self.pos != len(self.tokens):
+            raise TargetError(f"unexpected {self.tokens[self.pos]!r} in compound")
+        return matcher
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _or(self) -> Matcher:
+        left = self._and()
+        while self._peek() == "or":
+            self.pos += 1
+            left = _either(left, self._and())
+        return left
+
+    def _and(self) -> Matcher:
+        left = self._not()
+        while self._peek() == "and":
+            self.pos += 1
+            left = _both(left, self._not())
+        return left
+
+    def _not(self) -> Matcher:
+        if self._peek() == "not":
+            self.pos += 1
+            return _negate(self._not())
+        return self._term()
+
+    def _term(self) -> Matcher:
+        token = self._peek()
+        if token is None:
+            raise TargetError("compound target ends too early")
+        self.pos += 1
+        if token == "(":
+            inner = self._or()
+            if self._peek() != ")":
+                raise TargetError("unbalanced parentheses in compound")
+            self.pos += 1
+            return inner
+        if len(token) > 2 and token[1] == "@":
+            kind = _COMPOUND_ENGINES.get(token[0])
+            if kind is None:
+                raise TargetError(f"{token[0]}@ is not supported in compound")
+            return compile_target(token[2:], kind)
+        return compile_target(token)
+
+
+def _either(a: Matcher, b: Matcher) -> Matcher:
+    return lambda ix: a(ix) | b(ix)
+
+
+def _both(a: Matcher, b: Matcher) -> Matcher:
+    return lambda ix: a(ix) & b(ix)
+
+
+def _negate(a: Matcher) -> Matcher:
+    return lambda ix: ix.everyone() - a(ix)
+
+
+@dataclass
+class TopEntry:
+    env: str
+    target: str
+    kind: str
+    sls: list[str]
+    matcher: Matcher | None = None  # None when the target did not compile
+    error: str = ""
+
+
+@dataclass
+class TopFile:
+    entries: list[TopEntry] = field(default_factory=list)
+
+    def assign(self, index: GrainIndex) -> dict[str, dict[str, list[str]]]:
+        """Per minion id, the SLS names each environment gives it, in order."""
+        out: dict[str, dict[str, list[str]]] = {mid: {} for mid in index.ids}
+        for entry in self.entries:
+            if entry.matcher is None:
+                continue
+            for mid in entry.matcher(index):
+                have = out[mid].setdefault(entry.env, [])
+                have.extend(s for s in entry.sls if s not in have)
+        return out
+
+
+def parse_top(text: str) -> TopFile:
+    """Compile a top file.  Raises :class:`TargetError` if it is not one."""
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as exc:
+        raise TargetError(f"top file is not valid YAML: {exc}") from exc
+    if not isinstance(data, dict):
+        raise TargetError("top file must map environments to targets")
+    top = TopFile()
+    for env, targets in data.items():
+        if not isinstance(targets, dict):
+            continue
+        for target, items in targets.items():
+            kind, sls = "glob", []
+            for item in items if isinstance(items, list) else [items]:
+                if isinstance(item, dict):
+                    kind = str(item.get("match", kind))
+                elif item is not None:
+                    sls.append(str(item))
+            entry = TopEntry(str(env), str(target), kind, sls)
+            try:
+                entry.matcher = compile_target(str(target), kind)
+            except TargetError as exc:
+                entry.error = str(exc)
+            top.entries.append(entry)
+    return top
+
+
+@dataclass
+class Targeting:
+    """What the top files give every minion."""
+
+    minions: list[Minion] = field(default_factory=list)
+    # minion id -> environment -> SLS names, in top-file order
+    states: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    pillar: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    errors: list[tuple[str, str]] = field(default_factory=list)  # (path, message)
+
+
+def target_minions(
+    minions: list[Minion],
+    state_top: tuple[str, str] | None,
+    pillar_top: tuple[str, str] | None = None,
+) -> Targeting:
+    """Evaluate the ``(path, text)`` state and pillar top files for *minions*."""
+    index = GrainIndex(minions)
+    result = Targeting(minions=minions)
+    for top_file, is_pillar in ((state_top, False), (pillar_top, True)):
+        if top_file is None:
+            continue
+        path, text = top_file
+        try:
+            top = parse_top(text)
+        except TargetError as exc:
+            result.errors.append((path, str(exc)))
+            continue
+        result.errors.extend(
+            (path, f"target {e.target!r}: {e.error}") for e in top.entries if e.error
+        )
+        if is_pillar:
+            result.pillar = top.assign(index)
+        else:
+            result.states = top.assign(index)
+    return result
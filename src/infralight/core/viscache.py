@@ -0,0 +1,56 @@
+"""Visualisation cache — per-file IL graphs keyed by content hash.
+
+Each IL file's ``Visualization`` is stored against its template
+fingerprint (own source plus every include/import, see
+``ProjectEnvironment.fingerprint``).  Rendering and the Visualization
+page share one process-wide instance, so a file's decorators are
+extracted once per change no matter who asks first.  The combined
+project graph is cached too and re-merged only when a file's key moves.
+
+Cached graphs are shared between callers — treat them as read-only.
+The renderer's public accessors hand out copies
+(:meth:`Visualization.copy`); only the node, edge and group objects are
+shared with the cache.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from infralight.core.models import Visualization
+
+# (template name, fingerprint) pairs, in file order
+CombinedKey = tuple[tuple[str, str], ...]
+
+
+class VisCache:
+    def __init__(self) -> None:
+        self._files: dict[tuple[Path, str], tuple[str, Visualization]] = {}
+        self._combined: dict[Path, tuple[CombinedKey, Visualization]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, root: Path, name: str, key: str | None) -> Visualization | None:
+        if key is None:
+            return None
+        with self._lock:
+            hit = self._files.get((root, name))
+        return hit[1] if hit and hit[0] == key else None
+
+    def put(self, root: Path, name: str, key: str | None, vis: Visualization) -> None:
+        if key is None:
+            return
+        with self._lock:
+            self._files[(root, name)] = (key, vis)
+
+    def get_combined(self, root: Path, key: CombinedKey) -> Visualization | None:
+        with self._lock:
+            hit = self._combined.get(root)
+        return hit[1] if hit and hit[0] == key else None
+
+    def put_combined(self, root: Path, key: CombinedKey, vis: Visualization) -> None:
+        with self._lock:
+            self._combined[root] = (key, vis)
+
+
+vis_cache = VisCache()
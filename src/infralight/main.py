@@ -1,15 +1,23 @@
 """Infralight — entry point.
 
 Wires Controllers → Views inside a shared layout shell.
+
+Page handlers are async: each sends a loading skeleton first, then
+loads the project and builds its view-model on a worker thread
+(``run.io_bound``) so one large project never blocks the event loop
+for other sessions.  Only widget construction happens on the loop.
 """
 
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
-from nicegui import ui
+from nicegui import run, ui
 
 from infralight.components.layout import page_layout
+from infralight.components.skeleton import page_skeleton
+from infralight.components.theme import inject_theme
 from infralight.controllers.app_controller import AppController
 from infralight.controllers.dashboard_controller import DashboardController
 from infralight.controllers.editor_controller import EditorController
@@ -28,25 +36,61 @@ from infralight.pages import (
     visualization,
 )
 
+if TYPE_CHECKING:
+    from infralight.models.state import AppState
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(name)s  %(message)s")
 
+# How long a page handler waits for the browser's websocket.  NiceGUI's
+# default of 3 s fails on slow networks and busy browsers, leaving a
+# page that never loads; 30 s covers those while still releasing the
+# handler of a tab that was closed before it connected.
+_CONNECT_TIMEOUT = 30.0
+
+
+async def _page_state() -> AppState | None:
+    """Show the skeleton, then load the session's project off the loop.
+
+    Returns ``None`` if the browser never connects within
+    ``_CONNECT_TIMEOUT`` seconds or went away while loading; the page
+    then keeps its skeleton and the project is not loaded for it.
+    """
+    inject_theme()
+    skeleton = page_skeleton()
+    client = ui.context.client
+    try:
+        await client.connected(timeout=_CONNECT_TIMEOUT)
+    except TimeoutError:
+        return None
+    state = await AppController.load_state()
+    if client.is_deleted:
+        return None
+    skeleton.delete()
+    return state
+
 
 @ui.page("/")
-def page_dashboard():
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
-    with page_layout(app_ctrl, active="/"):
-        vm = DashboardController(state).get_view_model()
+async def page_dashboard():
+    state = await _page_state()
+    if state is None:
+        return
+    vm = await run.io_bound(DashboardController(state).get_view_model)
+    if vm is None:
+        return
+    with page_layout(AppController(state), active="/"):
         dashboard.render(vm)
 
 
 @ui.page("/states")
-def page_states():
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
+async def page_states():
+    state = await _page_state()
+    if state is None:
+        return
     ctrl = StatesController(state)
-    with page_layout(app_ctrl, active="/states"):
-        vm = ctrl.get_view_model()
+    vm = await run.io_bound(ctrl.get_view_model)
+    if vm is None:
+        return
+    with page_layout(AppController(state), active="/states"):
         detail_container = ui.column().classes("w-full")
 
         def _on_select(event):
@@ -61,21 +105,28 @@ def page_states():
 
 
 @ui.page("/salt-overview")
-def page_salt_overview():
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
-    with page_layout(app_ctrl, active="/salt-overview"):
-        vm = SaltOverviewController(state).get_view_model()
-        salt_overview.render(vm)
+async def page_salt_overview():
+    state = await _page_state()
+    if state is None:
+        return
+    ctrl = SaltOverviewController(state)
+    vm = await run.io_bound(ctrl.get_view_model)
+    if vm is None:
+        return
+    with page_layout(AppController(state), active="/salt-overview"):
+        salt_overview.render(vm, on_minion=ctrl.get_apply_order)
 
 
 @ui.page("/resources")
-def page_resources():
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
+async def page_resources():
+    state = await _page_state()
+    if state is None:
+        return
     ctrl = ResourcesController(state)
-    with page_layout(app_ctrl, active="/resources"):
-        vm = ctrl.get_view_model()
+    vm = await run.io_bound(ctrl.get_view_model)
+    if vm is None:
+        return
+    with page_layout(AppController(state), active="/resources"):
         detail_container = ui.column().classes("w-full")
 
         def _on_select(event):
@@ -90,30 +141,36 @@ def page_resources():
 
 
 @ui.page("/visualization")
-def page_visualization():
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
-    with page_layout(app_ctrl, active="/visualization"):
-        vm = VisController(state).get_view_model()
+async def page_visualization():
+    state = await _page_state()
+    if state is None:
+        return
+    vm = await run.io_bound(VisController(state).get_view_model)
+    if vm is None:
+        return
+    with page_layout(AppController(state), active="/visualization"):
         visualization.render(vm)
 
 
 @ui.page("/output")
-def page_output():
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
-    with page_layout(app_ctrl, active="/output"):
-        vm = OutputController(state).get_view_model()
+async def page_output():
+    state = await _page_state()
+    if state is None:
+        return
+    vm = await run.io_bound(OutputController(state).get_view_model)
+    if vm is None:
+        return
+    with page_layout(AppController(state), active="/output"):
         output.render(vm)
 
 
 @ui.page("/editor")
-def page_editor(file: str = ""):
-    state = AppController.build_state()
-    app_ctrl = AppController(state)
-    ctrl = EditorController(state)
-    with page_layout(app_ctrl, active="/editor"):
-        editor.render(ctrl, initial_file=file)
+async def page_editor(file: str = ""):
+    state = await _page_state()
+    if state is None:
+        return
+    with page_layout(AppController(state), active="/editor"):
+        editor.render(EditorController(state), initial_file=file)
 
 
 ui.run(
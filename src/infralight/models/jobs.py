@@ -0,0 +1,48 @@
+"""Background jobs — long-running work shared across sessions.
+
+Pure model code: a job is a key plus a cancellation flag.  At most one
+job runs per key (e.g. one render per project root), so a second
+session asking to start the same work is told it's already running.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Job:
+    key: str
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+
+_running: dict[str, Job] = {}
+_lock = threading.Lock()
+
+
+def start_job(key: str) -> Job | None:
+    """Register a job for *key*; ``None`` if one is already running."""
+    with _lock:
+        if key in _running:
+            return None
+        job = _running[key] = Job(key)
+        return job
+
+
+def finish_job(job: Job) -> None:
+    with _lock:
+        if _running.get(job.key) is job:
+            del _running[job.key]
+
+
+def running_job(key: str) -> Job | None:
+    with _lock:
+        return _running.get(key)
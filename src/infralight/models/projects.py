@@ -0,0 +1,154 @@
+"""Project store — loaded projects shared across sessions.
+
+Pure model code.  Every project root has a generation number, bumped by
+:func:`invalidate` (e.g. on rescan).  Loading is single-flight per
+(root, generation): the first request starts one scan on the store's
+loader threads and every concurrent request waits on the same future,
+so any number of sessions opening the same repo pay for one load and
+share one ``Project``.
+
+Projects are immutable snapshots.  :func:`update_file` publishes a new
+generation that shares every unchanged file with the previous one;
+sessions holding the old snapshot keep a consistent view of it, and
+readers never wait for writers.  Anything derived purely from a snapshot
+(table rows, indexes) can be cached per generation with :func:`memo`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, TypeVar
+
+from infralight.core.environment import get_environment
+from infralight.core.models import Project
+from infralight.core.parsers import parse_file
+from infralight.core.scanner import scan_directory
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="project-load")
+_generations: dict[Path, int] = {}
+_loads: dict[Path, tuple[int, Future[Project]]] = {}
+_lock = threading.Lock()
+_write_lock = threading.Lock()  # serialises update_file
+_memo: dict[tuple[Path, str], tuple[int, Any]] = {}
+
+
+def scan_project(root: Path, generation: int = 0) -> Project:
+    """Scan *root* and parse all files — the uncached load."""
+    proj = scan_directory(root)
+    proj = replace(
+        proj,
+        file_resources=tuple(tuple(parse_file(sf)) for sf in proj.files),
+        output_dir=root / "output",
+        generation=generation,
+    )
+    get_environment(proj.root).loader.sync(proj.files)
+    log.info(
+        "Loaded %s (generation %d) — %d files, %d resources",
+        root,
+        generation,
+        len(proj.files),
+        len(proj.resources),
+    )
+    return proj
+
+
+def generation(root: Path) -> int:
+    with _lock:
+        return _generations.get(root.resolve(), 0)
+
+
+def invalidate(root: Path) -> int:
+    """Start a new generation for *root*; the next load rescans it.
+
+    Values :func:`memo` derived from older generations are dropped.
+    """
+    root = root.resolve()
+    with _lock:
+        gen = _generations[root] = _generations.get(root, 0) + 1
+        for key in [k for k in _memo if k[0] == root]:
+            del _memo[key]
+        return gen
+
+
+def submit_load(root: Path) -> Future[Project]:
+    """Future for *root*'s current generation, starting the load only once.
+
+    A load that failed is retried by the next caller.
+    """
+    root = root.resolve()
+    with _lock:
+        gen = _generations.get(root, 0)
+        current = _loads.get(root)
+        if current is not None and current[0] == gen:
+            fut = current[1]
+            if not (fut.done() and fut.exception() is not None):
+                return fut
+        fut = _executor.submit(scan_project, root, gen)
+        _loads[root] = (gen, fut)
+        return fut
+
+
+def load_project(root: Path) -> Project:
+    """Blocking :func:`submit_load`."""
+    return submit_load(root).result()
+
+
+async def aload_project(root: Path) -> Project:
+    """Await :func:`submit_load` without tying up a thread per waiter."""
+    return await asyncio.wrap_future(submit_load(root))
+
+
+def update_file(root: Path, path: Path, content: str) -> Project | None:
+    """Publish a new generation of *root* with *path*'s content replaced.
+
+    Only *path* is re-parsed.  Returns the new snapshot, or ``None`` if
+    *path* isn't one of the project's files.  If the project is rescanned
+    concurrently the change is re-applied to the rescanned snapshot.
+    """
+    root = root.resolve()
+    with _write_lock:
+        while True:
+            base = load_project(root)
+            old = next((sf for sf in base.files if sf.path == path), None)
+            if old is None:
+                return None
+            sf = replace(old, content=content)
+            proj = base.with_file(sf, tuple(parse_file(sf)))
+            with _lock:
+                if _generations.get(root, 0) != base.generation:
+                    continue  # invalidated meanwhile — rebase
+                fut: Future[Project] = Future()
+                fut.set_result(proj)
+                _generations[root] = proj.generation
+                _loads[root] = (proj.generation, fut)
+            get_environment(root).loader.sync([sf])
+            return proj
+
+
+def memo(project: Project, name: str, build: Callable[[], T]) -> T:
+    """Value *name* derived from *project*, built once per generation.
+
+    Only the newest generation is kept; sessions still on an older
+    snapshot get a fresh, uncached value.
+    """
+    key = (project.root, name)
+    with _lock:
+        hit = _memo.get(key)
+    if hit is not None and hit[0] == project.generation:
+        return hit[1]  # type: ignore[no-any-return]
+    value = build()
+    with _lock:
+        current = _memo.get(key)
+        if current is None or current[0] <= project.generation:
+            _memo[key] = (project.generation, value)
+    return value
@@ -8,11 +8,17 @@ views receive typed view-model dataclasses assembled by controllers.
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import ClassVar
 
+from infralight.core import lod
+from infralight.core.environment import get_environment
 from infralight.core.models import (
+    FileKind,
     IaCResource,
     Project,
     VisEdge,
@@ -20,9 +26,24 @@ from infralight.core.models import (
     VisNode,
     Visualization,
 )
-from infralight.core.parsers import parse_file
-from infralight.core.renderer import extract_visualization, render_all
-from infralight.core.scanner import scan_directory
+from infralight.core.ordering import ApplyStep, execution_order
+from infralight.core.parsers import salt_names, yaml_error
+from infralight.core.reach import ReachIndex
+from infralight.core.renderer import (
+    RenderResult,
+    project_visualization,
+    render_all,
+)
+from infralight.core.requisites import (
+    RequisiteGraph,
+    requisite_graph,
+    salt_root,
+    sls_name,
+)
+from infralight.core.sandbox import SandboxLimits, SandboxPool, get_sandbox
+from infralight.core.targeting import Targeting, load_minions, target_minions
+from infralight.models import projects
+from infralight.models.tables import RowSet
 from infralight.models.viewmodels import (
     DashboardStats,
     EditableFileRow,
@@ -32,14 +53,17 @@ from infralight.models.viewmodels import (
     PropertyPair,
     RenderedFileRow,
     ResourceSummary,
+    SaltApplyStep,
     SaltCategory,
     SaltCategoryItem,
     SaltDetail,
+    SaltMinionRow,
     SaltOverviewVM,
     SaltRequisite,
     SaltRow,
     TfDetail,
     TfRow,
+    rows_to_dicts,
 )
 
 log = logging.getLogger(__name__)
@@ -51,36 +75,47 @@ class AppState:
 
     project: Project | None = None
     current_vis: Visualization = field(default_factory=Visualization)
+    # Render pool — ``render_executor`` is "sandbox" (worker processes
+    # bounded by ``render_limits``) or "thread" (in-process, trusted only)
+    render_workers: int = field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    render_executor: str = "sandbox"
+    render_limits: SandboxLimits = field(default_factory=SandboxLimits)
+    # Graphs with more nodes are drawn as group summaries (``core.lod``)
+    vis_node_limit: int = lod.NODE_LIMIT
+    # "layered" (laid out on the server, see ``core.layout``) or "mermaid"
+    vis_renderer: str = "layered"
+    # Graphs with more nodes are drawn whole with ECharts (``core.echarts``)
+    vis_echart_limit: int = 500
 
     def load_project(self, root: Path) -> None:
-        """Scan *root*, parse all files, set output dir."""
-        proj = scan_directory(root)
-        for sf in proj.files:
-            proj.resources.extend(parse_file(sf))
-        proj.output_dir = root / "output"
-        self.project = proj
-        log.info(
-            "Loaded %s — %d files, %d resources",
-            root,
-            len(proj.files),
-            len(proj.resources),
-        )
+        """Use *root*'s shared project, scanning it only if no session has."""
+        self.project = projects.load_project(root)
 
     def rescan(self) -> None:
-        """Re-scan current project root.  Returns True on success."""
+        """Re-scan current project root for every session."""
         if self.project:
+            projects.invalidate(self.project.root)
             self.load_project(self.project.root)
 
     def build_visualization(self) -> Visualization:
-        """Merge IL decorator graphs from all IL files."""
-        combined = Visualization()
+        """Merge IL decorator graphs from all IL files.
+
+        Per-file graphs come from the shared visualisation cache, so only
+        files changed since the last call are re-extracted.
+        """
         if not self.project:
-            return combined
-        for sf in self.project.il_files:
-            combined.merge(extract_visualization(sf))
+            return Visualization()
+        combined = project_visualization(
+            self.project.il_files, get_environment(self.project.root), self._sandbox()
+        )
         self.current_vis = combined
         return combined
 
+    def _sandbox(self) -> SandboxPool | None:
+        if self.render_executor != "sandbox":
+            return None
+        return get_sandbox(self.render_workers, self.render_limits)
+
     def build_tf_graph(self) -> Visualization:
         """Auto-generate a graph from Terraform resources only.
 
@@ -91,16 +126,13 @@ class AppState:
         if not self.project:
             return vis
 
-        seen_nodes: set[str] = set()
-        tf_groups: set[str] = set()
         for r in self.project.resources:
             if r.provider == "salt":
                 continue
 
             provider = r.provider or "terraform"
-            if provider not in tf_groups:
-                tf_groups.add(provider)
-                vis.groups.append(
+            if vis.group(f"tf_{provider}") is None:
+                vis.add_group(
                     VisGroup(
                         id=f"tf_{provider}",
                         label=f"TF: {provider.title()}",
@@ -110,18 +142,21 @@ class AppState:
                 )
 
             node_id = r.id.replace(".", "_")
-            if node_id not in seen_nodes:
-                seen_nodes.add(node_id)
-                icon = _tf_icon(r.resource_type)
-                vis.nodes.append(
+            if vis.node(node_id) is None:
+                vis.add_node(
                     VisNode(
                         id=node_id,
                         label=r.name,
-                        icon=icon,
+                        icon=_tf_icon(r.resource_type),
                         color="#42A5F5",
                         group=f"tf_{provider}",
                         source_file=r.source_file,
                         source_line=r.source_line,
+                        meta={
+                            "provider": provider,
+                            "type": r.resource_type,
+                            "resource": r.id,
+                        },
                     )
                 )
 
@@ -138,7 +173,7 @@ class AppState:
                     ) in v.replace(".", "_"):
                         src = r.id.replace(".", "_")
                         tgt = other_id.replace(".", "_")
-                        vis.edges.append(
+                        vis.add_edge(
                             VisEdge(
                                 source=src,
                                 target=tgt,
@@ -154,27 +189,24 @@ class AppState:
         """Auto-generate a graph from Salt states only.
 
         - Salt states become nodes grouped by module (pkg, service, ...)
-        - Salt requisites become edges
+        - Salt requisites become edges, from the state that waits to the
+          state it waits for (see ``core.requisites``)
         """
         vis = Visualization()
         if not self.project:
             return vis
 
-        seen_nodes: set[str] = set()
-        salt_groups: set[str] = set()
-        salt_nodes_by_state: dict[str, str] = {}
         for r in self.project.resources:
             if r.provider != "salt":
                 continue
 
             module = r.properties.get("__module", "salt")
-            if module not in salt_groups:
-                salt_groups.add(module)
+            if vis.group(f"salt_{module}") is None:
                 meta = self._SALT_MODULE_META.get(
                     module,
                     (module.title(), "extension", "#FFA726"),
                 )
-                vis.groups.append(
+                vis.add_group(
                     VisGroup(
                         id=f"salt_{module}",
                         label=f"Salt: {meta[0]}",
@@ -184,11 +216,9 @@ class AppState:
                 )
 
             func = r.properties.get("__function", "")
-            node_id = f"salt_{r.id}_{module}"
-            if node_id not in seen_nodes:
-                seen_nodes.add(node_id)
-                salt_nodes_by_state[r.id] = node_id
-                vis.nodes.append(
+            node_id = _salt_node_id(r)
+            if vis.node(node_id) is None:
+                vis.add_node(
                     VisNode(
                         id=node_id,
                         label=f"{r.name} ({module}.{func})",
@@ -197,53 +227,107 @@ class AppState:
                         group=f"salt_{module}",
                         source_file=r.source_file,
                         source_line=r.source_line,
+                        meta={"provider": "salt", "module": module, "resource": r.id},
                     )
                 )
 
-        for r in self.project.resources:
-            if r.provider != "salt":
-                continue
-            reqs = r.properties.get("__requisites", [])
-            src_node = salt_nodes_by_state.get(r.id)
-            if not src_node:
+        graph = self.requisite_graph()
+        for req in graph.requisites:
+            src_node = _salt_node_id(graph.states[req.source])
+            tgt_node = _salt_node_id(graph.states[req.target])
+            if src_node == tgt_node:
                 continue
-            for req in reqs:
-                to_state = req.get("state", "")
-                rel = req.get("type", "require")
-                tgt_node = salt_nodes_by_state.get(to_state)
-                if not tgt_node:
-                    for sid, nid in salt_nodes_by_state.items():
-                        if sid == to_state:
-                            tgt_node = nid
-                            break
-                if tgt_node and src_node != tgt_node:
-                    style = (
-                        "dashed"
-                        if rel in ("watch", "listen", "onchanges")
-                        else "solid"
-                    )
-                    vis.edges.append(
-                        VisEdge(
-                            source=src_node,
-                            target=tgt_node,
-                            label=rel,
-                            style=style,
-                            color="#FFA726",
-                        )
-                    )
+            style = (
+                "dashed" if req.kind in ("watch", "listen", "onchanges") else "solid"
+            )
+            vis.add_edge(
+                VisEdge(
+                    source=src_node,
+                    target=tgt_node,
+                    label=req.kind,
+                    style=style,
+                    color="#FFA726",
+                )
+            )
+
+        return vis
+
+    def requisite_graph(self) -> RequisiteGraph:
+        """Salt requisites resolved to states, once per generation."""
+        if not self.project:
+            return RequisiteGraph()
+        project = self.project
+        return projects.memo(
+            project,
+            "requisites",
+            lambda: requisite_graph(
+                project.resources,
+                {str(f.path): f.content for f in project.salt_files},
+                self._salt_root(),
+            ),
+        )
+
+    def salt_parse_errors(self) -> dict[str, tuple[int, str]]:
+        """Line and message of each Salt file that isn't valid YAML, by path.
+
+        IL templates are left out — they are Jinja until rendered.
+        Computed once per generation.
+        """
+        if not self.project:
+            return {}
+        project = self.project
+        return projects.memo(
+            project, "salt_errors", lambda: _salt_parse_errors(project)
+        )
+
+    def _salt_root(self) -> str:
+        """Directory ``sls:`` and top-file names are relative to."""
+        if not self.project:
+            return ""
+        return salt_root(str(f.path) for f in self.project.salt_files)
 
+    def dependency_graph(self) -> Visualization:
+        """Terraform references and Salt requisites as one graph."""
+        vis = self.build_tf_graph()
+        vis.merge(self.build_salt_graph())
         return vis
 
-    def render_il_files(self) -> dict[str, str]:
+    def reach_index(self) -> ReachIndex:
+        """Reachability over :meth:`dependency_graph`, once per generation."""
+        if not self.project:
+            return ReachIndex(Visualization())
+        return projects.memo(
+            self.project, "reach", lambda: ReachIndex(self.dependency_graph())
+        )
+
+    def render_il_files(
+        self,
+        force: bool = False,
+        on_progress: Callable[[RenderResult], None] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> list[RenderResult]:
         """Render all IL templates to output dir.
 
-        Returns a dict of ``{filename: rendered_text}``.
+        Templates whose inputs match the render manifest are skipped
+        unless *force* is set.  *on_progress* receives each file's result
+        as it completes; setting *cancel* stops the remaining files.
+        Returns one ``RenderResult`` per file.
         Raises on error — callers handle the exception.
         """
         if not self.project:
-            return {}
+            return []
         output_dir = self.project.output_dir or self.project.root / "output"
-        results, vis = render_all(self.project.il_files, output_dir)
+        results, vis = render_all(
+            self.project.il_files,
+            output_dir,
+            get_environment(self.project.root),
+            force=force,
+            workers=self.render_workers,
+            executor=self.render_executor,
+            limits=self.render_limits,
+            on_progress=on_progress,
+            cancel=cancel,
+        )
         self.current_vis = vis
         return results
 
@@ -275,6 +359,11 @@ class AppState:
                     "warn", "No SaltStack or Terraform files found in this directory."
                 )
             )
+        issues.extend(self._requisite_issues())
+        issues.extend(
+            Issue("warn", f"Top file: {msg}", file=self._rel(path))
+            for path, msg in self.targeting().errors
+        )
         il = self.project.il_files
         if il:
             names = ", ".join(f.name for f in il[:5])
@@ -283,6 +372,80 @@ class AppState:
             )
         return issues
 
+    def _requisite_issues(self) -> list[Issue]:
+        """Unparsable state files, requisite loops and requisites naming no state.
+
+        A requisite on a state of a file that failed to parse counts
+        toward that file's parse error instead of being reported as
+        naming no state.
+        """
+        graph = self.requisite_graph()
+        broken = self.salt_parse_errors()
+        held = dict.fromkeys(broken, 0)
+        owners = self._broken_owners(broken)
+        issues: list[Issue] = []
+        for loop in graph.cycles():
+            states = [graph.states[i] for i in loop]
+            path = " → ".join(_salt_ref(r) for r in states)
+            first = states[0]
+            issues.append(
+                Issue(
+                    "error",
+                    f"Requisite cycle: {path}",
+                    file=self._rel(first.source_file),
+                    line=first.source_line,
+                )
+            )
+        for u in graph.unresolved:
+            owner = owners.get(("sls" if u.module == "sls" else "", u.target))
+            if owner is not None:
+                held[owner] += 1
+                continue
+            target = u.target if u.module == "_" else f"{u.module}: {u.target}"
+            issues.append(
+                Issue(
+                    "error",
+                    f"{_salt_ref(u.state)} has {u.kind} on {target}, "
+                    "which no state defines",
+                    file=self._rel(u.state.source_file),
+                    line=u.line,
+                )
+            )
+        parse_issues = []
+        for path, (line, problem) in broken.items():
+            message = f"Not valid YAML: {problem}"
+            if held[path]:
+                message += f"; {held[path]} requisite(s) on its states can't be checked"
+            parse_issues.append(
+                Issue("error", message, file=self._rel(path), line=line)
+            )
+        return parse_issues + issues
+
+    def _broken_owners(self, broken: Iterable[str]) -> dict[tuple[str, str], str]:
+        """Broken file per requisite target it probably defines.
+
+        Keys are ``("sls", <sls name>)`` and ``("", <id or name>)``,
+        read from the raw text since the file has no parsed states.
+        """
+        if not self.project:
+            return {}
+        root = self._salt_root()
+        texts = {str(f.path): f.content for f in self.project.salt_files}
+        owners: dict[tuple[str, str], str] = {}
+        for path in broken:
+            owners[("sls", sls_name(path, root))] = path
+            owners.update((("", n), path) for n in salt_names(texts[path]))
+        return owners
+
+    def _rel(self, path: str) -> str:
+        """*path* relative to the project root, as the editor expects it."""
+        if not self.project:
+            return path
+        try:
+            return Path(path).relative_to(self.project.root).as_posix()
+        except ValueError:
+            return path
+
     def file_rows(self) -> list[FileRow]:
         if not self.project:
             return []
@@ -379,7 +542,8 @@ class AppState:
                 total_services=0,
                 total_files=0,
                 categories=[],
-                requisites=[],
+                requisites=RowSet([]),
+                apply_order=RowSet([]),
                 unique_packages=[],
                 unique_services=[],
             )
@@ -480,11 +644,110 @@ class AppState:
             total_services=len(svc_resources),
             total_files=len(file_resources),
             categories=categories,
-            requisites=requisites,
+            requisites=RowSet(rows_to_dicts(requisites)),
+            apply_order=RowSet(rows_to_dicts(self.apply_steps())),
             unique_packages=unique_pkgs,
             unique_services=unique_svcs,
+            minions=RowSet(rows_to_dicts(self._minion_rows())),
         )
 
+    def apply_order(self, minion: str = "") -> list[ApplyStep]:
+        """The order a highstate applies states in, once per generation.
+
+        Of *minion*'s states when given, else of every Salt state.
+        """
+        if not self.project:
+            return []
+        return projects.memo(
+            self.project,
+            f"apply_order:{minion}",
+            lambda: execution_order(
+                self.requisite_graph(),
+                self.minion_states(minion) if minion else None,
+            ),
+        )
+
+    def targeting(self) -> Targeting:
+        """top.sls and pillar/top.sls evaluated against every minion's grains."""
+        if not self.project:
+            return Targeting()
+        project = self.project
+        return projects.memo(project, "targeting", lambda: _targeting(project))
+
+    def minion_states(self, minion: str) -> list[int]:
+        """States (``requisite_graph().states`` indexes) *minion*'s highstate runs.
+
+        In definition order: top-file SLS order, then order in each file.
+        """
+        if not self.project:
+            return []
+        by_sls = projects.memo(self.project, "states_by_sls", self._states_by_sls)
+        envs = self.targeting().states.get(minion, {})
+        sls = dict.fromkeys(s for names in envs.values() for s in names)
+        return [i for name in sls for i in by_sls.get(name, ())]
+
+    def _states_by_sls(self) -> dict[str, list[int]]:
+        root = self._salt_root()
+        by_sls: dict[str, list[int]] = {}
+        for i, r in enumerate(self.requisite_graph().states):
+            by_sls.setdefault(sls_name(r.source_file, root), []).append(i)
+        return by_sls
+
+    def _minion_rows(self) -> list[SaltMinionRow]:
+        if not self.project:
+            return []
+        root = self._salt_root()
+        known = {sls_name(str(f.path), root) for f in self.project.salt_files}
+        targeting = self.targeting()
+        rows = []
+        for m in targeting.minions:
+            sls = [
+                s for names in targeting.states.get(m.id, {}).values() for s in names
+            ]
+            pillar = [
+                s for names in targeting.pillar.get(m.id, {}).values() for s in names
+            ]
+            rows.append(
+                SaltMinionRow(
+                    minion=m.id,
+                    grains_file=m.source_file,
+                    sls=", ".join(sls),
+                    pillar=", ".join(pillar),
+                    states=len(self.minion_states(m.id)),
+                    missing=", ".join(s for s in sls if s not in known),
+                )
+            )
+        return rows
+
+    def apply_steps(self, minion: str = "") -> list[SaltApplyStep]:
+        """Apply-order rows of *minion*'s highstate, else of every state."""
+        graph = self.requisite_graph()
+        rows = []
+        for n, step in enumerate(self.apply_order(minion), 1):
+            r = graph.states[step.state]
+            notes = []
+            if step.explicit:
+                notes.append(f"order: {r.properties['order']}")
+            if step.pulled:
+                notes.append("pulled forward by a requisite")
+            if step.cyclic:
+                notes.append("requisite loop — Salt fails this state")
+            rows.append(
+                SaltApplyStep(
+                    step=n,
+                    state=_salt_ref(r),
+                    function=r.resource_type,
+                    name=str(r.name),
+                    waits_for=", ".join(
+                        _salt_ref(graph.states[i]) for i in step.waits_for
+                    ),
+                    source_file=self._rel(r.source_file),
+                    line=r.source_line,
+                    note="; ".join(notes),
+                )
+            )
+        return rows
+
     def tf_rows(self) -> list[TfRow]:
         if not self.project:
             return []
@@ -512,17 +775,25 @@ class AppState:
     def tf_detail(self, resource_id: str) -> TfDetail | None:
         if not self.project:
             return None
-        for r in self.project.resources:
-            if r.id == resource_id:
-                return TfDetail(
-                    type=r.resource_type,
-                    name=r.name,
-                    properties=[
-                        PropertyPair(key=k, value=str(v))
-                        for k, v in r.properties.items()
-                    ],
-                )
-        return None
+        r = next((r for r in self.project.resources if r.id == resource_id), None)
+        if r is None:
+            return None
+        reach = self.reach_index()
+        nodes = reach.vis.node_map()
+        node_id = r.id.replace(".", "_")
+        return TfDetail(
+            type=r.resource_type,
+            name=r.name,
+            properties=[
+                PropertyPair(key=k, value=str(v)) for k, v in r.properties.items()
+            ],
+            depends_on=[
+                nodes[n].meta.get("resource", n) for n in reach.dependencies(node_id)
+            ],
+            impacted=[
+                nodes[n].meta.get("resource", n) for n in reach.dependents(node_id)
+            ],
+        )
 
     def rendered_file_rows(self) -> list[RenderedFileRow]:
         output_dir = self.project.output_dir if self.project else None
@@ -600,7 +871,9 @@ class AppState:
                 rel = sf.name
             if rel == rel_path:
                 sf.path.write_text(content, encoding="utf-8")
-                sf.content = content
+                updated = projects.update_file(self.project.root, sf.path, content)
+                if updated is not None:
+                    self.project = updated
                 log.info("Saved %s (%d chars)", sf.path, len(content))
                 return True
         return False
@@ -657,6 +930,43 @@ def _tf_icon(resource_type: str) -> str:
     return "cloud"
 
 
+def _salt_parse_errors(project: Project) -> dict[str, tuple[int, str]]:
+    errors = {}
+    for f in project.salt_files:
+        if f.kind != FileKind.IL and (error := yaml_error(f.content)):
+            errors[str(f.path)] = error
+    return errors
+
+
+def _targeting(project: Project) -> Targeting:
+    """Find the top files and grains files of *project* and evaluate them."""
+    state_top = pillar_top = None
+    grains = []
+    for f in project.salt_files:
+        try:
+            rel = f.path.relative_to(project.root).as_posix()
+        except ValueError:
+            rel = f.name
+        parent = rel.split("/")[:-1]
+        if f.name == "top.sls":
+            if "pillar" in parent:
+                pillar_top = pillar_top or (rel, f.content)
+            else:
+                state_top = state_top or (rel, f.content)
+        elif parent and parent[-1] == "grains":
+            grains.append((rel, f.content))
+    return target_minions(load_minions(grains), state_top, pillar_top)
+
+
+def _salt_ref(r: IaCResource) -> str:
+    """How a requisite would name *r*, e.g. ``pkg: nginx``."""
+    return f"{r.properties.get('__module', 'salt')}: {r.id}"
+
+
+def _salt_node_id(r: IaCResource) -> str:
+    return f"salt_{r.id}_{r.properties.get('__module', 'salt')}"
+
+
 def _salt_icon(module: str) -> str:
     return _SALT_ICONS.get(module, "extension")
 
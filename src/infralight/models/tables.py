@@ -0,0 +1,85 @@
+"""Server-side table queries — sort, filter and page rows in Python.
+
+Pure model code.  A :class:`RowSet` holds a table's rows in wire format
+(plain dicts) and answers Quasar ``@request`` queries, so only the
+visible page crosses the websocket.  Sort orders and the lowercase
+search text are computed once per row set and reused by later queries.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class TablePage:
+    rows: list[dict[str, Any]]
+    total: int  # rows matching the filter, across all pages
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    # Numbers before text, empty values last; mixed columns never raise
+    if value is None or value == "":
+        return (2, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+class RowSet:
+    """The full, immutable row list behind one server-side table."""
+
+    def __init__(self, rows: Sequence[dict[str, Any]]) -> None:
+        self.rows = rows
+        self._orders: dict[tuple[str, bool], list[int]] = {}
+        self._search: list[str] | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _order(self, field: str, descending: bool) -> list[int]:
+        with self._lock:
+            order = self._orders.get((field, descending))
+        if order is None:
+            keys = [_sort_key(row.get(field)) for row in self.rows]
+            order = sorted(range(len(keys)), key=keys.__getitem__, reverse=descending)
+            if descending:  # empty values stay last either way
+                order.sort(key=lambda i: keys[i][0] == 2)
+            with self._lock:
+                self._orders[(field, descending)] = order
+        return order
+
+    def _search_text(self) -> list[str]:
+        if self._search is None:
+            self._search = [
+                "\0".join(str(v) for v in row.values() if v is not None).lower()
+                for row in self.rows
+            ]
+        return self._search
+
+    def query(
+        self,
+        *,
+        sort_by: str | None = None,
+        descending: bool = False,
+        filter: str = "",
+        page: int = 1,
+        per_page: int = 25,
+    ) -> TablePage:
+        """Rows of *page* after filtering and sorting; *per_page* 0 means all."""
+        index: Sequence[int] = (
+            self._order(sort_by, descending) if sort_by else range(len(self.rows))
+        )
+        needle = filter.strip().lower()
+        if needle:
+            text = self._search_text()
+            index = [i for i in index if needle in text[i]]
+        total = len(index)
+        if per_page > 0:
+            start = (max(page, 1) - 1) * per_page
+            index = index[start : start + per_page]
+        return TablePage([self.rows[i] for i in index], total)
@@ -2,20 +2,43 @@
 
 These replace the raw ``dict`` returns so every field is explicit,
 documented, and statically checked.  Quasar tables still need
-``list[dict]``, so row dataclasses provide a ``to_dict()`` helper
-and the ``rows_to_dicts()`` utility converts a whole list.
+``list[dict]``; the ``rows_to_dicts()`` utility converts a whole list.
+Large tables are passed as a cached ``RowSet`` (see ``models.tables``).
 """
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import asdict, dataclass
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field, fields
 from typing import Any
 
+from infralight.models.tables import RowSet
 
-def rows_to_dicts(rows: list[Any]) -> list[dict[str, Any]]:
-    """Convert a list of dataclass rows to list[dict] for Quasar tables."""
-    return [asdict(r) for r in rows]
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _field_names(cls: type) -> tuple[str, ...]:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> list[dict[str, Any]]:
+    """Convert dataclass rows to list[dict] for Quasar tables.
+
+    Rows are flat, so each becomes a shallow dict of its fields; the
+    field names are looked up once per class.
+    """
+    out: list[dict[str, Any]] = []
+    cls: type | None = None
+    names: tuple[str, ...] = ()
+    for r in rows:
+        if type(r) is not cls:
+            cls = type(r)
+            names = _field_names(cls)
+        out.append({n: getattr(r, n) for n in names})
+    return out
 
 
 @dataclass
@@ -90,6 +113,9 @@ class TfDetail:
     type: str
     name: str
     properties: list[PropertyPair]
+    # Resource ids this one references, and that reference it, transitively
+    depends_on: list[str] = field(default_factory=list)
+    impacted: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -118,6 +144,8 @@ class DashboardStats:
 class Issue:
     level: str  # "warn", "info", "ok", "error"
     message: str
+    file: str = ""  # project-relative path the issue points at, if any
+    line: int = 0
 
 
 @dataclass
@@ -142,35 +170,57 @@ class VisGroupVM:
     label: str
 
 
+@dataclass
+class VisSectionVM:
+    """Part of a graph — one group of a summarised graph, or a focus result."""
+
+    id: str
+    label: str
+    count: int  # nodes in the group
+    mermaid: str  # e.g. the group plus the neighbours it connects to
+    svg: str = ""  # pre-positioned drawing of ``mermaid``, if laid out
+    digest: str = ""  # hash of what is drawn — the browser's cache key
+
+
 @dataclass
 class DashboardVM:
     stats: DashboardStats
     issues: list[Issue]
     has_project: bool
     file_rows: list[FileRow]
-    on_rescan: Callable[[], None]
+    on_rescan: Callable[[], Awaitable[None]]
 
 
 @dataclass
 class StatesVM:
-    rows: list[SaltRow]
+    rows: RowSet  # of SaltRow
     count: int
 
 
 @dataclass
 class ResourcesVM:
-    rows: list[TfRow]
+    rows: RowSet  # of TfRow
     count: int
 
 
 @dataclass
 class VisVM:
-    nodes: list[VisNodeVM]
-    edges: list[VisEdgeVM]
+    nodes: RowSet  # of VisNodeVM
+    edges: RowSet  # of VisEdgeVM
     groups: list[VisGroupVM]
-    mermaid: str
+    mermaid: str  # the group summary when ``summarized``
     layout: str
     has_data: bool
+    svg: str = ""  # server-side drawing of ``mermaid`` (``core.layout``)
+    echart: dict[str, Any] | None = None  # whole graph, for very large graphs
+    digest: str = ""  # hash of what is drawn — the browser's cache key
+    summarized: bool = False  # too large to draw whole — see ``core.lod``
+    sections: list[VisSectionVM] = field(default_factory=list)
+    # Focus mode — filter choices, and the query (see ``core.query``):
+    # on_focus(focus, hops, direction, groups, providers, modules)
+    providers: list[str] = field(default_factory=list)
+    modules: list[str] = field(default_factory=list)
+    on_focus: Callable[..., VisSectionVM] | None = None
 
 
 @dataclass
@@ -188,7 +238,8 @@ class OutputVM:
     il_count: int
     output_dir: str
     rendered_rows: list[RenderedFileRow]
-    on_render: Callable[..., None]
+    on_render: Callable[..., Awaitable[None]]
+    on_cancel: Callable[[], None]
 
 
 @dataclass
@@ -236,6 +287,32 @@ class SaltRequisite:
     source_file: str
 
 
+@dataclass
+class SaltApplyStep:
+    """One state in the order a highstate would apply them."""
+
+    step: int
+    state: str  # "pkg: nginx"
+    function: str
+    name: str
+    waits_for: str  # states that must run first, comma separated
+    source_file: str
+    line: int
+    note: str  # explicit order, pulled forward, requisite loop
+
+
+@dataclass
+class SaltMinionRow:
+    """One minion and what the top files assign it."""
+
+    minion: str
+    grains_file: str
+    sls: str  # state SLS names in top-file order, comma separated
+    pillar: str
+    states: int  # states its highstate applies
+    missing: str  # SLS names no file provides
+
+
 @dataclass
 class SaltOverviewVM:
     """Full view-model for the Salt Overview page."""
@@ -246,6 +323,8 @@ class SaltOverviewVM:
     total_services: int
     total_files: int
     categories: list[SaltCategory]
-    requisites: list[SaltRequisite]
+    requisites: RowSet  # of SaltRequisite
+    apply_order: RowSet  # of SaltApplyStep
     unique_packages: list[str]  # deduplicated package names
     unique_services: list[str]  # deduplicated service names
+    minions: RowSet = field(default_factory=lambda: RowSet([]))  # of SaltMinionRow
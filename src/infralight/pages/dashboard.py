@@ -46,10 +46,10 @@ def _issues_panel(has_project: bool, issues: list[Issue]) -> None:
         if not issues:
             _issue("ok", "No issues found.")
         for iss in issues:
-            _issue(iss.level, iss.message)
+            _issue(iss.level, iss.message, iss.file, iss.line)
 
 
-def _issue(level: str, msg: str) -> None:
+def _issue(level: str, msg: str, file: str = "", line: int = 0) -> None:
     icons = {"ok": "check_circle", "info": "info", "warn": "warning", "error": "error"}
     colors = {
         "ok": "green-5",
@@ -60,6 +60,11 @@ def _issue(level: str, msg: str) -> None:
     with ui.row().classes("w-full items-center q-gutter-sm q-py-xs"):
         ui.icon(icons.get(level, "info"), color=colors.get(level, "grey-6"), size="xs")
         ui.label(msg).classes("text-body2 text-grey-4")
+        if file:
+            where = f"{file}:{line}" if line else file
+            ui.link(where, f"/editor?file={file}").classes(
+                "text-caption text-grey-6 font-mono"
+            )
 
 
 def _files_panel(rows, on_rescan) -> None:
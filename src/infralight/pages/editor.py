@@ -83,8 +83,8 @@ def render(ctrl: EditorController, *, initial_file: str = "") -> None:
                     on_click=lambda: _open_file(current_path["path"]),
                 ).props("flat dense no-caps color=grey-5 size=sm")
 
-                def _save() -> None:
-                    ctrl.save_file(current_path["path"], cm.value)
+                async def _save() -> None:
+                    await ctrl.save_file(current_path["path"], cm.value)
 
                 ui.button("Save", icon="save", on_click=_save).props(
                     "dense no-caps color=deep-purple-8 size=sm"
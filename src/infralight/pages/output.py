@@ -48,6 +48,9 @@ def _controls(vm: OutputVM) -> None:
             ui.button(
                 "Render All", icon="play_arrow", on_click=lambda: on_render(log_area)
             ).props("color=positive no-caps")
+            ui.button("Cancel", icon="stop", on_click=vm.on_cancel).props(
+                "flat no-caps color=negative"
+            )
             ui.button(
                 "Clear Log", icon="delete_sweep", on_click=lambda: log_area.clear()
             ).props("flat no-caps color=grey-6")
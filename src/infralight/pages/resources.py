@@ -67,7 +67,7 @@ def render(vm: ResourcesVM, on_select: Callable) -> None:
                 },
                 {"name": "line", "label": "Line", "field": "line"},
             ],
-            rows=rows_to_dicts(vm.rows),
+            rows=vm.rows,
             row_key="id",
             selection="single",
             on_select=on_select,
@@ -109,3 +109,17 @@ def render_detail(detail: TfDetail | None, container) -> None:
                 )
             else:
                 ui.label("No properties extracted.").classes("text-caption text-grey-7")
+
+        _links("Depends on", "call_made", detail.depends_on, "light-blue-9")
+        _links("Blast radius", "call_received", detail.impacted, "orange-9")
+
+
+def _links(title: str, icon: str, ids: list[str], color: str) -> None:
+    """Badge list of related resource ids — everything linked transitively."""
+    with panel(title, icon=icon, color=COLORS["terraform"], badge=str(len(ids))):
+        if not ids:
+            ui.label("Nothing.").classes("text-caption text-grey-7")
+            return
+        with ui.row().classes("q-gutter-xs"):
+            for rid in ids:
+                ui.badge(rid, color=color).props("outline").classes("text-caption")
@@ -6,21 +6,27 @@ module categories with their requisite dependencies.
 
 from __future__ import annotations
 
-from nicegui import ui
+from collections.abc import Callable
+from typing import Any
+
+from nicegui import run, ui
+from nicegui.events import ValueChangeEventArguments
 
 from infralight.components.data_table import data_table
 from infralight.components.empty_state import empty_state
 from infralight.components.panel import panel
 from infralight.components.stat_card import stat_card
+from infralight.models.tables import RowSet
 from infralight.models.viewmodels import (
     SaltCategory,
     SaltOverviewVM,
-    SaltRequisite,
     rows_to_dicts,
 )
 
 
-def render(vm: SaltOverviewVM) -> None:
+def render(
+    vm: SaltOverviewVM, on_minion: Callable[[str], RowSet] | None = None
+) -> None:
     """Render the full Salt Overview page."""
     if not vm.has_project:
         empty_state(
@@ -44,6 +50,12 @@ def render(vm: SaltOverviewVM) -> None:
         _category_tabs(vm.categories)
     if vm.requisites:
         _requisites_panel(vm.requisites)
+    if vm.minions:
+        _minions_panel(vm.minions)
+    if vm.apply_order:
+        _apply_order_panel(
+            vm.apply_order, [row["minion"] for row in vm.minions.rows], on_minion
+        )
 
 
 def _stats_row(vm: SaltOverviewVM) -> None:
@@ -106,7 +118,7 @@ def _category_tabs(categories: list[SaltCategory]) -> None:
 
 def _category_table(cat: SaltCategory) -> None:
     """Render the table for one module category."""
-    columns = [
+    columns: list[dict[str, Any]] = [
         {
             "name": "state_id",
             "label": "State ID",
@@ -149,12 +161,12 @@ def _category_table(cat: SaltCategory) -> None:
     )
 
 
-def _requisites_panel(requisites: list[SaltRequisite]) -> None:
+def _requisites_panel(requisites: RowSet) -> None:
     """Show a table of all state-to-state dependencies."""
     with panel(
         "State Dependencies", icon="link", color="#AB47BC", badge=str(len(requisites))
     ):
-        columns = [
+        columns: list[dict[str, Any]] = [
             {
                 "name": "from_state",
                 "label": "From State",
@@ -192,6 +204,116 @@ def _requisites_panel(requisites: list[SaltRequisite]) -> None:
         ]
         data_table(
             columns=columns,
-            rows=rows_to_dicts(requisites),
+            rows=requisites,
             row_key="from_state",
         )
+
+
+_APPLY_COLUMNS: list[dict[str, Any]] = [
+    {"name": "step", "label": "#", "field": "step", "sortable": True},
+    {
+        "name": "state",
+        "label": "State",
+        "field": "state",
+        "sortable": True,
+        "align": "left",
+    },
+    {
+        "name": "function",
+        "label": "Function",
+        "field": "function",
+        "align": "left",
+    },
+    {
+        "name": "waits_for",
+        "label": "Waits For",
+        "field": "waits_for",
+        "align": "left",
+    },
+    {
+        "name": "source_file",
+        "label": "Source",
+        "field": "source_file",
+        "sortable": True,
+        "align": "left",
+    },
+    {"name": "line", "label": "Line", "field": "line"},
+    {"name": "note", "label": "Note", "field": "note", "align": "left"},
+]
+
+
+def _apply_order_panel(
+    steps: RowSet,
+    minions: list[str],
+    on_minion: Callable[[str], RowSet] | None,
+) -> None:
+    """Show the order a highstate would apply the states in."""
+    with panel(
+        "Apply Order",
+        icon="format_list_numbered",
+        color="#26A69A",
+        badge=str(len(steps)),
+    ):
+        with ui.row().classes("w-full items-center q-gutter-sm q-mb-sm"):
+            ui.label(
+                "Definition order, adjusted by order: options and requisites — "
+                "required states run first."
+            ).classes("text-caption text-grey-6")
+            ui.space()
+            if minions and on_minion:
+                picker = (
+                    ui.select(
+                        {"": "All states", **{m: m for m in minions}},
+                        value="",
+                        label="Highstate of",
+                    )
+                    .props("dense outlined dark")
+                    .classes("w-48")
+                )
+        table_box = ui.column().classes("w-full")
+        with table_box:
+            data_table(columns=_APPLY_COLUMNS, rows=steps, row_key="step")
+
+        if minions and on_minion:
+
+            async def _pick(e: ValueChangeEventArguments[str]) -> None:
+                rows = await run.io_bound(on_minion, e.value) if e.value else None
+                table_box.clear()
+                with table_box:
+                    data_table(
+                        columns=_APPLY_COLUMNS,
+                        rows=steps if rows is None else rows,
+                        row_key="step",
+                    )
+
+            picker.on_value_change(_pick)
+
+
+def _minions_panel(minions: RowSet) -> None:
+    """Show what top.sls assigns each minion, from its grains file."""
+    with panel("Minions", icon="dns", color="#5C6BC0", badge=str(len(minions))):
+        columns: list[dict[str, Any]] = [
+            {
+                "name": "minion",
+                "label": "Minion",
+                "field": "minion",
+                "sortable": True,
+                "align": "left",
+            },
+            {"name": "sls", "label": "State SLS", "field": "sls", "align": "left"},
+            {"name": "states", "label": "States", "field": "states", "sortable": True},
+            {
+                "name": "missing",
+                "label": "Missing SLS",
+                "field": "missing",
+                "align": "left",
+            },
+            {"name": "pillar", "label": "Pillar", "field": "pillar", "align": "left"},
+            {
+                "name": "grains_file",
+                "label": "Grains",
+                "field": "grains_file",
+                "align": "left",
+            },
+        ]
+        data_table(columns=columns, rows=minions, row_key="minion")
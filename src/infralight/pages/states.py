@@ -59,7 +59,7 @@ def render(vm: StatesVM, on_select: Callable) -> None:
                     "align": "left",
                 },
             ],
-            rows=rows_to_dicts(vm.rows),
+            rows=vm.rows,
             row_key="path",
             selection="single",
             on_select=on_select,
@@ -6,13 +6,21 @@ Three tabs: Terraform, Salt, and IL Decorators.
 
 from __future__ import annotations
 
-from nicegui import ui
+from collections.abc import Callable
+
+from nicegui import background_tasks, run, ui
+from nicegui.events import ValueChangeEventArguments
 
 from infralight.components.data_table import data_table
 from infralight.components.empty_state import empty_state
 from infralight.components.panel import panel
 from infralight.components.theme import COLORS
-from infralight.models.viewmodels import InfraVisVM, VisVM, rows_to_dicts
+from infralight.models.viewmodels import (
+    InfraVisVM,
+    VisSectionVM,
+    VisVM,
+    rows_to_dicts,
+)
 
 
 def render(vm: InfraVisVM) -> None:
@@ -27,25 +35,39 @@ def render(vm: InfraVisVM) -> None:
         ui.tab("salt", label="Salt", icon="terminal")
         ui.tab("il", label="IL Decorators", icon="auto_fix_high")
 
-    with ui.tab_panels(tabs, value="terraform").classes("w-full"):
-        with ui.tab_panel("terraform"):
-            _graph_section(
-                vm.tf_graph,
-                "Terraform Graph",
-                "Auto-generated from Terraform resources and references",
-            )
-        with ui.tab_panel("salt"):
-            _graph_section(
-                vm.salt_graph,
-                "Salt Graph",
-                "Auto-generated from Salt states and requisites",
-            )
-        with ui.tab_panel("il"):
-            _graph_section(
-                vm.il_graph,
-                "IL Decorator Graph",
-                "Only nodes and edges declared via il_node / il_edge decorators",
-            )
+    sections = {
+        "terraform": (
+            vm.tf_graph,
+            "Terraform Graph",
+            "Auto-generated from Terraform resources and references",
+        ),
+        "salt": (
+            vm.salt_graph,
+            "Salt Graph",
+            "Auto-generated from Salt states and requisites",
+        ),
+        "il": (
+            vm.il_graph,
+            "IL Decorator Graph",
+            "Only nodes and edges declared via il_node / il_edge decorators",
+        ),
+    }
+    with ui.tab_panels(tabs, value="terraform").classes("w-full") as tab_panels:
+        panels = {name: ui.tab_panel(name) for name in sections}
+
+    # Tab contents are built on first activation, so only the visible
+    # graph is sent to (and laid out by) the browser.
+    built: set[str] = set()
+
+    def _show(name: str) -> None:
+        if name in built or name not in sections:
+            return
+        built.add(name)
+        with panels[name]:
+            _graph_section(*sections[name])
+
+    _show("terraform")
+    tab_panels.on_value_change(lambda e: _show(e.value))
 
 
 def _graph_section(vm: VisVM, title: str, subtitle: str) -> None:
@@ -66,90 +88,198 @@ def _graph_panel(vm: VisVM, title: str, subtitle: str) -> None:
             )
             return
 
-        # Mermaid diagram — let NiceGUI render it, then wrap in panzoom
-        cid = f"mermaid-zoom-{id(vm)}"
-        zoom_in = f"window._mzZoom('{cid}', 1.3)"
-        zoom_out = f"window._mzZoom('{cid}', 0.7)"
-        reset = f"window._mzReset('{cid}')"
-        ui.html(
-            f'<div id="{cid}" class="mermaid-zoom-container">'
-            '<div class="mermaid-zoom-controls">'
-            f'<button onclick="{zoom_in}" title="Zoom in">+</button>'
-            f'<button onclick="{zoom_out}" title="Zoom out">&minus;</button>'
-            f'<button onclick="{reset}" title="Reset">&#8634;</button>'
-            "</div>"
-            '<div class="mermaid-zoom-inner"></div>'
-            "</div>"
-        ).classes("w-full q-pa-sm")
-
-        # Hidden NiceGUI mermaid element — once it renders, move its SVG
-        # into our zoom container and attach panzoom.
-        m_el = ui.mermaid(vm.mermaid).classes("hidden")
-        nicegui_id = f"c{m_el.id}"
-
-        # Repeating timer — hidden tabs aren't in the DOM until
-        # the user switches to them, so we keep checking until the
-        # SVG appears.  The ``dataset.rendered`` guard makes repeat
-        # ticks effectively free.
-        ui.timer(
-            1.0,
-            lambda cid=cid, nid=nicegui_id: ui.run_javascript(f"""
-            (function() {{
-                const wrap = document.getElementById('{cid}');
-                const src  = document.getElementById('{nid}');
-                if (!wrap || !src) return;
-                const inner = wrap.querySelector('.mermaid-zoom-inner');
-                if (!inner || inner.dataset.rendered) return;
-
-                const svg = src.querySelector('svg');
-                if (!svg) return;
-                inner.dataset.rendered = '1';
-
-                // Move the rendered SVG into our zoom container
-                inner.appendChild(svg.cloneNode(true));
-                const cloned = inner.querySelector('svg');
-                if (cloned) {{
-                    cloned.removeAttribute('height');
-                    cloned.style.height = 'auto';
-                    cloned.style.minHeight = '600px';
-                    cloned.style.maxHeight = 'none';
-                }}
-
-                // Attach panzoom
-                if (typeof panzoom !== 'undefined') {{
-                    const pz = panzoom(inner, {{
-                        maxZoom: 5, minZoom: 0.2, smoothScroll: false,
-                        bounds: true, boundsPadding: 0.3
-                    }});
-                    wrap._pz = pz;
-                }}
-            }})();
-
-            // Global helpers for zoom buttons
-            window._mzZoom = window._mzZoom || function(id, factor) {{
-                const w = document.getElementById(id);
-                if (w && w._pz) {{
-                    const cx = w.offsetWidth / 2, cy = w.offsetHeight / 2;
-                    w._pz.smoothZoom(cx, cy, factor);
-                }}
-            }};
-            window._mzReset = window._mzReset || function(id) {{
-                const w = document.getElementById(id);
-                if (w && w._pz) {{ w._pz.moveTo(0, 0); w._pz.zoomAbs(0, 0, 1); }}
-            }};
-        """),
+        def _show(result: VisSectionVM | None) -> None:
+            full.set_visibility(result is None)
+            focus_box.clear()
+            if result is not None:
+                with focus_box:
+                    ui.label(f"{result.label}  ·  {result.count} nodes").classes(
+                        "text-caption text-grey-7"
+                    )
+                    cid = f"mermaid-zoom-focus-{id(result)}"
+                    _diagram(result.mermaid, result.svg, cid, result.digest)
+
+        if vm.on_focus is not None:
+            _focus_bar(vm, vm.on_focus, _show)
+        focus_box = ui.column().classes("w-full")
+        full = ui.column().classes("w-full")
+        with full:
+            if vm.echart is not None:
+                ui.label(
+                    f"{len(vm.nodes)} nodes — drawn on canvas. Click a legend entry "
+                    "to hide a group, or expand a group below for its diagram."
+                ).classes("text-caption text-grey-7 q-mb-sm")
+                ui.echart(vm.echart).classes("w-full").style("height: 700px")
+            else:
+                if vm.summarized:
+                    ui.label(
+                        f"{len(vm.nodes)} nodes — showing one node per group. "
+                        "Expand a group below to draw its nodes."
+                    ).classes("text-caption text-warning q-mb-sm")
+                _diagram(vm.mermaid, vm.svg, f"mermaid-zoom-{id(vm)}", vm.digest)
+
+            with ui.row().classes("w-full items-center q-mt-sm"):
+                ui.label(
+                    f"Layout: {vm.layout}  ·  {len(vm.nodes)} nodes  ·  "
+                    f"{len(vm.edges)} edges  ·  {len(vm.groups)} groups"
+                ).classes("text-caption text-grey-7")
+                ui.space()
+                code = vm.mermaid
+                ui.button(
+                    "Copy Mermaid", icon="content_copy", on_click=lambda: _copy(code)
+                ).props("flat dense size=sm color=grey-6")
+
+            for section in vm.sections:
+                _section(section)
+
+
+def _focus_bar(
+    vm: VisVM,
+    on_focus: Callable[..., VisSectionVM],
+    show: Callable[[VisSectionVM | None], None],
+) -> None:
+    """Focus mode — draw only a neighbourhood or a filtered part."""
+    names = sorted({row["label"] or row["id"] for row in vm.nodes.rows})
+    with ui.row().classes("w-full items-center q-gutter-sm q-mb-sm"):
+        target = (
+            ui.input("Focus on", autocomplete=names)
+            .props("dense outlined dark clearable")
+            .classes("w-64")
+        )
+        hops = (
+            ui.select({1: "1", 2: "2", 3: "3", 4: "4", 0: "All"}, value=2, label="Hops")
+            .props("dense outlined dark")
+            .classes("w-20")
+        )
+        direction = (
+            ui.select(
+                {"both": "Both ways", "out": "Dependencies", "in": "Dependents"},
+                value="both",
+                label="Direction",
+            )
+            .props("dense outlined dark")
+            .classes("w-36")
+        )
+        filters: dict[str, list[str] | dict[str, str]] = {
+            "groups": {g.id: g.label or g.id for g in vm.groups},
+            "providers": vm.providers,
+            "modules": vm.modules,
+        }
+        selects = {
+            name: ui.select(options, multiple=True, label=name.title(), value=[])
+            .props("dense outlined dark use-chips clearable")
+            .classes("w-48")
+            for name, options in filters.items()
+            if options
+        }
+
+        async def _apply() -> None:
+            chosen = {name: list(sel.value or []) for name, sel in selects.items()}
+            if not (target.value or any(chosen.values())):
+                show(None)
+                return
+            result = await run.io_bound(
+                on_focus,
+                focus=target.value or "",
+                hops=hops.value,
+                direction=direction.value,
+                **chosen,
+            )
+            if result is None:
+                return
+            if not result.count:
+                ui.notify("No matching nodes", type="warning", position="bottom")
+                return
+            show(result)
+
+        def _clear() -> None:
+            target.value = ""
+            for sel in selects.values():
+                sel.value = []
+            show(None)
+
+        target.on("keydown.enter", _apply)
+        ui.button("Focus", icon="filter_center_focus", on_click=_apply).props(
+            "dense color=primary"
+        )
+        ui.button("Full graph", on_click=_clear).props("flat dense color=grey-6")
+
+
+def _frame(cid: str, body: str = "") -> str:
+    """Zoom container markup around *body*."""
+    zoom_in = f"window._mzZoom('{cid}', 1.3)"
+    zoom_out = f"window._mzZoom('{cid}', 0.7)"
+    reset = f"window._mzReset('{cid}')"
+    return (
+        f'<div id="{cid}" class="mermaid-zoom-container">'
+        '<div class="mermaid-zoom-controls">'
+        f'<button onclick="{zoom_in}" title="Zoom in">+</button>'
+        f'<button onclick="{zoom_out}" title="Zoom out">&minus;</button>'
+        f'<button onclick="{reset}" title="Reset">&#8634;</button>'
+        "</div>"
+        f'<div class="mermaid-zoom-inner">{body}</div>'
+        "</div>"
+    )
+
+
+def _diagram(mermaid: str, svg: str, cid: str, digest: str) -> None:
+    """Zoomable diagram — the pre-positioned *svg* if given, else Mermaid.
+
+    The browser keeps recently drawn diagrams by *digest*; on a hit
+    neither the source nor the SVG is sent again.
+    """
+    # Trusted markup: built here and by core.layout, labels escaped
+    frame = ui.html(_frame(cid), sanitize=False).classes("w-full q-pa-sm")
+    holder = ui.element()
+    background_tasks.create(
+        _deliver(frame, holder, cid, digest, mermaid, svg), name="vis-diagram"
+    )
+
+
+async def _deliver(
+    frame: ui.html, holder: ui.element, cid: str, digest: str, mermaid: str, svg: str
+) -> None:
+    client = frame.client
+    try:
+        # Checks the browser cache and mounts from it in one call
+        hit = await client.run_javascript(
+            f"window._mzMountCached('{cid}', '{digest}')", timeout=2.0
         )
+    except TimeoutError:
+        hit = False
+    if hit or frame.is_deleted:
+        return
+    if svg:
+        frame.set_content(_frame(cid, svg))
+        client.run_javascript(f"window._mzMount('{cid}', null, '{digest}')")
+        return
+
+    # Hidden NiceGUI mermaid element — once it renders, the browser moves
+    # its SVG into our zoom container and attaches panzoom, triggered by
+    # the render itself — no server round-trips after that.
+    with holder:
+        m_el = ui.mermaid(mermaid).classes("hidden")
+    client.run_javascript(f"window._mzMount('{cid}', 'c{m_el.id}', '{digest}')")
+
+
+def _section(section: VisSectionVM) -> None:
+    """One group of a summarised graph, drawn on first expansion."""
+    with ui.expansion(
+        f"{section.label}  ·  {section.count} nodes", icon="unfold_more"
+    ).classes("w-full") as exp:
+        body = ui.column().classes("w-full")
+
+    def _open(e: ValueChangeEventArguments[bool]) -> None:
+        if e.value and not body.default_slot.children:
+            with body:
+                _diagram(
+                    section.mermaid,
+                    section.svg,
+                    f"mermaid-zoom-{id(section)}",
+                    section.digest,
+                )
 
-        with ui.row().classes("w-full items-center q-mt-sm"):
-            ui.label(
-                f"Layout: {vm.layout}  ·  {len(vm.nodes)} nodes  ·  "
-                f"{len(vm.edges)} edges  ·  {len(vm.groups)} groups"
-            ).classes("text-caption text-grey-7")
-            ui.space()
-            code = vm.mermaid
-            ui.button(
-                "Copy Mermaid", icon="content_copy", on_click=lambda: _copy(code)
-            ).props("flat dense size=sm color=grey-6")
+    exp.on_value_change(_open)
 
 
 def _copy(text: str) -> None:
@@ -173,23 +303,26 @@ def _tables(vm: VisVM) -> None:
                                 "name": "id",
                                 "label": "ID",
                                 "field": "id",
+                                "sortable": True,
                                 "align": "left",
                             },
                             {
                                 "name": "label",
                                 "label": "Label",
                                 "field": "label",
+                                "sortable": True,
                                 "align": "left",
                             },
                             {
                                 "name": "group",
                                 "label": "Group",
                                 "field": "group",
+                                "sortable": True,
                                 "align": "left",
                             },
                             {"name": "icon", "label": "Icon", "field": "icon"},
                         ],
-                        rows=rows_to_dicts(vm.nodes),
+                        rows=vm.nodes,
                         row_key="id",
                     )
                 else:
@@ -209,23 +342,26 @@ def _tables(vm: VisVM) -> None:
                                 "name": "src",
                                 "label": "From",
                                 "field": "src",
+                                "sortable": True,
                                 "align": "left",
                             },
                             {
                                 "name": "tgt",
                                 "label": "To",
                                 "field": "tgt",
+                                "sortable": True,
                                 "align": "left",
                             },
                             {
                                 "name": "label",
                                 "label": "Label",
                                 "field": "label",
+                                "sortable": True,
                                 "align": "left",
                             },
                             {"name": "style", "label": "Style", "field": "style"},
                         ],
-                        rows=rows_to_dicts(vm.edges),
+                        rows=vm.edges,
                         row_key="src",
                     )
                 else:
@@ -0,0 +1,47 @@
+"""Unit tests for the ECharts graph option."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from infralight.core.echarts import graph_option
+
+
+def _series(data: dict[str, Any]) -> dict[str, Any]:
+    return graph_option(data)["series"][0]
+
+
+def test_nodes_keyed_by_id_and_labels_may_repeat() -> None:
+    series = _series(
+        {
+            "nodes": [
+                {"id": "salt_a_pkg", "label": "nginx", "group": "web"},
+                {"id": "salt_b_pkg", "label": "nginx", "group": "proxy"},
+                {"id": "salt_a_pkg", "label": "duplicate"},
+            ],
+            "edges": [
+                {"from": "salt_b_pkg", "to": "salt_a_pkg", "style": "dashed"},
+                {"from": "salt_b_pkg", "to": "nowhere", "style": "solid"},
+            ],
+            "groups": [{"id": "web", "label": "Web"}, {"id": "proxy"}],
+        }
+    )
+    assert [(n["id"], n["name"]) for n in series["data"]] == [
+        ("salt_a_pkg", "nginx"),
+        ("salt_b_pkg", "nginx"),
+    ]
+    assert series["links"] == [
+        {
+            "source": "salt_b_pkg",
+            "target": "salt_a_pkg",
+            "lineStyle": {"type": "dashed"},
+        }
+    ]
+    assert [c["name"] for c in series["categories"]] == ["Web", "proxy"]
+
+
+def test_ungrouped_nodes_get_their_own_category() -> None:
+    series = _series({"nodes": [{"id": "x"}], "edges": [], "groups": []})
+    assert series["categories"] == [{"name": "(ungrouped)"}]
+    assert series["data"][0]["name"] == "x"
+    assert series["data"][0]["category"] == 0
@@ -0,0 +1,100 @@
+"""Unit tests for template resolution and the dependency graph."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from infralight.core.environment import ProjectEnvironment
+from infralight.core.models import FileKind, FileType, SourceFile
+
+FILES = {
+    "macros/common.j2": (
+        "{% macro pkg(name) %}{{ name }}:\n  pkg.installed: []{% endmacro %}\n"
+    ),
+    "macros/helpers.j2": (
+        '{% import "./common.j2" as c %}'
+        "{% macro both(a, b) %}{{ c.pkg(a) }}\n{{ c.pkg(b) }}{% endmacro %}\n"
+    ),
+    "salt/web/site.il.sls": (
+        '{% import "../../macros/helpers.j2" as h %}{{ h.both("nginx", "curl") }}\n'
+    ),
+    "salt/db.il.sls": (
+        '{% from "macros/common.j2" import pkg %}{{ pkg("postgres") }}\n'
+        '{% include "./snippet.sls" %}'
+    ),
+    "salt/snippet.sls": "# snippet\n",
+    "salt/plain.il.sls": "plain:\n  cmd.run: []\n",
+}
+SITE, DB, PLAIN = "salt/web/site.il.sls", "salt/db.il.sls", "salt/plain.il.sls"
+
+
+@pytest.fixture
+def penv(tmp_path: Path) -> ProjectEnvironment:
+    for rel, text in FILES.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return ProjectEnvironment(tmp_path)
+
+
+def _sf(penv: ProjectEnvironment, rel: str) -> SourceFile:
+    path = penv.root / rel
+    return SourceFile(path, FileType.SALTSTACK, FileKind.IL, path.read_text())
+
+
+def test_join_path_resolves_relative_names(penv: ProjectEnvironment) -> None:
+    env = penv.env
+    assert env.join_path("./a.j2", "x/y/t.sls") == "x/y/a.j2"
+    assert env.join_path("../a.j2", "x/y/t.sls") == "x/a.j2"
+    assert env.join_path("../../m/a.j2", "x/y/t.sls") == "m/a.j2"
+    assert env.join_path("m/a.j2", "x/y/t.sls") == "m/a.j2"
+
+
+def test_relative_and_root_relative_references_render(
+    penv: ProjectEnvironment,
+) -> None:
+    site = penv.get_template(_sf(penv, SITE)).render()
+    assert site == "nginx:\n  pkg.installed: []\ncurl:\n  pkg.installed: []\n"
+    db = penv.get_template(_sf(penv, DB)).render()
+    assert db == "postgres:\n  pkg.installed: []\n# snippet\n"
+
+
+def test_dependencies_and_dependents(penv: ProjectEnvironment) -> None:
+    assert penv.dependencies(SITE) == {"macros/helpers.j2", "macros/common.j2"}
+    assert penv.dependencies(DB) == {"macros/common.j2", "salt/snippet.sls"}
+    assert penv.dependencies(PLAIN) == frozenset()
+    assert penv.dependents("macros/common.j2") == {SITE, DB, "macros/helpers.j2"}
+    assert penv.dependents("macros/helpers.j2") == {SITE}
+    assert penv.dependents("salt/snippet.sls") == {DB}
+    assert penv.dependents(PLAIN) == set()
+
+
+def test_editing_a_macro_changes_only_its_dependents(
+    penv: ProjectEnvironment,
+) -> None:
+    names = (SITE, DB, PLAIN)
+    before = {n: penv.fingerprint(n) for n in names}
+    assert None not in before.values()
+
+    (penv.root / "macros/helpers.j2").write_text(
+        FILES["macros/helpers.j2"] + "{# edited #}\n"
+    )
+    after = {n: penv.fingerprint(n) for n in names}
+    assert [n for n in names if after[n] != before[n]] == [SITE]
+
+    (penv.root / "macros/common.j2").write_text("{% macro pkg(name) %}{% endmacro %}")
+    again = {n: penv.fingerprint(n) for n in names}
+    assert [n for n in names if again[n] != after[n]] == [SITE, DB]
+    assert penv.dependency_hashes(DB) is not None
+
+
+def test_dynamic_references_have_no_fingerprint(penv: ProjectEnvironment) -> None:
+    (penv.root / "salt/dyn.il.sls").write_text(
+        '{% set name = "salt/snippet.sls" %}{% include name %}'
+    )
+    assert penv.dependency_hashes("salt/dyn.il.sls") is None
+    assert penv.fingerprint("salt/dyn.il.sls") is None
+    (penv.root / "macros/common.j2").write_text('{% include "x" ~ "y" %}')
+    assert penv.fingerprint(SITE) is None  # dynamic anywhere in the chain
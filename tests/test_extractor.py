@@ -0,0 +1,93 @@
+"""Unit tests for static decorator extraction."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from infralight.core.decorators import begin_collect, end_collect
+from infralight.core.environment import get_environment
+from infralight.core.extractor import extract_static
+from infralight.core.models import FileKind, FileType, SourceFile, Visualization
+
+_STATIC = """\
+{{ il_group("web", "Web tier") }}
+{{ il_node("nginx", "Nginx", group="web", ports=[80, 443]) }}
+
+nginx:
+  pkg.installed: []
+{{ il_node("redis", color="#FF0000", weight=-1) }}
+{{ il_edge("nginx", "redis", label="cache", style="dashed") }}
+{{ il_note("two nodes", target="nginx") }}
+"""
+
+
+def _write(root: Path, name: str, text: str) -> SourceFile:
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return SourceFile(path, FileType.SALTSTACK, FileKind.IL, text)
+
+
+def _rendered(sf: SourceFile, root: Path) -> Visualization:
+    begin_collect(str(sf.path))
+    try:
+        get_environment(root).get_template(sf).render()
+    finally:
+        vis = end_collect()
+    return vis
+
+
+def test_top_level_literal_calls_are_extracted(tmp_path: Path) -> None:
+    sf = _write(tmp_path, "web.il.sls", _STATIC)
+    vis = extract_static(sf, get_environment(tmp_path))
+    assert vis is not None
+    assert [(n.id, n.label, n.group, n.source_line) for n in vis.nodes] == [
+        ("nginx", "Nginx", "web", 2),
+        ("redis", "redis", None, 6),
+    ]
+    assert all(n.source_file == str(sf.path) for n in vis.nodes)
+    assert vis.nodes[0].meta == {"ports": [80, 443]}
+    assert vis.nodes[1].meta == {"weight": -1}
+    assert [(e.source, e.target, e.label, e.style) for e in vis.edges] == [
+        ("nginx", "redis", "cache", "dashed")
+    ]
+    assert [g.label for g in vis.groups] == ["Web tier"]
+    assert [n.target for n in vis.notes] == ["nginx"]
+    # Same graph as rendering, which doesn't know the lines
+    vis.nodes = [replace(n, source_line=0) for n in vis.nodes]
+    assert vis == _rendered(sf, tmp_path)
+
+
+def test_template_without_decorators_is_an_empty_graph(tmp_path: Path) -> None:
+    sf = _write(tmp_path, "plain.il.sls", "nginx:\n  pkg.installed: []\n")
+    assert extract_static(sf, get_environment(tmp_path)) == Visualization()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{% if true %}{{ il_node("a") }}{% endif %}\n',
+        '{% for n in ["a", "b"] %}{{ il_node(n) }}{% endfor %}\n',
+        '{% macro m() %}{{ il_node("a") }}{% endmacro %}{{ m() }}\n',
+        '{% set f = il_node %}{{ f("a") }}\n',
+        '{{ il_node("a") if true }}\n',
+        '{% set name = "a" %}{{ il_node(name) }}\n',
+        '{{ il_node("a" ~ "b") }}\n',
+        '{{ il_node("a", label="x" | upper) }}\n',
+        '{{ il_node(*["a"]) }}\n',
+        '{{ il_node(**{"id": "a"}) }}\n',
+        '{{ il_node("a", nope=range(3)) }}\n',
+        "{{ il_node() }}\n",  # the call itself raises
+        "{{ il_node( }}\n",  # syntax error
+        '{% include "other.sls" %}\n{{ il_node("a") }}\n',
+        '{% import "macros.j2" as m %}\n{{ il_node("a") }}\n',
+        '{% from "macros.j2" import x %}\n{{ il_node("a") }}\n',
+        '{% extends "base.j2" %}\n',
+    ],
+)
+def test_dynamic_templates_fall_back_to_rendering(tmp_path: Path, text: str) -> None:
+    sf = _write(tmp_path, "dyn.il.sls", text)
+    assert extract_static(sf, get_environment(tmp_path)) is None
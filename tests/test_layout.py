@@ -0,0 +1,165 @@
+"""Unit tests for the layered layout, its cache and its SVG."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from infralight.core import layout as layout_mod
+from infralight.core.layout import (
+    GraphLayout,
+    NodeBox,
+    cached_layout,
+    graph_key,
+    layered_layout,
+    to_svg,
+)
+from infralight.core.models import VisEdge, VisGroup, VisNode, Visualization
+
+
+def _random_graph(seed: int, groups: int) -> Visualization:
+    rnd = random.Random(seed)
+    n = rnd.randint(1, 40)
+    gs = [VisGroup(f"g{i}", f"Group {i}") for i in range(groups)]
+    nodes = [
+        VisNode(
+            f"n{i}",
+            f"node {i}",
+            group=f"g{rnd.randrange(groups)}"
+            if groups and rnd.random() < 0.8
+            else None,
+        )
+        for i in range(n)
+    ]
+    edges = [
+        VisEdge(f"n{rnd.randrange(n)}", f"n{rnd.randrange(n)}")
+        for _ in range(rnd.randint(0, 60))
+    ]
+    return Visualization(nodes, edges, gs)
+
+
+def _overlap(a: NodeBox, b: NodeBox) -> bool:
+    return abs(a.x - b.x) < (a.w + b.w) / 2 and abs(a.y - b.y) < (a.h + b.h) / 2
+
+
+def _inside(a: NodeBox, b: NodeBox) -> bool:
+    return (
+        b.x - b.w / 2 <= a.x - a.w / 2
+        and a.x + a.w / 2 <= b.x + b.w / 2
+        and b.y - b.h / 2 <= a.y - a.h / 2
+        and a.y + a.h / 2 <= b.y + b.h / 2
+    )
+
+
+def test_edges_point_down_a_chain() -> None:
+    vis = Visualization(
+        [VisNode("a"), VisNode("b"), VisNode("c")],
+        [VisEdge("a", "b"), VisEdge("b", "c"), VisEdge("a", "c")],
+    )
+    lay = layered_layout(vis)
+    assert lay.nodes["a"].y < lay.nodes["b"].y < lay.nodes["c"].y
+    assert set(lay.edges) == {0, 1, 2}
+    assert len(lay.edges[2]) == 3  # a → c passes a dummy on b's rank
+    assert lay.groups == {}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_nodes_never_overlap(seed: int) -> None:
+    vis = _random_graph(seed, groups=0)
+    lay = layered_layout(vis)
+    boxes = list(lay.nodes.values())
+    assert len(boxes) == len({n.id for n in vis.nodes})
+    for i, a in enumerate(boxes):
+        assert a.x - a.w / 2 >= 0 and a.x + a.w / 2 <= lay.width
+        for b in boxes[:i]:
+            assert not _overlap(a, b)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_group_boxes_hold_their_nodes_only(seed: int) -> None:
+    vis = _random_graph(seed, groups=4)
+    lay = layered_layout(vis)
+    for node in vis.nodes:
+        box = lay.nodes[node.id]
+        for gid, group in lay.groups.items():
+            if gid == node.group:
+                assert _inside(box, group)
+            else:
+                assert not _overlap(box, group)
+    groups = list(lay.groups.values())
+    for i, a in enumerate(groups):
+        assert a.y - a.h / 2 >= 0 and a.x + a.w / 2 <= lay.width
+        assert a.y + a.h / 2 <= lay.height
+        for b in groups[:i]:
+            assert not _overlap(a, b)
+
+
+def test_layout_json_round_trip() -> None:
+    lay = layered_layout(_random_graph(3, groups=3))
+    assert GraphLayout.from_json(json.loads(json.dumps(lay.to_json()))) == lay
+
+
+def test_graph_key_changes_with_groups() -> None:
+    a = Visualization([VisNode("x", group="g")], [], [VisGroup("g")])
+    b = Visualization([VisNode("x")], [], [VisGroup("g")])
+    assert graph_key(a) != graph_key(b)
+
+
+def test_svg_draws_group_boxes() -> None:
+    vis = Visualization(
+        [VisNode("a", "A & co", group="web"), VisNode("b")],
+        [VisEdge("a", "b", label="require")],
+        [VisGroup("web", "Web <tier>", color="#123456")],
+    )
+    svg = to_svg(vis, layered_layout(vis))
+    assert svg.count('class="il-group"') == 1
+    assert "Web &lt;tier&gt;" in svg
+    assert "A &amp; co" in svg
+    assert svg.index("il-group") < svg.index("il-node")  # drawn underneath
+
+
+def test_cache_keeps_recently_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(layout_mod, "_MAX_CACHED", 2)
+    graphs = [Visualization([VisNode(f"n{i}")]) for i in range(3)]
+    directory = tmp_path / "layout"
+
+    cached_layout(graphs[0], tmp_path)
+    cached_layout(graphs[1], tmp_path)
+    old = directory / f"{graph_key(graphs[0])}.json"
+    os.utime(old, (1, 1))
+    os.utime(directory / f"{graph_key(graphs[1])}.json", (2, 2))
+
+    assert cached_layout(graphs[0], tmp_path) == layered_layout(graphs[0])
+    assert old.stat().st_mtime > 2  # a hit counts as a use
+    cached_layout(graphs[2], tmp_path)
+    assert sorted(p.name for p in directory.iterdir()) == sorted(
+        f"{graph_key(g)}.json" for g in (graphs[0], graphs[2])
+    )
+
+
+def test_duplicates_are_laid_out_and_drawn_once() -> None:
+    dup = Visualization(
+        [VisNode("a", "first", group="g"), VisNode("b"), VisNode("a", "second")],
+        [VisEdge("a", "b"), VisEdge("a", "b"), VisEdge("b", "a", label="x")],
+        [VisGroup("g", "Group"), VisGroup("g", "Other")],
+    )
+    clean = Visualization(
+        [VisNode("a", "first", group="g"), VisNode("b")],
+        [VisEdge("a", "b"), VisEdge("b", "a", label="x")],
+        [VisGroup("g", "Group")],
+    )
+    assert graph_key(dup) == graph_key(clean)
+    lay = layered_layout(dup)
+    assert lay == layered_layout(clean)
+    svg = to_svg(dup, lay)
+    assert svg == to_svg(clean, lay)
+    assert svg.count('class="il-node"') == 2
+    assert svg.count("<polyline") == 2
+    assert "first" in svg and "second" not in svg
+    assert "Other" not in svg
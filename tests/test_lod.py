@@ -0,0 +1,124 @@
+"""Unit tests for graph summaries and per-group splits."""
+
+from __future__ import annotations
+
+import copy
+
+from infralight.controllers.vis_controller import VisController
+from infralight.core.lod import split_by_group, summarize, summary_id
+from infralight.core.models import VisEdge, VisGroup, VisNode, Visualization
+from infralight.core.query import GraphIndex
+from infralight.models.state import AppState
+from infralight.models.viewmodels import VisVM
+
+
+def _graph() -> Visualization:
+    return Visualization(
+        nodes=[
+            VisNode("w1", group="web"),
+            VisNode("w2", group="web"),
+            VisNode("w3", group="web"),
+            VisNode("d1", group="db"),
+            VisNode("d2", group="db"),
+            VisNode("u"),
+            VisNode("x", group="ghost"),  # undeclared group: stays a node
+        ],
+        edges=[
+            VisEdge("w1", "w2"),
+            VisEdge("w1", "d1", label="sql"),
+            VisEdge("w2", "d1", label="sql"),
+            VisEdge("w3", "d2", label="cache"),
+            VisEdge("u", "w1"),
+            VisEdge("x", "u", label="uses"),
+            VisEdge("d1", "d1"),
+            VisEdge("w1", "d2", style="dashed"),
+        ],
+        groups=[VisGroup("web", "Web", color="#111111"), VisGroup("db")],
+    )
+
+
+def _edges(vis: Visualization) -> list[tuple[str, str, str, str]]:
+    return [(e.source, e.target, e.label, e.style) for e in vis.edges]
+
+
+def test_summarize_collapses_every_group() -> None:
+    vis = _graph()
+    before = copy.deepcopy(vis)
+    out = summarize(vis)
+
+    assert vis == before  # the input is left alone
+    assert [n.id for n in out.nodes] == [summary_id("web"), summary_id("db"), "u", "x"]
+    web = out.node(summary_id("web"))
+    assert web is not None
+    assert (web.label, web.color, web.shape) == ("Web (3)", "#111111", "group")
+    assert web.meta == {"group": "web", "count": 3}
+    assert out.groups == []
+
+
+def test_summary_edges_are_rerouted_and_merged() -> None:
+    vis = _graph()
+    out = summarize(vis)
+    web, db = summary_id("web"), summary_id("db")
+    assert _edges(out) == [
+        (web, db, "sql/cache x3", "solid"),
+        ("u", web, "", "solid"),
+        ("x", "u", "uses", "solid"),
+        (web, db, "", "dashed"),
+    ]
+    assert [e.meta.get("weight") for e in out.edges] == [3, 1, None, 1]
+    assert out.edges[2] is vis.edges[5]  # untouched edges are reused
+
+
+def test_summary_labels_many_kinds_as_mixed() -> None:
+    vis = Visualization(
+        [VisNode("a", group="g"), VisNode("b")],
+        [VisEdge("a", "b", label=lbl) for lbl in ("x", "y", "z")],
+        [VisGroup("g")],
+    )
+    assert _edges(summarize(vis)) == [(summary_id("g"), "b", "mixed x3", "solid")]
+
+
+def test_split_by_group() -> None:
+    parts = split_by_group(_graph())
+    assert list(parts) == ["web", "db"]
+
+    web = parts["web"]
+    assert [n.id for n in web.nodes] == ["w1", "w2", "w3", "d1", "d2", "u"]
+    assert [g.id for g in web.groups] == ["web", "db"]
+    assert _edges(web) == [
+        ("w1", "w2", "", "solid"),
+        ("w1", "d1", "sql", "solid"),
+        ("w2", "d1", "sql", "solid"),
+        ("w3", "d2", "cache", "solid"),
+        ("u", "w1", "", "solid"),
+        ("w1", "d2", "", "dashed"),
+    ]
+
+    db = parts["db"]
+    assert [n.id for n in db.nodes] == ["d1", "d2", "w1", "w2", "w3"]
+    assert [g.id for g in db.groups] == ["db", "web"]
+    assert ("d1", "d1", "", "solid") in _edges(db)
+    assert ("x", "u", "uses", "solid") not in _edges(db)
+
+
+def test_split_skips_empty_groups() -> None:
+    vis = Visualization([VisNode("a")], [], [VisGroup("empty")])
+    assert split_by_group(vis) == {}
+
+
+def test_view_is_summarised_above_the_node_limit() -> None:
+    vis = _graph()
+
+    def view(limit: int) -> VisVM:
+        state = AppState(vis_node_limit=limit, vis_renderer="mermaid")
+        return VisController(state)._to_vm(vis, GraphIndex(vis))
+
+    small = view(7)
+    assert not small.summarized and small.sections == []
+    assert summary_id("web") not in small.mermaid
+
+    big = view(6)
+    assert big.summarized
+    assert summary_id("web") in big.mermaid
+    assert [(s.id, s.count) for s in big.sections] == [("web", 3), ("db", 2)]
+    assert len(big.nodes) == 7  # the tables still list every node
@@ -0,0 +1,136 @@
+"""Unit tests for the render manifest and its atomic writers."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from infralight.core import manifest
+from infralight.core.manifest import (
+    RenderManifest,
+    bytes_hash,
+    file_hash,
+    write_if_changed,
+    write_stream,
+)
+
+
+def _leftovers(directory: Path) -> list[str]:
+    return [p.name for p in directory.iterdir() if p.name.startswith(".")]
+
+
+def test_file_hash_matches_bytes_hash(tmp_path: Path) -> None:
+    data = os.urandom(3 * (1 << 16) + 17)  # several blocks plus a tail
+    path = tmp_path / "blob"
+    path.write_bytes(data)
+    assert file_hash(path) == bytes_hash(data) == hashlib.sha1(data).hexdigest()
+
+
+def test_file_hash_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    assert file_hash(path) == bytes_hash(b"")
+
+
+def test_write_stream_writes_and_reports_digest(tmp_path: Path) -> None:
+    path = tmp_path / "out" / "main.tf"
+    written, digest = write_stream(path, [b"resource ", b"{}", b"\n"])
+    assert written
+    assert path.read_bytes() == b"resource {}\n"
+    assert digest == bytes_hash(b"resource {}\n")
+    assert _leftovers(path.parent) == []
+
+
+def test_write_stream_leaves_identical_file_untouched(tmp_path: Path) -> None:
+    path = tmp_path / "main.tf"
+    path.write_bytes(b"same")
+    os.utime(path, (1, 1))
+    written, digest = write_stream(path, [b"sa", b"me"])
+    assert not written
+    assert digest == bytes_hash(b"same")
+    assert path.stat().st_mtime == 1
+    assert _leftovers(tmp_path) == []
+
+
+def test_write_stream_failure_keeps_old_file(tmp_path: Path) -> None:
+    path = tmp_path / "main.tf"
+    path.write_bytes(b"old")
+
+    def chunks():
+        yield b"new"
+        raise RuntimeError("template blew up")
+
+    with pytest.raises(RuntimeError):
+        write_stream(path, chunks())
+    assert path.read_bytes() == b"old"
+    assert _leftovers(tmp_path) == []
+
+
+def test_write_stream_keeps_existing_mode(tmp_path: Path) -> None:
+    path = tmp_path / "run.sh"
+    path.write_bytes(b"old")
+    path.chmod(0o750)
+    write_stream(path, [b"new"])
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+
+
+def test_new_files_get_umask_mode(tmp_path: Path) -> None:
+    old = os.umask(0o027)
+    try:
+        manifest._umask = None
+        write_if_changed(tmp_path / "a", b"x")
+        write_stream(tmp_path / "b", [b"x"])
+    finally:
+        os.umask(old)
+        manifest._umask = None
+    for name in ("a", "b"):
+        assert stat.S_IMODE((tmp_path / name).stat().st_mode) == 0o640
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "m.json"
+    assert write_if_changed(path, b"{}")
+    assert not write_if_changed(path, b"{}")
+    assert write_if_changed(path, b"[]")
+    assert path.read_bytes() == b"[]"
+
+
+def test_manifest_round_trip_and_freshness(tmp_path: Path) -> None:
+    out = tmp_path / "out.tf"
+    _, digest = write_stream(out, [b"rendered"])
+    m = RenderManifest(tmp_path / "manifest.json")
+    m.record("vpc.il.tf", "src1", {"base.j2": "d1"}, out, digest)
+    m.save()
+
+    loaded = RenderManifest.load(tmp_path / "manifest.json")
+    assert loaded.is_fresh("vpc.il.tf", "src1", {"base.j2": "d1"}, out)
+    assert not loaded.is_fresh("vpc.il.tf", "src2", {"base.j2": "d1"}, out)
+    assert not loaded.is_fresh("vpc.il.tf", "src1", {"base.j2": "d2"}, out)
+    assert not loaded.is_fresh("vpc.il.tf", "src1", None, out)
+
+    out.write_bytes(b"edited by hand")
+    assert not loaded.is_fresh("vpc.il.tf", "src1", {"base.j2": "d1"}, out)
+    out.unlink()
+    assert not loaded.is_fresh("vpc.il.tf", "src1", {"base.j2": "d1"}, out)
+
+
+def test_unreadable_manifest_starts_empty(tmp_path: Path) -> None:
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json")
+    assert RenderManifest.load(path).entries == {}
+
+
+def test_remove_temp_files_only_takes_that_process(tmp_path: Path) -> None:
+    path = tmp_path / "main.tf"
+    path.write_bytes(b"old")
+    for name in (".main.tf.4242.abc", ".main.tf.4242.def", ".main.tf.777.abc"):
+        (tmp_path / name).write_bytes(b"partial")
+    (tmp_path / ".other.tf.4242.abc").write_bytes(b"partial")
+
+    assert manifest.remove_temp_files(path, 4242) == 2
+    assert sorted(_leftovers(tmp_path)) == [".main.tf.777.abc", ".other.tf.4242.abc"]
+    assert path.read_bytes() == b"old"
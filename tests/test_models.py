@@ -0,0 +1,161 @@
+"""Unit tests for the core models."""
+
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+from infralight.core.models import (
+    FileKind,
+    FileType,
+    IaCResource,
+    Project,
+    SourceFile,
+    VisEdge,
+    VisGroup,
+    VisNode,
+    Visualization,
+)
+
+# ── Visualization index ──────────────────────────────────────────
+
+
+def _ids(vis: Visualization) -> list[str]:
+    return list(vis.node_map())
+
+
+def test_merge_skips_repeats() -> None:
+    a = Visualization(
+        [VisNode("x"), VisNode("y")], [VisEdge("x", "y")], [VisGroup("g")]
+    )
+    b = Visualization(
+        [VisNode("y", "other"), VisNode("z")],
+        [VisEdge("x", "y"), VisEdge("x", "y", label="l"), VisEdge("y", "z")],
+        [VisGroup("g", "other"), VisGroup("h")],
+    )
+    a.merge(b)
+    assert [n.id for n in a.nodes] == ["x", "y", "z"]
+    assert a.node("y").label == ""
+    assert [(e.source, e.target, e.label) for e in a.edges] == [
+        ("x", "y", ""),
+        ("x", "y", "l"),
+        ("y", "z", ""),
+    ]
+    assert [g.id for g in a.groups] == ["g", "h"]
+    assert a.successors("x") == ["y"]
+
+
+def test_first_node_group_and_edge_win() -> None:
+    first, second = VisEdge("a", "b", color="red"), VisEdge("a", "b", color="blue")
+    vis = Visualization(
+        [VisNode("a", "first"), VisNode("b"), VisNode("a", "second")],
+        [first, second],
+        [VisGroup("g", "first"), VisGroup("g", "second")],
+    )
+    assert vis.node("a").label == "first"
+    assert vis.group("g").label == "first"
+    assert _ids(vis) == ["a", "b"]
+    assert vis.unique_edges() == [first]
+    assert vis.out_edges("a") == [first]
+    assert vis.in_edges("b") == [first]
+    assert vis.node("nope") is None
+
+
+def test_index_catches_up_with_appends() -> None:
+    vis = Visualization([VisNode("a")])
+    assert _ids(vis) == ["a"]
+    vis.nodes.append(VisNode("b"))
+    vis.edges.append(VisEdge("a", "b"))
+    vis.groups.append(VisGroup("g"))
+    assert _ids(vis) == ["a", "b"]
+    assert vis.successors("a") == ["b"]
+    assert vis.predecessors("b") == ["a"]
+    assert vis.group("g") is not None
+    assert not vis.add_node(VisNode("b"))
+    assert vis.add_edge(VisEdge("b", "a"))
+    assert vis.successors("b") == ["a"]
+
+
+def test_index_rebuilds_when_lists_are_replaced_or_shrink() -> None:
+    vis = Visualization([VisNode("a"), VisNode("b")], [VisEdge("a", "b")])
+    assert vis.successors("a") == ["b"]
+    vis.nodes = [VisNode("c")]
+    vis.edges = [VisEdge("c", "c")]
+    assert _ids(vis) == ["c"]
+    assert vis.successors("a") == []
+    assert vis.successors("c") == ["c"]
+    vis.nodes.pop()
+    assert _ids(vis) == []
+    vis.clear()
+    assert vis.unique_edges() == []
+    assert vis.add_node(VisNode("a"))
+
+
+def test_pickle_drops_the_index_and_rebuilds_it() -> None:
+    vis = Visualization([VisNode("a"), VisNode("b")], [VisEdge("a", "b")])
+    assert vis.successors("a") == ["b"]
+    assert vis._index is not None
+    assert "_VisIndex" not in str(pickle.dumps(vis))
+
+    copy = pickle.loads(pickle.dumps(vis))
+    assert copy._index is None
+    assert copy == vis
+    assert copy.successors("a") == ["b"]
+    copy.nodes.append(VisNode("c"))
+    assert _ids(copy) == ["a", "b", "c"]
+    assert _ids(vis) == ["a", "b"]
+
+
+# ── Project snapshots ────────────────────────────────────────────
+
+
+def _file(name: str, text: str = "") -> SourceFile:
+    return SourceFile(Path("/p") / name, FileType.SALTSTACK, FileKind.NATIVE, text)
+
+
+def _project() -> Project:
+    return Project(
+        Path("/p"),
+        files=(_file("a.sls", "a"), _file("b.sls", "b")),
+        file_resources=((IaCResource("a", "a", "pkg.installed"),), ()),
+        generation=3,
+    )
+
+
+def test_with_file_returns_a_new_snapshot() -> None:
+    old = _project()
+    old_files, old_resources = old.files, old.resources
+    new_b = _file("b.sls", "changed")
+    res = (IaCResource("b", "b", "file.managed"),)
+
+    new = old.with_file(new_b, res)
+
+    assert new is not old
+    assert new.generation == 4
+    assert new.files == (old.files[0], new_b)
+    assert new.files[0] is old.files[0]  # unchanged files are shared
+    assert new.file_resources[0] is old.file_resources[0]
+    assert [r.id for r in new.resources] == ["a", "b"]
+    # the old snapshot is untouched, including its cached resources
+    assert old.files is old_files and old.files[1].content == "b"
+    assert old.resources is old_resources and [r.id for r in old.resources] == ["a"]
+    assert old.generation == 3
+
+
+def test_with_file_appends_an_unknown_path() -> None:
+    old = _project()
+    new = old.with_file(_file("c.sls"), ())
+    assert [sf.name for sf in new.files] == ["a.sls", "b.sls", "c.sls"]
+    assert len(new.file_resources) == 3
+    assert len(old.files) == 2
+
+
+def test_copy_has_its_own_lists() -> None:
+    vis = Visualization([VisNode("a")], [VisEdge("a", "a")], [VisGroup("g")])
+    copy = vis.copy()
+    assert copy == vis
+    assert copy.nodes[0] is vis.nodes[0]
+    copy.add_node(VisNode("b"))
+    copy.edges.clear()
+    assert _ids(vis) == ["a"]
+    assert vis.successors("a") == ["a"]
@@ -0,0 +1,162 @@
+"""Unit tests for the simulated Salt apply order."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from infralight.core.models import FileKind, FileType, SourceFile
+from infralight.core.ordering import AUTO_ORDER_START, execution_order, order_keys
+from infralight.core.parsers import parse_salt
+from infralight.core.requisites import RequisiteGraph, requisite_graph
+
+
+def _graph(text: str) -> RequisiteGraph:
+    sf = SourceFile(Path("/srv/salt/x.sls"), FileType.SALTSTACK, FileKind.NATIVE, text)
+    return requisite_graph(parse_salt(sf))
+
+
+def _order(g: RequisiteGraph, states: list[int] | None = None) -> list[str]:
+    return [g.states[s.state].id for s in execution_order(g, states)]
+
+
+def test_definition_order_by_default() -> None:
+    g = _graph("c:\n  cmd.run: []\na:\n  cmd.run: []\nb:\n  cmd.run: []\n")
+    assert _order(g) == ["c", "a", "b"]
+    assert order_keys(g, range(3)) == {
+        0: AUTO_ORDER_START,
+        1: AUTO_ORDER_START + 1,
+        2: AUTO_ORDER_START + 2,
+    }
+
+
+def test_order_option() -> None:
+    g = _graph(
+        """\
+auto:
+  cmd.run: []
+last:
+  cmd.run:
+    - order: last
+negative:
+  cmd.run:
+    - order: -1
+first:
+  cmd.run:
+    - order: first
+five:
+  cmd.run:
+    - order: 5
+"""
+    )
+    # Negative orders count back from "last": -1 runs just before it
+    assert _order(g) == ["first", "five", "auto", "negative", "last"]
+    steps = execution_order(g)
+    assert [s.explicit for s in steps] == [True, True, False, True, True]
+
+
+def test_require_pulls_state_forward() -> None:
+    g = _graph(
+        """\
+app:
+  service.running:
+    - require:
+      - pkg: runtime
+other:
+  cmd.run: []
+runtime:
+  pkg.installed: []
+"""
+    )
+    steps = execution_order(g)
+    assert _order(g) == ["runtime", "app", "other"]
+    assert [s.pulled for s in steps] == [True, False, False]
+    assert [g.states[i].id for i in steps[1].waits_for] == ["runtime"]
+
+
+def test_prereq_runs_before_its_target() -> None:
+    g = _graph(
+        """\
+site:
+  file.managed: []
+graceful_down:
+  cmd.run:
+    - prereq:
+      - file: site
+"""
+    )
+    assert _order(g) == ["graceful_down", "site"]
+
+
+def test_non_ordering_requisites_are_ignored() -> None:
+    g = _graph(
+        """\
+a:
+  file.managed:
+    - use:
+      - file: b
+b:
+  file.managed:
+    - listen:
+      - file: c
+c:
+  file.managed: []
+"""
+    )
+    assert _order(g) == ["a", "b", "c"]
+
+
+def test_ties_break_on_module_name_and_bare_function() -> None:
+    # Salt compares "pkgfooinstalled" with "pkgfoojlatest"; the full
+    # "pkg.installed" would put fooj first.
+    g = _graph(
+        """\
+b:
+  pkg.latest:
+    - name: fooj
+    - order: 1
+a:
+  pkg.installed:
+    - name: foo
+    - order: 1
+"""
+    )
+    assert _order(g) == ["a", "b"]
+
+
+def test_loops_are_listed_and_flagged() -> None:
+    g = _graph(
+        """\
+a:
+  cmd.run:
+    - require:
+      - cmd: b
+b:
+  cmd.run:
+    - require:
+      - cmd: a
+c:
+  cmd.run: []
+"""
+    )
+    steps = execution_order(g)
+    assert sorted(g.states[s.state].id for s in steps) == ["a", "b", "c"]
+    assert [s.cyclic for s in steps] == [True, True, False]
+
+
+def test_subset_ignores_requisites_outside_it() -> None:
+    g = _graph(
+        """\
+a:
+  cmd.run: []
+b:
+  cmd.run:
+    - require:
+      - cmd: a
+c:
+  cmd.run:
+    - require:
+      - cmd: b
+"""
+    )
+    assert _order(g, [2, 1]) == ["b", "c"]
+    assert execution_order(g, [2])[0].waits_for == []
@@ -56,6 +56,11 @@ class TestLayout:
         sidebar = page.locator(".q-drawer")
         expect(sidebar.get_by_text("files", exact=False).first).to_be_visible()
 
+    def test_loading_skeleton_replaced(self, page: Page, base_url: str) -> None:
+        _go(page, base_url)
+        expect(page.locator("header")).to_contain_text("Infralight")
+        expect(page.get_by_text("Loading project…")).to_have_count(0)
+
     def test_sidebar_navigate_to_states(self, page: Page, base_url: str) -> None:
         _go(page, base_url)
         page.locator(".q-drawer").get_by_text("Salt States", exact=True).click()
@@ -88,6 +93,15 @@ class TestDashboard:
         _go(page, base_url)
         expect(page.get_by_text("Issues")).to_be_visible()
 
+    def test_requisite_issues(self, page: Page, base_url: str) -> None:
+        _go(page, base_url)
+        # common.sls isn't valid YAML: the requisites on its states are
+        # folded into its parse error instead of naming no state
+        issue = page.get_by_text(re.compile(r"Not valid YAML: mapping values"))
+        expect(issue.first).to_be_visible()
+        expect(page.get_by_text("saltstack/common.sls:63")).to_be_visible()
+        expect(page.get_by_text("which no state defines")).to_have_count(0)
+
     def test_project_files_panel(self, page: Page, base_url: str) -> None:
         _go(page, base_url)
         # The project files panel should be present
@@ -130,6 +144,29 @@ class TestSaltOverview:
         # At least one category should appear (Packages, Services, Files, etc.)
         expect(page.get_by_text("Packages").first).to_be_visible()
 
+    def test_apply_order(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/salt-overview")
+        expect(page.get_by_text("Apply Order")).to_be_visible()
+        expect(page.get_by_text("pulled forward by a requisite").first).to_be_visible()
+
+    def test_minions(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/salt-overview")
+        expect(page.get_by_text("Minions", exact=True)).to_be_visible()
+        row = page.locator("table tbody tr").filter(has_text="web-01")
+        expect(row.first).to_contain_text("nginx")
+
+    def test_apply_order_per_minion(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/salt-overview")
+        page.get_by_label("Highstate of").click()
+        page.get_by_role("option", name="db-01").click()
+        expect(page.get_by_text("pkg: pgbouncer").first).to_be_visible()
+
+    def test_requisites_filtered_on_server(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/salt-overview")
+        page.get_by_placeholder("Filter…").first.fill("nginx")
+        expect(page.get_by_text(re.compile(r"1-\d+ of \d+")).first).to_be_visible()
+        expect(page.locator("table tbody tr").first).to_contain_text("nginx")
+
 
 # ── TF Resources ─────────────────────────────────────────────────
 
@@ -147,6 +184,13 @@ class TestResources:
         rows = page.locator("table tbody tr")
         expect(rows.first).to_be_visible()
 
+    def test_blast_radius(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/resources")
+        row = page.locator("table tbody tr").filter(has_text="aws_vpc.main")
+        row.locator(".q-radio").click()
+        expect(page.get_by_text("Blast radius")).to_be_visible()
+        expect(page.get_by_text("aws_instance.web").last).to_be_visible()
+
 
 # ── Visualization ────────────────────────────────────────────────
 
@@ -176,6 +220,30 @@ class TestVisualization:
         page.get_by_text("Infrastructure", exact=True).click()
         expect(page.get_by_text("Infrastructure Graph")).to_be_visible()
 
+    def test_tab_built_on_first_activation(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/visualization")
+        expect(page.get_by_text("Salt Graph")).to_have_count(0)
+        page.get_by_text("Salt", exact=True).click()
+        expect(page.get_by_text("Salt Graph")).to_be_visible()
+
+    def test_focus_mode(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/visualization")
+        page.get_by_text("Salt", exact=True).click()
+        page.get_by_label("Focus on").last.fill("postgresql")
+        page.get_by_role("button", name="Focus").last.click()
+        expect(page.get_by_text("2 hops of 'postgresql'")).to_be_visible()
+
+    def test_focus_all_dependents(self, page: Page, base_url: str) -> None:
+        _go(page, base_url, "/visualization")
+        page.get_by_text("Salt", exact=True).click()
+        page.get_by_label("Hops").last.click()
+        page.get_by_role("option", name="All").click()
+        page.get_by_label("Direction").last.click()
+        page.get_by_role("option", name="Dependents").click()
+        page.get_by_label("Focus on").last.fill("postgresql")
+        page.get_by_role("button", name="Focus").last.click()
+        expect(page.get_by_text("Blast radius of 'postgresql'")).to_be_visible()
+
     def test_node_edge_counts(self, page: Page, base_url: str) -> None:
         _go(page, base_url, "/visualization")
         # The stats line shows "X nodes · Y edges"
@@ -0,0 +1,173 @@
+"""Unit tests for the shared project store."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from infralight.core.models import IaCResource, Project, SourceFile
+from infralight.models import projects
+
+
+@pytest.fixture
+def scans(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Generations scanned, with scan_project replaced by a counting stub."""
+    seen: list[int] = []
+    real = projects.scan_project
+
+    def scan(root: Path, generation: int = 0) -> Project:
+        seen.append(generation)
+        return real(root, generation)
+
+    monkeypatch.setattr(projects, "scan_project", scan)
+    return seen
+
+
+def _root(tmp_path: Path) -> Path:
+    (tmp_path / "web.sls").write_text("nginx:\n  pkg.installed: []\n")
+    return tmp_path
+
+
+# ── single-flight loading ────────────────────────────────────────
+
+
+def test_concurrent_callers_share_one_load(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = _root(tmp_path)
+    gate = threading.Event()
+    calls: list[Path] = []
+    real = projects.scan_project
+
+    def slow_scan(root: Path, generation: int = 0) -> Project:
+        calls.append(root)
+        gate.wait(10)
+        return real(root, generation)
+
+    monkeypatch.setattr(projects, "scan_project", slow_scan)
+    with ThreadPoolExecutor(8) as pool:
+        futures = list(pool.map(lambda _: projects.submit_load(root), range(8)))
+    assert all(f is futures[0] for f in futures)
+    assert not futures[0].done()
+    gate.set()
+
+    project = futures[0].result(10)
+    assert calls == [root.resolve()]
+    assert projects.load_project(root) is project
+    assert [sf.name for sf in project.files] == ["web.sls"]
+
+
+def test_failed_load_is_retried(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = _root(tmp_path)
+    real = projects.scan_project
+    attempts: list[int] = []
+
+    def flaky_scan(root: Path, generation: int = 0) -> Project:
+        attempts.append(generation)
+        if len(attempts) == 1:
+            raise OSError("disk went away")
+        return real(root, generation)
+
+    monkeypatch.setattr(projects, "scan_project", flaky_scan)
+    failed = projects.submit_load(root)
+    with pytest.raises(OSError):
+        failed.result(10)
+
+    retry = projects.submit_load(root)
+    assert retry is not failed
+    assert retry.result(10).root == root.resolve()
+    assert projects.submit_load(root) is retry
+    assert len(attempts) == 2
+
+
+def test_invalidate_starts_a_new_load(tmp_path: Path, scans: list[int]) -> None:
+    root = _root(tmp_path)
+    first = projects.load_project(root)
+    gen = projects.invalidate(root)
+    second = projects.load_project(root)
+    assert second is not first
+    assert (first.generation, second.generation) == (0, gen)
+    assert scans == [0, gen]
+
+
+def test_memo_is_per_generation_and_dropped_by_invalidate(
+    tmp_path: Path, scans: list[int]
+) -> None:
+    root = _root(tmp_path)
+    project = projects.load_project(root)
+    builds: list[int] = []
+
+    def build() -> int:
+        builds.append(1)
+        return len(builds)
+
+    assert projects.memo(project, "rows", build) == 1
+    assert projects.memo(project, "rows", build) == 1
+    assert (project.root, "rows") in projects._memo
+
+    projects.invalidate(root)
+    assert (project.root, "rows") not in projects._memo
+    assert projects.memo(projects.load_project(root), "rows", build) == 2
+    assert projects.memo(project, "rows", build) == 3  # old snapshot, uncached
+    assert projects.memo(projects.load_project(root), "rows", build) == 2
+
+
+# ── updates ──────────────────────────────────────────────────────
+
+
+def test_update_file_publishes_a_new_generation(
+    tmp_path: Path, scans: list[int]
+) -> None:
+    root = _root(tmp_path)
+    old = projects.load_project(root)
+    path = old.files[0].path
+
+    new = projects.update_file(root, path, "redis:\n  pkg.installed: []\n")
+
+    assert new is not None and new.generation == old.generation + 1
+    assert [r.id for r in new.resources] == ["redis"]
+    assert [r.id for r in old.resources] == ["nginx"]
+    assert projects.load_project(root) is new
+    assert projects.update_file(root, root / "nope.sls", "") is None
+    assert scans == [0]
+
+
+def test_update_after_invalidate_rebases(tmp_path: Path, scans: list[int]) -> None:
+    root = _root(tmp_path)
+    stale = projects.load_project(root)
+    path = stale.files[0].path
+    (root / "db.sls").write_text("postgres:\n  pkg.installed: []\n")
+    gen = projects.invalidate(root)
+
+    new = projects.update_file(root, path, "redis:\n  pkg.installed: []\n")
+
+    assert new is not None and new.generation == gen + 1
+    assert sorted(r.id for r in new.resources) == ["postgres", "redis"]
+    assert scans == [0, gen]
+
+
+def test_update_racing_invalidate_is_reapplied(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, scans: list[int]
+) -> None:
+    root = _root(tmp_path)
+    path = projects.load_project(root).files[0].path
+    (root / "db.sls").write_text("postgres:\n  pkg.installed: []\n")
+    real = projects.parse_file
+    raced: list[int] = []
+
+    def parse_then_invalidate(sf: SourceFile) -> list[IaCResource]:
+        if sf.path == path and not raced:
+            raced.append(projects.invalidate(root))
+        return real(sf)
+
+    monkeypatch.setattr(projects, "parse_file", parse_then_invalidate)
+    new = projects.update_file(root, path, "redis:\n  pkg.installed: []\n")
+
+    assert new is not None and new.generation == raced[0] + 1
+    assert sorted(r.id for r in new.resources) == ["postgres", "redis"]
+    assert projects.load_project(root) is new
@@ -0,0 +1,120 @@
+"""Unit tests for subgraph queries."""
+
+from __future__ import annotations
+
+import pytest
+
+from infralight.core.models import VisEdge, VisGroup, VisNode, Visualization
+from infralight.core.query import GraphIndex, SubgraphQuery
+
+# a → b → c → d → e, with a loop c → f → c; "x" stands alone
+INDEX = GraphIndex(
+    Visualization(
+        nodes=[
+            VisNode("a", "Web app", group="web", meta={"provider": "aws"}),
+            VisNode("b", "API", group="web", meta={"provider": "aws"}),
+            VisNode("c", "Postgres", group="db", meta={"provider": "gcp"}),
+            VisNode("d", "Disk", group="db", meta={"module": "storage"}),
+            VisNode("e", "Backup", meta={"module": "storage"}),
+            VisNode("f", "Replica", group="db"),
+            VisNode("x", "Lonely"),
+        ],
+        edges=[
+            VisEdge("a", "b"),
+            VisEdge("b", "c"),
+            VisEdge("c", "d"),
+            VisEdge("d", "e"),
+            VisEdge("c", "f"),
+            VisEdge("f", "c"),
+            VisEdge("b", "ghost"),  # target isn't a node
+        ],
+        groups=[VisGroup("web"), VisGroup("db"), VisGroup("unused")],
+    )
+)
+
+
+def _ids(q: SubgraphQuery) -> list[str]:
+    return [n.id for n in INDEX.query(q).nodes]
+
+
+def test_match_exact_id_then_substring() -> None:
+    assert INDEX.match("c") == ["c"]
+    assert INDEX.match("POST") == ["c"]
+    assert INDEX.match("p") == ["a", "b", "c", "e", "f"]
+    assert INDEX.match("  ") == []
+    assert INDEX.match("nope") == []
+
+
+@pytest.mark.parametrize(
+    "hops,direction,expected",
+    [
+        (1, "out", {"c", "d", "f"}),
+        (2, "out", {"c", "d", "e", "f"}),
+        (1, "in", {"b", "c", "f"}),
+        (2, "in", {"a", "b", "c", "f"}),
+        (1, "both", {"b", "c", "d", "f"}),
+        (0, "out", {"c", "d", "e", "f"}),
+        (0, "in", {"a", "b", "c", "f"}),
+        (0, "both", {"a", "b", "c", "d", "e", "f"}),
+        (9, "both", {"a", "b", "c", "d", "e", "f"}),
+    ],
+)
+def test_neighbourhood_depth_and_direction(
+    hops: int, direction: str, expected: set[str]
+) -> None:
+    assert INDEX.neighbourhood(["c"], hops, direction) == expected
+
+
+def test_neighbourhood_through_a_cycle() -> None:
+    assert INDEX.neighbourhood(["f"], 1, "out") == {"f", "c"}
+    assert INDEX.neighbourhood(["f"], 2, "out") == {"f", "c", "d"}
+    assert INDEX.neighbourhood(["f"], 0, "in") == {"f", "c", "b", "a"}
+
+
+def test_unknown_ids_are_ignored() -> None:
+    assert INDEX.neighbourhood(["nope"], 2) == set()
+    assert INDEX.neighbourhood(["nope"], 0) == set()
+    assert INDEX.neighbourhood(["b", "ghost"], 1, "out") == {"b", "c"}
+    assert INDEX.subgraph(["a", "nope"]).nodes == [INDEX.nodes["a"]]
+    assert _ids(SubgraphQuery(focus="nope")) == []
+    with pytest.raises(ValueError):
+        INDEX.neighbourhood(["a"], 1, "sideways")
+
+
+def test_subgraph_keeps_edge_order_and_used_groups() -> None:
+    sub = INDEX.subgraph({"f", "c", "b"})
+    assert [n.id for n in sub.nodes] == ["b", "c", "f"]
+    assert [(e.source, e.target) for e in sub.edges] == [
+        ("b", "c"),
+        ("c", "f"),
+        ("f", "c"),
+    ]
+    assert [g.id for g in sub.groups] == ["web", "db"]
+
+
+def test_query_focus_and_filters() -> None:
+    assert _ids(SubgraphQuery(focus="c", hops=1)) == ["b", "c", "d", "f"]
+    # filters drop neighbours but never the focused node
+    assert _ids(SubgraphQuery(focus="c", hops=0, groups=frozenset({"web"}))) == [
+        "a",
+        "b",
+        "c",
+    ]
+    assert _ids(SubgraphQuery(focus="b", providers=frozenset({"gcp"}))) == ["b", "c"]
+    assert _ids(SubgraphQuery(focus="Backup", modules=frozenset({"x"}))) == ["e"]
+
+
+def test_query_filters_without_focus() -> None:
+    assert _ids(SubgraphQuery(providers=frozenset({"aws"}))) == ["a", "b"]
+    assert _ids(SubgraphQuery(modules=frozenset({"storage"}))) == ["d", "e"]
+    assert _ids(SubgraphQuery(groups=frozenset({"db"}))) == ["c", "d", "f"]
+    assert _ids(
+        SubgraphQuery(groups=frozenset({"db"}), modules=frozenset({"storage"}))
+    ) == ["d"]
+    assert len(_ids(SubgraphQuery())) == 7
+
+
+def test_values() -> None:
+    assert INDEX.values("provider") == ["aws", "gcp"]
+    assert INDEX.values("module") == ["storage"]
+    assert INDEX.values("nope") == []
@@ -0,0 +1,119 @@
+"""Unit tests for strongly connected components and the reach index."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from infralight.core.models import VisEdge, VisNode, Visualization
+from infralight.core.reach import ReachIndex, strongly_connected
+
+
+def _vis(ids: str, edges: list[str]) -> Visualization:
+    """Graph over one-letter *ids*; an edge ``"ab"`` means a depends on b."""
+    return Visualization(
+        [VisNode(i) for i in ids], [VisEdge(e[0], e[1]) for e in edges]
+    )
+
+
+def _scc(graph: dict[str, str]) -> list[list[str]]:
+    return strongly_connected(graph, lambda n: graph.get(n, ""))
+
+
+# ── strongly_connected ───────────────────────────────────────────
+
+
+def test_dag_components_come_after_their_successors() -> None:
+    graph = {"a": "bc", "b": "d", "c": "d", "d": ""}
+    comps = _scc(graph)
+    assert sorted(comps) == [["a"], ["b"], ["c"], ["d"]]
+    order = [c[0] for c in comps]
+    for src, targets in graph.items():
+        for t in targets:
+            assert order.index(t) < order.index(src)
+
+
+def test_cycles_and_self_loops() -> None:
+    comps = _scc({"a": "b", "b": "ca", "c": "c", "d": "a"})
+    assert [sorted(c) for c in comps] == [["c"], ["a", "b"], ["d"]]
+
+
+def test_unknown_successors_and_duplicate_nodes_are_ignored() -> None:
+    comps = strongly_connected(["a", "b", "a"], lambda n: {"a": "bz"}.get(n, ""))
+    assert comps == [["b"], ["a"]]
+
+
+def test_deep_chain_does_not_recurse() -> None:
+    n = 20_000
+    comps = strongly_connected(range(n), lambda i: [i + 1] if i + 1 < n else [])
+    assert comps == [[i] for i in reversed(range(n))]
+
+
+# ── ReachIndex ───────────────────────────────────────────────────
+
+
+def test_dependencies_and_dependents() -> None:
+    index = ReachIndex(_vis("abcde", ["ab", "bc", "ac", "dc"]))
+    assert index.dependencies("a") == ["b", "c"]
+    assert index.dependencies("c") == []
+    assert index.dependents("c") == ["a", "b", "d"]
+    assert index.dependents("a") == []
+    assert index.dependencies("e") == index.dependents("e") == []
+    assert index.reaches("a", "c")
+    assert not index.reaches("c", "a")
+    assert not index.reaches("d", "b")
+
+
+def test_cycle_members_reach_each_other() -> None:
+    index = ReachIndex(_vis("abcd", ["ab", "bc", "ca", "cd"]))
+    assert index.dependencies("a") == ["b", "c", "d"]
+    assert index.dependents("a") == ["b", "c"]
+    assert index.dependents("d") == ["a", "b", "c"]
+    assert index.reaches("a", "a")
+    assert index.reaches("b", "a")
+    assert not index.reaches("d", "a")
+
+
+def test_self_loop_does_not_count() -> None:
+    index = ReachIndex(_vis("ab", ["aa", "ab"]))
+    assert index.dependencies("a") == ["b"]
+    assert index.dependents("a") == []
+    assert not index.reaches("a", "a")
+
+
+def test_unknown_nodes() -> None:
+    index = ReachIndex(_vis("ab", ["ab", "ax"]))
+    assert "a" in index
+    assert "x" not in index
+    assert index.dependencies("a") == ["b"]
+    assert index.dependencies("x") == index.dependents("x") == []
+    assert not index.reaches("a", "x")
+    assert not index.reaches("x", "a")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_a_plain_walk(seed: int) -> None:
+    rnd = random.Random(seed)
+    ids = [f"n{i}" for i in range(rnd.randint(1, 30))]
+    edges = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(rnd.randint(0, 50))]
+    vis = Visualization([VisNode(i) for i in ids], [VisEdge(s, t) for s, t in edges])
+    index = ReachIndex(vis)
+
+    def walk(start: str) -> set[str]:
+        seen: set[str] = set()
+        todo = [t for s, t in edges if s == start]
+        while todo:
+            n = todo.pop()
+            if n not in seen:
+                seen.add(n)
+                todo.extend(t for s, t in edges if s == n)
+        return seen
+
+    reach = {i: walk(i) for i in ids}
+    for i in ids:
+        assert set(index.dependencies(i)) == reach[i] - {i}
+        assert set(index.dependents(i)) == {j for j in ids if i in reach[j]} - {i}
+        for j in ids:
+            if i != j:
+                assert index.reaches(i, j) == (j in reach[i])
@@ -0,0 +1,262 @@
+"""Unit tests for the renderer: normalisation, render_all and the graph cache."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from infralight.core import renderer
+from infralight.core.decorators import begin_collect, end_collect, il_node
+from infralight.core.environment import get_environment
+from infralight.core.manifest import RenderManifest
+from infralight.core.models import CACHE_DIR_NAME, SourceFile, VisNode, Visualization
+from infralight.core.renderer import (
+    _BLANK_RUN,
+    _chunked,
+    _normalized,
+    file_visualization,
+    project_visualization,
+    render_all,
+)
+from infralight.core.sandbox import SandboxLimits
+from infralight.core.scanner import scan_directory
+from infralight.core.viscache import vis_cache
+
+_TEMPLATE = """\
+{{ il_node("{name}", "{name}") }}
+{name}:
+  pkg.installed: []
+"""
+
+
+def _reference(text: str) -> str:
+    """The normalisation render_file applies to a whole rendered text."""
+    return _BLANK_RUN.sub("\n\n", text).strip() + "\n"
+
+
+def _streamed(parts: list[str]) -> str:
+    return "".join(_normalized(parts))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "\n",
+        " \t\n\n ",
+        "a",
+        "a\n\n\n\nb",
+        "\n\n\n  a  \n\n\n\n",
+        "a\n \n\n\nb\n",
+        "\xa0a\r\n\r\n\r\nb\t\n\n\n\n",
+        "line 1\n\n\n\n\nline 2\n\n\n\nline 3\n\n",
+    ],
+)
+def test_normalized_matches_reference_at_every_split(text: str) -> None:
+    expected = _reference(text)
+    assert _streamed([text]) == expected
+    # Every way of cutting the text into up to three chunks
+    for i, j in itertools.combinations_with_replacement(range(len(text) + 1), 2):
+        assert _streamed([text[:i], text[i:j], text[j:]]) == expected
+    assert _streamed(list(text)) == expected
+
+
+def test_normalized_matches_reference_fuzz() -> None:
+    rnd = random.Random(0)
+    alphabet = ["a", "b", " ", "\t", "\n", "\n", "\n", "\r", "\xa0"]
+    for _ in range(5000):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 30)))
+        cuts = sorted(rnd.randint(0, len(text)) for _ in range(rnd.randint(0, 6)))
+        parts = [text[a:b] for a, b in itertools.pairwise([0, *cuts, len(text)])]
+        assert _streamed(parts) == _reference(text), (text, parts)
+
+
+def test_empty_output_is_one_newline() -> None:
+    assert _streamed([]) == "\n"
+    assert b"".join(_chunked(_normalized(["", "  ", "\n\n"]))) == b"\n"
+
+
+def test_chunked_reassembles_to_the_same_bytes() -> None:
+    parts = ["é" * 50_000, "x" * 30_000, "", "tail"]
+    blocks = list(_chunked(parts))
+    assert len(blocks) > 1
+    assert b"".join(blocks) == "".join(parts).encode("utf-8")
+
+
+def _project(tmp_path: Path):
+    for name in ("nginx", "redis"):
+        (tmp_path / f"{name}.il.sls").write_text(_TEMPLATE.replace("{name}", name))
+    project = scan_directory(tmp_path)
+    penv = get_environment(project.root)
+    return project, penv
+
+
+def _manifest(root: Path) -> RenderManifest:
+    return RenderManifest.load(root / CACHE_DIR_NAME / "manifest.json")
+
+
+def test_cancelled_renders_are_not_cached(tmp_path: Path) -> None:
+    project, penv = _project(tmp_path)
+    files = list(project.il_files)
+    cancel = threading.Event()
+    cancel.set()
+
+    results, _ = render_all(files, project.output_dir, penv, cancel=cancel)
+
+    assert [r.status for r in results] == ["cancelled", "cancelled"]
+    assert _manifest(project.root).entries == {}
+    for sf in files:
+        name = penv.template_name(sf)
+        assert vis_cache.get(penv.root, name, penv.fingerprint(name)) is None
+
+
+def test_rendered_files_are_recorded_then_skipped(tmp_path: Path) -> None:
+    project, penv = _project(tmp_path)
+    files = list(project.il_files)
+
+    first, vis = render_all(files, project.output_dir, penv)
+    assert [r.status for r in first] == ["rendered", "rendered"]
+    assert {n.id for n in vis.nodes} == {"nginx", "redis"}
+    assert set(_manifest(project.root).entries) == {"nginx.il.sls", "redis.il.sls"}
+
+    again, vis = render_all(files, project.output_dir, penv)
+    assert [r.status for r in again] == ["unchanged", "unchanged"]
+    assert {n.id for n in vis.nodes} == {"nginx", "redis"}
+
+
+def test_killed_render_leaves_no_temp_files(tmp_path: Path) -> None:
+    (tmp_path / "slow.il.tf").write_text(
+        "partial\n{% for i in range(100000) %}{% for j in range(100000) %}"
+        "{% endfor %}{% endfor %}\n"
+    )
+    project = scan_directory(tmp_path)
+    penv = get_environment(project.root)
+    files = list(project.il_files)
+
+    results, _ = render_all(
+        files,
+        project.output_dir,
+        penv,
+        executor="sandbox",
+        limits=SandboxLimits(timeout=3.0),
+    )
+
+    assert [r.status for r in results] == ["error"]
+    assert "time limit" in results[0].error
+    assert list(project.output_dir.iterdir()) == []
+
+
+def test_rerender_of_unchanged_template_keeps_the_output(tmp_path: Path) -> None:
+    project, penv = _project(tmp_path)
+    files = list(project.il_files)
+    render_all(files, project.output_dir, penv)
+    outputs = sorted(project.output_dir.iterdir())
+    before = {p: p.read_bytes() for p in outputs}
+    for p in outputs:
+        os.utime(p, (1, 1))
+
+    results, _ = render_all(files, project.output_dir, penv, force=True)
+
+    assert [r.status for r in results] == ["unchanged", "unchanged"]
+    assert {p: p.read_bytes() for p in outputs} == before
+    assert all(p.stat().st_mtime == 1 for p in outputs)
+    assert sorted(project.output_dir.iterdir()) == outputs
+    assert before[project.output_dir / "nginx.sls"] == (
+        b"nginx:\n  pkg.installed: []\n"
+    )
+
+
+_MANY = """\
+{{% for i in range(30) %}}
+{{{{ il_node("{stem}-" ~ i, group="{stem}") }}}}
+{{% if i %}}{{{{ il_edge("{stem}-" ~ (i - 1), "{stem}-" ~ i) }}}}{{% endif %}}
+{stem}-{{{{ i }}}}:
+  cmd.run: []
+{{% endfor %}}
+{{{{ il_group("{stem}") }}}}
+"""
+
+
+def test_parallel_render_matches_serial(tmp_path: Path) -> None:
+    for k in range(12):
+        (tmp_path / f"f{k:02}.il.sls").write_text(_MANY.format(stem=f"f{k:02}"))
+    project = scan_directory(tmp_path)
+    penv = get_environment(project.root)
+    files = list(project.il_files)
+
+    runs = {}
+    for workers in (1, 4):
+        out = tmp_path / f"out{workers}"
+        begin_collect("caller")
+        il_node("outer")
+        runs[workers] = render_all(files, out, penv, force=True, workers=workers)
+        # the caller's own collection is neither replaced nor added to
+        assert [n.id for n in end_collect().nodes] == ["outer"]
+        runs[workers] += ({p.name: p.read_bytes() for p in out.iterdir()},)
+
+    (serial, s_vis, s_out), (parallel, p_vis, p_out) = runs[1], runs[4]
+    assert [(r.name, r.status) for r in parallel] == [
+        (r.name, r.status) for r in serial
+    ]
+    assert [r.name for r in serial] == [sf.name for sf in files]
+    assert p_vis == s_vis
+    assert p_out == s_out and len(s_out) == 12
+    assert [n.id for n in s_vis.nodes] == [
+        f"f{k:02}-{i}" for k in range(12) for i in range(30)
+    ]
+    assert len(s_vis.edges) == 12 * 29
+    # each file's decorators were collected for that file only
+    for n in p_vis.nodes:
+        assert n.group == n.id.split("-")[0]
+        assert Path(n.source_file).name == f"{n.group}.il.sls"
+
+
+def test_project_visualization_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "macros.j2").write_text(
+        '{% macro node(id) %}{{ il_node(id, "v1") }}{% endmacro %}'
+    )
+    (tmp_path / "a.il.sls").write_text(
+        '{% import "macros.j2" as m %}{{ m.node("a") }}\n'
+    )
+    (tmp_path / "b.il.sls").write_text('{{ il_node("b") }}\n')
+    project = scan_directory(tmp_path)
+    penv = get_environment(project.root)
+    files = list(project.il_files)
+    extracted: list[str] = []
+    real = renderer.extract_visualization
+
+    def counting(sf: SourceFile, *args: Any) -> Visualization:
+        extracted.append(sf.name)
+        return real(sf, *args)
+
+    monkeypatch.setattr(renderer, "extract_visualization", counting)
+
+    first = project_visualization(files, penv)
+    assert sorted(extracted) == ["a.il.sls", "b.il.sls"]
+    assert [(n.id, n.label) for n in first.nodes] == [("a", "v1"), ("b", "b")]
+
+    # Unchanged fingerprints: a hit, handed out as a copy
+    first.add_node(VisNode("extra"))
+    first.merge(Visualization([VisNode("more")]))
+    second = project_visualization(files, penv)
+    assert sorted(extracted) == ["a.il.sls", "b.il.sls"]
+    assert [n.id for n in second.nodes] == ["a", "b"]
+    assert second is not first
+
+    # Editing the imported macro file re-extracts only its importer
+    (tmp_path / "macros.j2").write_text(
+        '{% macro node(id) %}{{ il_node(id, "v2") }}{% endmacro %}'
+    )
+    third = project_visualization(files, penv)
+    assert sorted(extracted) == ["a.il.sls", "a.il.sls", "b.il.sls"]
+    assert [(n.id, n.label) for n in third.nodes] == [("a", "v2"), ("b", "b")]
+    assert [n.id for n in file_visualization(files[0], penv).nodes] == ["a"]
+    assert len(extracted) == 3
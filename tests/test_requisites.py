@@ -0,0 +1,247 @@
+"""Unit tests for Salt requisite resolution and cycle detection."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from infralight.core.models import FileKind, FileType, SourceFile
+from infralight.core.parsers import parse_salt
+from infralight.core.requisites import (
+    RequisiteGraph,
+    requisite_graph,
+    salt_root,
+    sls_name,
+)
+
+ROOT = "/srv/salt"
+
+
+def _graph(files: dict[str, str], root: str | None = ROOT) -> RequisiteGraph:
+    """Requisite graph of *files* (paths relative to ``/srv/salt``)."""
+    resources = []
+    sources = {}
+    for rel, text in files.items():
+        path = Path(ROOT) / rel
+        sf = SourceFile(path, FileType.SALTSTACK, FileKind.NATIVE, text)
+        resources.extend(parse_salt(sf))
+        sources[str(path)] = text
+    return requisite_graph(resources, sources, root)
+
+
+def _edges(g: RequisiteGraph) -> set[tuple[str, str, str]]:
+    return {
+        (g.states[r.source].id, g.states[r.target].id, r.kind) for r in g.requisites
+    }
+
+
+# ── sls names ────────────────────────────────────────────────────
+
+
+def test_sls_name_is_dotted_path_below_root() -> None:
+    assert sls_name("/srv/salt/nginx.sls", ROOT) == "nginx"
+    assert sls_name("/srv/salt/app/config.sls", ROOT) == "app.config"
+    assert sls_name("/srv/salt/app/init.sls", ROOT) == "app"
+    assert sls_name("/srv/salt/web/site.il.sls", ROOT) == "web.site"
+
+
+def test_sls_name_outside_root_is_the_stem() -> None:
+    assert sls_name("/elsewhere/app/config.sls", ROOT) == "config"
+    assert sls_name("/elsewhere/app/init.sls") == "app"
+
+
+def test_salt_root_prefers_state_top_file() -> None:
+    paths = [
+        "/srv/salt/pillar/top.sls",
+        "/srv/salt/states/top.sls",
+        "/srv/salt/states/app/init.sls",
+    ]
+    assert salt_root(paths) == "/srv/salt/states"
+    assert salt_root(["/srv/salt/a/x.sls", "/srv/salt/b/y.sls"]) == "/srv/salt"
+    assert salt_root([]) == ""
+
+
+# ── resolution ───────────────────────────────────────────────────
+
+
+def test_module_and_name_targets() -> None:
+    g = _graph(
+        {
+            "web.sls": """\
+nginx:
+  pkg.installed:
+    - name: nginx-full
+nginx_conf:
+  file.managed:
+    - require:
+      - pkg: nginx
+nginx_svc:
+  service.running:
+    - watch:
+      - pkg: nginx-full
+      - nginx_conf
+"""
+        }
+    )
+    assert _edges(g) == {
+        ("nginx_conf", "nginx", "require"),
+        ("nginx_svc", "nginx", "watch"),
+        ("nginx_svc", "nginx_conf", "watch"),
+    }
+    assert g.unresolved == []
+
+
+def test_in_requisites_are_reversed() -> None:
+    g = _graph(
+        {
+            "web.sls": """\
+repo:
+  pkgrepo.managed:
+    - require_in:
+      - pkg: nginx
+nginx:
+  pkg.installed: []
+"""
+        }
+    )
+    assert _edges(g) == {("nginx", "repo", "require")}
+    assert [[r.target for r in out] for out in g.out] == [[], [0]]
+
+
+def test_sls_targets_use_the_full_dotted_path() -> None:
+    g = _graph(
+        {
+            "app/config.sls": """\
+app_conf:
+  file.managed:
+    - require:
+      - sls: db.config
+""",
+            "db/config.sls": """\
+db_conf:
+  file.managed: []
+""",
+            "web/config.sls": """\
+web_conf:
+  file.managed: []
+""",
+        }
+    )
+    assert _edges(g) == {("app_conf", "db_conf", "require")}
+    assert g.cycles() == []
+
+
+def test_sls_target_naming_an_init_file() -> None:
+    g = _graph(
+        {
+            "site.sls": "site:\n  file.managed:\n    - require:\n      - sls: db\n",
+            "db/init.sls": "db:\n  pkg.installed: []\n",
+        }
+    )
+    assert _edges(g) == {("site", "db", "require")}
+
+
+def test_id_targets() -> None:
+    g = _graph(
+        {
+            "a.sls": "a:\n  cmd.run:\n    - require:\n      - id: b\n",
+            "b.sls": "b:\n  cmd.run: []\n",
+        }
+    )
+    assert _edges(g) == {("a", "b", "require")}
+
+
+def test_unresolved_reports_entry_line() -> None:
+    g = _graph(
+        {
+            "web.sls": """\
+nginx:
+  pkg.installed: []
+site:
+  file.managed:
+    - source: salt://site
+    - require:
+      - pkg: nginx
+      - pkg: firewall
+"""
+        }
+    )
+    assert len(g.unresolved) == 1
+    u = g.unresolved[0]
+    assert (u.state.id, u.kind, u.module, u.target, u.line) == (
+        "site",
+        "require",
+        "pkg",
+        "firewall",
+        8,
+    )
+
+
+# ── cycles ───────────────────────────────────────────────────────
+
+
+def test_cycles_are_closed_paths() -> None:
+    g = _graph(
+        {
+            "x.sls": """\
+a:
+  cmd.run:
+    - require:
+      - cmd: b
+b:
+  cmd.run:
+    - watch:
+      - cmd: c
+c:
+  cmd.run:
+    - onchanges:
+      - cmd: a
+d:
+  cmd.run:
+    - require:
+      - cmd: d
+e:
+  cmd.run:
+    - require:
+      - cmd: a
+"""
+        }
+    )
+    assert g.cycles() == [[0, 1, 2, 0], [3, 3]]
+
+
+def test_use_and_listen_do_not_form_cycles() -> None:
+    g = _graph(
+        {
+            "x.sls": """\
+a:
+  file.managed:
+    - use:
+      - file: b
+b:
+  file.managed:
+    - require:
+      - file: a
+    - listen:
+      - file: a
+"""
+        }
+    )
+    assert g.cycles() == []
+
+
+def test_prereq_loop_is_a_cycle() -> None:
+    g = _graph(
+        {
+            "x.sls": """\
+a:
+  cmd.run:
+    - prereq:
+      - cmd: b
+b:
+  cmd.run:
+    - require:
+      - cmd: a
+"""
+        }
+    )
+    assert g.cycles() == [[0, 1, 0]]
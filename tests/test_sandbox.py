@@ -0,0 +1,32 @@
+"""Unit tests for the sandbox worker pool."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from infralight.core.sandbox import SandboxError, SandboxLimits, SandboxPool
+
+resource = pytest.importorskip("resource")
+
+
+@pytest.fixture
+def pool():
+    p = SandboxPool(workers=1, limits=SandboxLimits(timeout=10.0, memory_mb=256))
+    yield p
+    p.shutdown()
+
+
+def test_worker_address_space_is_capped(pool: SandboxPool) -> None:
+    soft, _ = pool.run(resource.getrlimit, resource.RLIMIT_AS)
+    assert soft == 256 * 1024 * 1024
+
+
+def test_large_allocation_fails_the_job_not_the_worker(pool: SandboxPool) -> None:
+    pid = pool.run(os.getpid)
+    # Untouched pages never show up in RSS, so only the rlimit stops this
+    with pytest.raises(SandboxError, match="exceeded 256 MB memory limit") as exc:
+        pool.run(bytearray, 512 * 1024 * 1024)
+    assert exc.value.pid is None
+    assert pool.run(os.getpid) == pid
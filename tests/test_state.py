@@ -0,0 +1,81 @@
+"""Unit tests for AppState's per-minion Salt views."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from infralight.models.state import AppState
+
+_FILES = {
+    "salt/top.sls": """\
+base:
+  'web-01':
+    - webserver.nginx
+    - webserver.missing
+""",
+    "salt/webserver/nginx.sls": "nginx:\n  pkg.installed: []\n",
+    "salt/proxy/nginx.sls": "haproxy:\n  pkg.installed: []\n",
+    "salt/grains/web-01.sls": "os: Debian\n",
+}
+
+
+@pytest.fixture
+def state(tmp_path: Path) -> AppState:
+    for rel, text in _FILES.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    s = AppState(render_executor="thread")
+    s.load_project(tmp_path)
+    return s
+
+
+def test_minion_states_use_full_sls_names(state: AppState) -> None:
+    graph = state.requisite_graph()
+    states = state.minion_states("web-01")
+    assert [graph.states[i].id for i in states] == ["nginx"]
+
+
+def test_minion_rows_report_missing_sls(state: AppState) -> None:
+    (row,) = state.salt_overview().minions.rows
+    assert row["sls"] == "webserver.nginx, webserver.missing"
+    assert row["missing"] == "webserver.missing"
+    assert row["states"] == 1
+
+
+def test_apply_steps_per_minion(state: AppState) -> None:
+    assert [r.state for r in state.apply_steps("web-01")] == ["pkg: nginx"]
+    assert len(state.apply_steps()) == 2
+
+
+def test_parse_errors_replace_unresolved_requisites(tmp_path: Path) -> None:
+    files = {
+        "salt/base.sls": (
+            "firewall:\n  cmd.run:\n    - name: ufw enable\n"
+            "    - unless: ufw status | grep -q 'Status: active'\n"
+        ),
+        "salt/web.sls": """\
+web_fw:
+  cmd.run:
+    - require:
+      - cmd: firewall
+      - sls: base
+      - pkg: missing
+""",
+    }
+    for rel, text in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+    s = AppState(render_executor="thread")
+    s.load_project(tmp_path)
+
+    parse, missing = s.gather_issues()
+    assert (parse.file, parse.line) == ("salt/base.sls", 4)
+    assert parse.message == (
+        "Not valid YAML: mapping values are not allowed here; "
+        "2 requisite(s) on its states can't be checked"
+    )
+    assert (missing.file, missing.line) == ("salt/web.sls", 6)
+    assert missing.message.endswith("on pkg: missing, which no state defines")
@@ -0,0 +1,81 @@
+"""Unit tests for server-side table queries."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from infralight.models.tables import RowSet
+
+ROWS = [
+    {"name": "nginx", "port": 80, "note": "Web"},
+    {"name": "Redis", "port": None, "note": ""},
+    {"name": "apache", "port": 8080, "note": "web too"},
+    {"name": "db", "port": "n/a", "note": None},
+    {"name": "cache", "port": 443, "note": True},
+]
+
+
+def _names(rows: RowSet, **query: Any) -> list[str]:
+    return [r["name"] for r in rows.query(**query).rows]
+
+
+def test_unsorted_query_keeps_row_order() -> None:
+    page = RowSet(ROWS).query()
+    assert page.rows == ROWS
+    assert page.total == 5
+
+
+def test_sort_ignores_case() -> None:
+    rows = RowSet(ROWS)
+    assert _names(rows, sort_by="name") == ["apache", "cache", "db", "nginx", "Redis"]
+    assert _names(rows, sort_by="name", descending=True) == [
+        "Redis",
+        "nginx",
+        "db",
+        "cache",
+        "apache",
+    ]
+
+
+def test_mixed_and_empty_columns_sort_without_error() -> None:
+    rows = RowSet(ROWS)
+    # numbers, then text, then empty values
+    assert _names(rows, sort_by="port") == ["nginx", "cache", "apache", "db", "Redis"]
+    assert _names(rows, sort_by="port", descending=True) == [
+        "db",
+        "apache",
+        "cache",
+        "nginx",
+        "Redis",
+    ]
+    assert _names(rows, sort_by="note") == ["cache", "nginx", "apache", "Redis", "db"]
+    assert _names(rows, sort_by="missing") == [r["name"] for r in ROWS]
+
+
+def test_filter_is_case_insensitive_over_all_columns() -> None:
+    rows = RowSet(ROWS)
+    page = rows.query(filter="  WEB ")
+    assert [r["name"] for r in page.rows] == ["nginx", "apache"]
+    assert page.total == 2
+    assert _names(rows, filter="8080") == ["apache"]
+    assert _names(rows, filter="REDIS") == ["Redis"]
+    assert rows.query(filter="nothing").total == 0
+    assert rows.query(filter="none").total == 0  # empty cells aren't text
+
+
+def test_pages() -> None:
+    rows = RowSet(ROWS)
+    assert _names(rows, sort_by="name", per_page=2) == ["apache", "cache"]
+    assert _names(rows, sort_by="name", page=2, per_page=2) == ["db", "nginx"]
+    last = rows.query(sort_by="name", page=3, per_page=2)
+    assert [r["name"] for r in last.rows] == ["Redis"]
+    assert last.total == 5
+    assert rows.query(page=4, per_page=2).rows == []
+    assert _names(rows, page=0, per_page=2) == ["nginx", "Redis"]
+
+
+def test_per_page_zero_means_all() -> None:
+    rows = RowSet(ROWS)
+    page = rows.query(filter="e", per_page=0, page=3)
+    assert [r["name"] for r in page.rows] == ["nginx", "Redis", "apache", "cache"]
+    assert page.total == 4
@@ -0,0 +1,162 @@
+"""Unit tests for top-file targeting over grains."""
+
+from __future__ import annotations
+
+import pytest
+
+from infralight.core.targeting import (
+    GrainIndex,
+    Minion,
+    TargetError,
+    compile_target,
+    load_minions,
+    parse_top,
+    target_minions,
+)
+
+MINIONS = [
+    Minion(
+        "web-01",
+        {
+            "os": "Debian",
+            "roles": ["webserver", "proxy"],
+            "ssd": True,
+            "ec2": {"tags": {"env": "prod"}},
+        },
+    ),
+    Minion("web-02", {"os": "Debian", "roles": ["webserver"], "ssd": False}),
+    Minion("db-01", {"os": "NotDebian", "roles": ["database"], "ec2": {}}),
+    Minion("Cache-01", {"os": "RedHat", "roles": []}),
+]
+INDEX = GrainIndex(MINIONS)
+
+
+def _match(expr: str, kind: str = "glob") -> set[str]:
+    return compile_target(expr, kind)(INDEX)
+
+
+def test_glob_and_exact_ids() -> None:
+    assert _match("*") == {"web-01", "web-02", "db-01", "Cache-01"}
+    assert _match("web-*") == {"web-01", "web-02"}
+    assert _match("db-01") == {"db-01"}
+    assert _match("db-0[2-9]") == set()
+    assert _match("cache-01") == set()  # minion ids are case-sensitive
+
+
+def test_pcre_and_list() -> None:
+    assert _match(r"web-0\d", "pcre") == {"web-01", "web-02"}
+    assert _match("-01", "pcre") == set()  # anchored at the start
+    assert _match("db-01, web-02,nope", "list") == {"db-01", "web-02"}
+
+
+def test_grain_values_lists_and_nesting() -> None:
+    assert _match("os:Debian", "grain") == {"web-01", "web-02"}
+    assert _match("roles:webserver", "grain") == {"web-01", "web-02"}
+    assert _match("roles:prox*", "grain") == {"web-01"}
+    assert _match("ec2:tags:env:prod", "grain") == {"web-01"}
+    assert _match("nope:x", "grain") == set()
+
+
+def test_grain_match_ignores_case() -> None:
+    assert _match("ssd:true", "grain") == {"web-01"}
+    assert _match("os:debian", "grain") == {"web-01", "web-02"}
+    assert _match("os:REDHAT", "grain") == {"Cache-01"}
+
+
+def test_grain_pcre_matches_from_start() -> None:
+    assert _match("os:Deb", "grain_pcre") == {"web-01", "web-02"}
+    assert _match("os:.*Debian$", "grain_pcre") == {"web-01", "web-02", "db-01"}
+
+
+def test_compound_precedence() -> None:
+    # not > and > or
+    assert _match("G@os:Debian and not G@ssd:true", "compound") == {"web-02"}
+    assert _match("db-* or web-* and G@ssd:true", "compound") == {"db-01", "web-01"}
+    assert _match("(db-* or web-*) and G@roles:proxy", "compound") == {"web-01"}
+    assert _match("L@db-01,Cache-01 or E@web-0[2]", "compound") == {
+        "db-01",
+        "Cache-01",
+        "web-02",
+    }
+    assert _match("P@os:Red and not Cache-01", "compound") == set()
+
+
+@pytest.mark.parametrize(
+    "expr,kind",
+    [
+        ("os", "grain"),
+        ("os:(", "grain_pcre"),
+        ("[", "pcre"),
+        ("I@role:web", "compound"),
+        ("web-* and", "compound"),
+        ("(web-*", "compound"),
+        ("web-* db-*", "compound"),
+        ("10.0.0.0/8", "ipcidr"),
+    ],
+)
+def test_compile_errors(expr: str, kind: str) -> None:
+    with pytest.raises(TargetError):
+        compile_target(expr, kind)
+
+
+def test_load_minions_uses_id_grain_or_file_name() -> None:
+    minions = load_minions(
+        [
+            ("grains/web-01.sls", "os: Debian\n"),
+            ("grains/x.sls", "id: db-01\nos: Debian\n"),
+            ("grains/bad.sls", "os: [\n"),
+            ("grains/list.sls", "- a\n"),
+        ]
+    )
+    assert [(m.id, m.source_file) for m in minions] == [
+        ("web-01", "grains/web-01.sls"),
+        ("db-01", "grains/x.sls"),
+    ]
+
+
+def test_parse_top_assigns_in_order_without_duplicates() -> None:
+    top = parse_top(
+        """\
+base:
+  '*':
+    - common
+  'roles:webserver':
+    - match: grain
+    - webserver.nginx
+    - common
+  'G@os:Debian and web-02':
+    - match: compound
+    - extra
+  'I@roles:x':
+    - match: compound
+    - never
+dev:
+  'db-*':
+    - dev.tools
+"""
+    )
+    assert [e.error != "" for e in top.entries] == [False, False, False, True, False]
+    assigned = top.assign(INDEX)
+    assert assigned["web-02"] == {"base": ["common", "webserver.nginx", "extra"]}
+    assert assigned["db-01"] == {"base": ["common"], "dev": ["dev.tools"]}
+
+
+def test_parse_top_rejects_non_mappings() -> None:
+    with pytest.raises(TargetError):
+        parse_top("- just a list\n")
+    with pytest.raises(TargetError):
+        parse_top("base: [\n")
+
+
+def test_target_minions_reports_errors_with_paths() -> None:
+    result = target_minions(
+        MINIONS,
+        ("top.sls", "base:\n  'os':\n    - match: grain\n    - x\n"),
+        ("pillar/top.sls", "base:\n  'web-*':\n    - web\n"),
+    )
+    assert result.errors == [
+        ("top.sls", "target 'os': grain target 'os' needs key:value")
+    ]
+    assert result.states["web-01"] == {}
+    assert result.pillar["web-01"] == {"base": ["web"]}
+    assert result.pillar["db-01"] == {}
@@ -0,0 +1,58 @@
+"""Unit tests for view-model helpers."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from pathlib import Path
+
+from infralight.models.state import AppState
+from infralight.models.viewmodels import FileRow, TfRow, rows_to_dicts
+
+_FILES = {
+    "salt/top.sls": "base:\n  'web-01':\n    - web\n",
+    "salt/web.sls": """\
+nginx:
+  pkg.installed:
+    - version: "1.24"
+  service.running:
+    - require:
+      - pkg: nginx
+""",
+    "salt/grains/web-01.sls": "os: Debian\n",
+    "tf/main.tf": """\
+resource "aws_instance" "web" {
+  ami = "ami-123"
+}
+""",
+}
+
+
+def test_rows_match_asdict_for_real_rows(tmp_path: Path) -> None:
+    for rel, text in _FILES.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    state = AppState(render_executor="thread")
+    state.load_project(tmp_path)
+
+    for rows in (
+        state.file_rows(),
+        state.salt_rows(),
+        state.tf_rows(),
+        state.apply_steps(),
+    ):
+        assert rows
+        dicts = rows_to_dicts(rows)
+        assert dicts == [asdict(r) for r in rows]
+        # same keys in the same (field) order
+        assert [list(d) for d in dicts] == [list(asdict(r)) for r in rows]
+
+
+def test_mixed_row_classes() -> None:
+    rows = [
+        FileRow("a.sls", "salt/a.sls", "saltstack", "native"),
+        TfRow("aws_instance.web", "aws_instance", "web", "aws", "main.tf", 1),
+        FileRow("b.tf", "tf/b.tf", "terraform", "il"),
+    ]
+    assert rows_to_dicts(rows) == [asdict(r) for r in rows]
+    assert rows_to_dicts([]) == []